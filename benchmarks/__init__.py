@@ -0,0 +1,8 @@
+"""Performance benchmarks for civic-paperkit.
+
+Run from the repository root, e.g.:
+
+  uv run python -m benchmarks.bench_extract_links
+  uv run python -m benchmarks.run --scales 10 1000 --out bench.json
+  uv run python -m benchmarks.compare baseline.json bench.json
+"""
@@ -0,0 +1,80 @@
+"""Compare two benchmarks.run result files and flag regressions.
+
+A (bench, scale) pair regresses when its p50 latency or its throughput is
+worse than the baseline by more than the threshold. Results without a p50
+(a single sample) are compared on throughput only. The exit status is 1
+if anything regressed, so the script can gate CI.
+
+Usage:
+  uv run python -m benchmarks.compare baseline.json current.json --threshold 0.10
+
+File: benchmarks/compare.py
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+
+def _index(path: Path) -> dict[tuple[str, int], dict[str, Any]]:
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    return {(r["bench"], r["scale"]): r for r in doc["results"] if "error" not in r}
+
+
+def compare(
+    baseline: dict[tuple[str, int], dict[str, Any]],
+    current: dict[tuple[str, int], dict[str, Any]],
+    threshold: float,
+) -> list[dict[str, Any]]:
+    """Return one row per (bench, scale) present in both result sets.
+
+    Each row has the relative change in p50 latency (None if either side has
+    no p50) and throughput (positive = slower / lower) and whether it
+    exceeds the threshold.
+    """
+    rows: list[dict[str, Any]] = []
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        p50 = new["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] and new["p50_ms"] else None
+        tput = (
+            1 - new["units_per_second"] / old["units_per_second"]
+            if old["units_per_second"]
+            else 0.0
+        )
+        rows.append(
+            {
+                "bench": key[0],
+                "scale": key[1],
+                "p50_change": p50,
+                "throughput_change": -tput,
+                "rss_mb": (old.get("peak_rss_mb"), new.get("peak_rss_mb")),
+                "regressed": (p50 or 0.0) > threshold or tput > threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print a comparison table; exit 1 if any benchmark regressed."""
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("baseline", type=Path)
+    ap.add_argument("current", type=Path)
+    ap.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown (0.10 = 10%%)")
+    args = ap.parse_args(argv)
+    rows = compare(_index(args.baseline), _index(args.current), args.threshold)
+    print(f"{'bench':<18}{'scale':>8}{'p50':>10}{'throughput':>12}{'rss MiB':>18}")
+    for r in rows:
+        old_rss, new_rss = r["rss_mb"]
+        rss = f"{old_rss or 0:.0f} -> {new_rss or 0:.0f}"
+        flag = "  REGRESSED" if r["regressed"] else ""
+        p50 = "n/a" if r["p50_change"] is None else f"{r['p50_change']:+.1%}"
+        print(
+            f"{r['bench']:<18}{r['scale']:>8}{p50:>10}"
+            f"{r['throughput_change']:>+12.1%}{rss:>18}{flag}"
+        )
+    return 1 if any(r["regressed"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,249 @@
+"""Benchmark suite for the fetch pipeline against a local HTTP stand-in.
+
+Starts benchmarks.server with the requested latency and bandwidth, writes
+synthetic inputs (benchmarks.synth) for each scale, and measures:
+
+  load_bib_keys     parse refs.bib                      (scale = entries)
+  load_meta         parse every refs_meta.yaml entry    (scale = entries)
+  extract_links     scan an index page                  (scale = anchors)
+  download_file     fetch `scale` files one by one      (scale = files)
+  run               orchestrate.run, cold output dir    (scale = entries)
+  run_incremental   orchestrate.run again (all 304s)    (scale = entries)
+
+download_file times each file; every other benchmark is called --repeat
+times (run starts each call from an empty output dir, run_incremental
+from a primed one), and p50/p99 are taken over those samples. With a
+single sample they are null rather than the one total time.
+
+Each (benchmark, scale) pair runs in its own subprocess so the reported
+peak RSS belongs to that benchmark alone. Results are written as JSON;
+compare two result files with benchmarks.compare.
+
+Usage:
+  uv run python -m benchmarks.run --scales 10 1000 10000 --out bench.json
+  uv run python -m benchmarks.run --bench run --scales 1000 --latency 0.02 --jobs 16
+
+File: benchmarks/run.py
+"""
+
+import argparse
+from collections.abc import Callable
+import datetime as dt
+import json
+import os
+from pathlib import Path
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+import requests
+
+from civic_interconnect.paperkit.bib import load_bib_keys
+from civic_interconnect.paperkit.config import load_meta
+from civic_interconnect.paperkit.download import download_file
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.orchestrate import run
+from civic_interconnect.paperkit.scrape import extract_links
+
+from .bench_extract_links import make_index_page
+from .server import ServerConfig, serve
+from .synth import write_inputs
+
+BENCHMARKS = (
+    "load_bib_keys",
+    "load_meta",
+    "extract_links",
+    "download_file",
+    "run",
+    "run_incremental",
+)
+DEFAULT_SCALES = (10, 1_000, 10_000)
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Return the nearest-rank `q` percentile (0-100) of the samples."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[min(len(ordered), int(rank)) - 1]
+
+
+def peak_rss_mb() -> float | None:
+    """Return this process's peak resident set size in MiB (None if unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _client() -> HttpClient:
+    return HttpClient(session=requests.Session(), retries=1, backoff_seconds=0)
+
+
+def _measure(name: str, scale: int, args: argparse.Namespace, work: Path) -> dict[str, Any]:
+    """Run one benchmark; return its raw samples and counts."""
+    bib, meta = write_inputs(work, scale, args.base_url, args.file_size)
+    units, nbytes = scale, 0
+    if name == "load_bib_keys":
+        samples = _timed(lambda: load_bib_keys(bib), args.repeat)
+        nbytes = bib.stat().st_size
+    elif name == "load_meta":
+        samples = _timed(lambda: dict(load_meta(meta)), args.repeat)
+        nbytes = meta.stat().st_size
+    elif name == "extract_links":
+        html = make_index_page(scale)
+        base = "https://data.example.gov/browse"
+        samples = _timed(
+            lambda: extract_links(html, base, [".csv", ".xlsx"], "download|rows"), args.repeat
+        )
+        nbytes = len(html.encode("utf-8"))
+    elif name == "download_file":
+        client = _client()
+        samples = [
+            _timed(
+                lambda i=i: download_file(
+                    client, f"{args.base_url}/f/{args.file_size}/f{i}.csv", work / f"f{i}.csv"
+                ),
+                1,
+            )[0]
+            for i in range(scale)
+        ]
+        nbytes = scale * args.file_size
+        return {"samples": samples, "units": units, "bytes": nbytes, "seconds": sum(samples)}
+    else:
+        out = work / "out"
+        cold = name == "run"
+        if not cold:
+            run(bib, meta, out, _client(), jobs=args.jobs, per_host=args.jobs)
+        samples = []
+        for _ in range(args.repeat):
+            if cold:
+                shutil.rmtree(out, ignore_errors=True)
+            client = _client()
+            samples += _timed(
+                lambda c=client: run(bib, meta, out, c, jobs=args.jobs, per_host=args.jobs), 1
+            )
+        units = sum(1 for p in out.rglob("*") if p.is_file() and ".paperkit" not in p.parts)
+        nbytes = sum(p.stat().st_size for p in out.rglob("*.csv"))
+    # Repeated benchmarks: throughput is per call, so use the median call.
+    return {"samples": samples, "units": units, "bytes": nbytes, "seconds": percentile(samples, 50)}
+
+
+def _result(name: str, scale: int, raw: dict[str, Any]) -> dict[str, Any]:
+    seconds = raw["seconds"] or float("nan")
+    samples = raw["samples"]
+    # One sample is a total time, not a latency distribution.
+    spread = len(samples) > 1
+    return {
+        "bench": name,
+        "scale": scale,
+        "samples": len(samples),
+        "seconds": raw["seconds"],
+        "units": raw["units"],
+        "units_per_second": raw["units"] / seconds,
+        "bytes_per_second": raw["bytes"] / seconds,
+        "p50_ms": percentile(samples, 50) * 1000 if spread else None,
+        "p99_ms": percentile(samples, 99) * 1000 if spread else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _worker(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory(prefix="paperkit-bench-") as tmp:
+        raw = _measure(args.worker, args.scale, args, Path(tmp))
+    print(json.dumps(_result(args.worker, args.scale, raw)))
+    return 0
+
+
+def _spawn(name: str, scale: int, base_url: str, args: argparse.Namespace) -> dict[str, Any]:
+    cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks.run",
+        "--worker",
+        name,
+        "--scale",
+        str(scale),
+        "--base-url",
+        base_url,
+        "--file-size",
+        str(args.file_size),
+        "--repeat",
+        str(args.repeat),
+        "--jobs",
+        str(args.jobs),
+    ]
+    proc = subprocess.run(cmd, capture_output=True, text=True, check=False, env=os.environ.copy())  # noqa: S603
+    if proc.returncode != 0:
+        return {"bench": name, "scale": scale, "error": proc.stderr.strip().splitlines()[-1:]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _environment(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "timestamp": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "latency": args.latency,
+        "bandwidth": args.bandwidth,
+        "file_size": args.file_size,
+        "repeat": args.repeat,
+        "jobs": args.jobs,
+    }
+
+
+def _parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--bench", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    ap.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    ap.add_argument("--latency", type=float, default=0.0, help="Server delay per request (s)")
+    ap.add_argument("--bandwidth", type=float, default=0.0, help="Bytes/s per response (0 = off)")
+    ap.add_argument("--file-size", type=int, default=4096, help="Bytes per direct file")
+    ap.add_argument("--repeat", type=int, default=5, help="Timed calls per benchmark")
+    ap.add_argument("--jobs", type=int, default=8, help="Workers for orchestrate.run")
+    ap.add_argument("--out", type=Path, help="Write results JSON here (default: stdout)")
+    ap.add_argument("--worker", choices=BENCHMARKS, help=argparse.SUPPRESS)
+    ap.add_argument("--scale", type=int, help=argparse.SUPPRESS)
+    ap.add_argument("--base-url", help=argparse.SUPPRESS)
+    return ap
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite and write the results as JSON."""
+    args = _parser().parse_args(argv)
+    if args.worker:
+        return _worker(args)
+    results: list[dict[str, Any]] = []
+    with serve(ServerConfig(latency=args.latency, bandwidth=args.bandwidth)) as base_url:
+        for scale in args.scales:
+            for name in args.bench:
+                result = _spawn(name, scale, base_url, args)
+                print(json.dumps(result), file=sys.stderr)
+                results.append(result)
+    doc = {"environment": _environment(args), "results": results}
+    text = json.dumps(doc, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
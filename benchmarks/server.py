@@ -0,0 +1,117 @@
+"""Local HTTP stand-in server for benchmarks.
+
+Serves synthetic files and index pages with configurable per-request
+latency and per-connection bandwidth, so the fetch pipeline can be measured
+without touching the network.
+
+Routes:
+  /f/<size>/<name>     `size` bytes of deterministic content (ETag + 304 support)
+  /page/<links>/<n>    an HTML page with `links` anchors to 1 KiB CSV files
+
+File: benchmarks/server.py
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+_PATTERN = bytes(range(256)) * 64  # 16 KiB
+
+
+@dataclass
+class ServerConfig:
+    """Behaviour of the stand-in server.
+
+    Attributes
+    ----------
+    latency : float
+        Seconds to wait before answering each request.
+    bandwidth : float
+        Bytes per second per response (0 = unlimited).
+    """
+
+    latency: float = 0.0
+    bandwidth: float = 0.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    config = ServerConfig()
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Silence per-request logging."""
+
+    def do_GET(self) -> None:
+        """Serve a file or index page."""
+        if self.config.latency:
+            time.sleep(self.config.latency)
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "f" and parts[1].isdigit():
+            self._send_file(int(parts[1]), parts[2])
+        elif len(parts) == 3 and parts[0] == "page" and parts[1].isdigit():
+            self._send_page(int(parts[1]), parts[2])
+        else:
+            self.send_error(404)
+
+    def _send_file(self, size: int, name: str) -> None:
+        etag = f'"{name}-{size}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.send_header("ETag", etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        remaining = size
+        while remaining > 0:
+            chunk = _PATTERN[: min(remaining, len(_PATTERN))]
+            self.wfile.write(chunk)
+            remaining -= len(chunk)
+            if self.config.bandwidth:
+                time.sleep(len(chunk) / self.config.bandwidth)
+
+    def _send_page(self, links: int, name: str) -> None:
+        rows = [f'<li><a href="/f/1024/{name}-{i}.csv">file {i}</a></li>' for i in range(links)]
+        rows += [f'<li><a href="/about/{i}">about {i}</a></li>' for i in range(links)]
+        body = ("<html><body><ul>" + "\n".join(rows) + "</ul></body></html>").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@contextmanager
+def serve(config: ServerConfig | None = None) -> Iterator[str]:
+    """Run the stand-in server in a background thread and yield its base URL.
+
+    Parameters
+    ----------
+    config : ServerConfig | None
+        Latency and bandwidth settings.
+
+    Yields
+    ------
+    str
+        Base URL such as ``http://127.0.0.1:54321``.
+    """
+    handler = type("Handler", (_Handler,), {"config": config or ServerConfig()})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
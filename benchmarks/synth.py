@@ -0,0 +1,57 @@
+"""Synthetic refs.bib / refs_meta.yaml generator for benchmarks.
+
+File: benchmarks/synth.py
+"""
+
+from pathlib import Path
+
+_ABSTRACT = " ".join(["Maternal mortality {surveillance} and reporting methods."] * 40)
+
+
+def write_bib(path: Path, entries: int) -> Path:
+    """Write a BibTeX file with `entries` entries carrying long abstracts."""
+    with path.open("w", encoding="utf-8") as f:
+        f.write('@string{cdc = "Centers for Disease Control and Prevention"}\n\n')
+        for i in range(entries):
+            kind = "techreport" if i % 3 else "article"
+            f.write(
+                f"@{kind}{{key{i:05d},\n"
+                f"  title = {{Synthetic report {{{i}}}}},\n"
+                f"  author = cdc,\n"
+                f"  year = {{{2000 + i % 25}}},\n"
+                f"  abstract = {{{_ABSTRACT}}},\n"
+                f"}}\n\n"
+            )
+    return path
+
+
+def write_meta(
+    path: Path, entries: int, base_url: str, file_size: int = 4096, page_every: int = 10
+) -> Path:
+    """Write a refs_meta.yaml mapping every key to assets on the stand-in server.
+
+    Each entry gets one direct file; every `page_every`-th entry also gets a
+    page_url asset that links to a few small CSV files.
+    """
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(entries):
+            key = f"key{i:05d}"
+            f.write(f"{key}:\n")
+            f.write(f'  notes: "Synthetic entry {i}"\n')
+            f.write("  assets:\n")
+            f.write(f'    - url: "{base_url}/f/{file_size}/{key}.csv"\n')
+            if page_every and i % page_every == 0:
+                f.write(f'    - page_url: "{base_url}/page/3/{key}"\n')
+                f.write('      allow_ext: [".csv"]\n')
+                f.write("      limit: 3\n")
+    return path
+
+
+def write_inputs(
+    directory: Path, entries: int, base_url: str, file_size: int = 4096
+) -> tuple[Path, Path]:
+    """Write refs.bib and refs_meta.yaml for one scale; return their paths."""
+    directory.mkdir(parents=True, exist_ok=True)
+    bib = write_bib(directory / "refs.bib", entries)
+    meta = write_meta(directory / "refs_meta.yaml", entries, base_url, file_size)
+    return bib, meta
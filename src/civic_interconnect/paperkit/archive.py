@@ -0,0 +1,287 @@
+"""Streaming extraction of downloaded zip archives.
+
+This module provides:
+- ExtractPolicy: The include/exclude globs and size limit of an asset with
+  ``extract: true``
+- ExtractedMember: One unpacked member with its size and SHA256
+- extract_zip: Unpack an archive member by member into a directory
+- Extractor: A small thread pool that unpacks archives while downloads of
+  other assets continue
+
+Members are decompressed in fixed-size chunks straight into an atomically
+written file, so memory use does not depend on member size. The total
+uncompressed size is checked against ``max_bytes`` both from the archive's
+central directory, before anything is written, and while streaming, since
+declared sizes can be forged. Member names that are absolute or climb out of
+the destination with ``..`` are rejected.
+
+File: src/civic_interconnect/paperkit/archive.py
+"""
+
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+import threading
+from typing import IO, Any
+import zipfile
+
+from .download import DEFAULT_CHUNK_SIZE, write_chunks
+from .durability import SyncPolicy
+from .instrument import span
+from .log import logger
+from .manifest import Manifest, ManifestEntry
+from .scheduler import DEFAULT_EXTRACT_JOBS
+
+DEFAULT_MAX_EXTRACT_BYTES: int = 2 * 1024 * 1024 * 1024
+ARCHIVE_SUFFIXES: frozenset[str] = frozenset({".zip"})
+
+
+@dataclass
+class ExtractPolicy:
+    """Which members of an archive to unpack, and how much at most.
+
+    Attributes
+    ----------
+    include : list[str]
+        Globs matched against member paths (e.g. ``data/*.csv``); a member
+        is unpacked if it matches any of them.
+    exclude : list[str]
+        Globs of members to skip even if included.
+    max_bytes : int
+        Most uncompressed bytes unpacked from one archive.
+    """
+
+    include: list[str] = field(default_factory=lambda: ["*"])
+    exclude: list[str] = field(default_factory=list)
+    max_bytes: int = DEFAULT_MAX_EXTRACT_BYTES
+
+    @classmethod
+    def from_asset(cls, asset: Any) -> "ExtractPolicy | None":
+        """Return the policy of an asset with ``extract: true``, else None."""
+        if not asset.get("extract"):
+            return None
+        return cls(
+            include=list(asset.get("extract_include") or ["*"]),
+            exclude=list(asset.get("extract_exclude") or []),
+            max_bytes=int(asset.get("extract_max_bytes", DEFAULT_MAX_EXTRACT_BYTES)),
+        )
+
+    def selects(self, name: str) -> bool:
+        """Return True if a member path passes the include and exclude globs."""
+        return any(fnmatchcase(name, g) for g in self.include) and not any(
+            fnmatchcase(name, g) for g in self.exclude
+        )
+
+
+@dataclass
+class ExtractedMember:
+    """One member unpacked from an archive.
+
+    Attributes
+    ----------
+    archive : Path
+        The archive the member came from.
+    name : str
+        The member path inside the archive.
+    path : Path
+        Where the member was written.
+    size : int
+        Uncompressed size in bytes.
+    sha256 : str
+        SHA256 hexadecimal digest of the unpacked file.
+    reused : bool
+        True if an unchanged archive's member was already in place and was
+        not written again.
+    """
+
+    archive: Path
+    name: str
+    path: Path
+    size: int
+    sha256: str
+    reused: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        d = asdict(self)
+        d["archive"] = str(self.archive)
+        d["path"] = str(self.path)
+        return d
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ExtractedMember":
+        """Build a member from the output of to_dict."""
+        return cls(
+            archive=Path(data["archive"]),
+            name=str(data["name"]),
+            path=Path(data["path"]),
+            size=int(data["size"]),
+            sha256=str(data["sha256"]),
+            reused=bool(data.get("reused", False)),
+        )
+
+
+def is_archive(path: Path) -> bool:
+    """Return True if the path has an archive suffix that extract_zip handles."""
+    return path.suffix.lower() in ARCHIVE_SUFFIXES
+
+
+def extract_dir(archive: Path) -> Path:
+    """Return the directory an archive is unpacked into (next to it, named by its stem)."""
+    return archive.with_name(archive.stem)
+
+
+def _member_path(dest: Path, name: str) -> Path:
+    """Map a member name to a path below dest, rejecting names that escape it."""
+    parts = PurePosixPath(name.replace("\\", "/")).parts
+    if not parts or parts[0] == "/" or ".." in parts or ":" in parts[0]:
+        raise ValueError(f"unsafe archive member name {name!r}")
+    return dest.joinpath(*parts)
+
+
+def _stream(src: IO[bytes], budget: list[int], archive: Path) -> Iterator[bytes]:
+    """Yield decompressed chunks, failing once the archive's byte budget is spent."""
+    while chunk := src.read(DEFAULT_CHUNK_SIZE):
+        budget[0] -= len(chunk)
+        if budget[0] < 0:
+            raise ValueError(f"{archive} expands beyond the extraction size limit")
+        yield chunk
+
+
+def _unchanged(manifest: Manifest | None, path: Path, info: zipfile.ZipInfo) -> str | None:
+    """Return the recorded digest if a member from an unchanged archive is in place."""
+    entry = manifest.get(path) if manifest is not None else None
+    if entry is None or entry.sha256 is None or entry.size != info.file_size:
+        return None
+    try:
+        return entry.sha256 if path.stat().st_size == info.file_size else None
+    except OSError:
+        return None
+
+
+def extract_zip(
+    archive: Path,
+    policy: ExtractPolicy | None = None,
+    dest: Path | None = None,
+    *,
+    manifest: Manifest | None = None,
+    unchanged: bool = False,
+    sync: SyncPolicy | None = None,
+) -> list[ExtractedMember]:
+    """Unpack the selected members of a zip archive, streaming each one.
+
+    Parameters
+    ----------
+    archive : Path
+        The zip file.
+    policy : ExtractPolicy | None
+        Member globs and size limit (default: everything, 2 GiB).
+    dest : Path | None
+        Target directory (default: extract_dir(archive)).
+    manifest : Manifest | None
+        Records each unpacked file (URL ``<archive>!<member>``, size,
+        sha256) so it can be verified and skipped later.
+    unchanged : bool
+        The archive was not modified since the last run; members already in
+        place with their recorded size are not written again.
+    sync : SyncPolicy | None
+        Durability policy for the unpacked files.
+
+    Returns
+    -------
+    list[ExtractedMember]
+        The selected members in archive order.
+
+    Raises
+    ------
+    ValueError
+        If a member name escapes dest or the archive expands beyond
+        policy.max_bytes.
+    zipfile.BadZipFile
+        If the file is not a valid zip archive.
+    """
+    policy = policy or ExtractPolicy()
+    dest = dest if dest is not None else extract_dir(archive)
+    out: list[ExtractedMember] = []
+    with span("extract", archive=str(archive)) as sp, zipfile.ZipFile(archive) as zf:
+        members = [i for i in zf.infolist() if not i.is_dir() and policy.selects(i.filename)]
+        declared = sum(i.file_size for i in members)
+        if declared > policy.max_bytes:
+            raise ValueError(
+                f"{archive} declares {declared} bytes, over the extraction limit of "
+                f"{policy.max_bytes}"
+            )
+        paths = [_member_path(dest, i.filename) for i in members]
+        budget = [policy.max_bytes]
+        for info, path in zip(members, paths, strict=True):
+            digest = _unchanged(manifest, path, info) if unchanged else None
+            if digest is not None:
+                out.append(
+                    ExtractedMember(archive, info.filename, path, info.file_size, digest, True)
+                )
+                continue
+            before = budget[0]
+            with zf.open(info) as src:
+                digest = write_chunks(path, _stream(src, budget, archive), sync)
+            size = before - budget[0]
+            if manifest is not None:
+                url = f"{archive.as_posix()}!{info.filename}"
+                manifest.record(path, ManifestEntry(url=url, size=size, sha256=digest))
+            out.append(ExtractedMember(archive, info.filename, path, size, digest))
+        sp.set("members", len(out))
+        sp.set("bytes", policy.max_bytes - budget[0])
+    logger.info("Extracted %d members of %s into %s", len(out), archive, dest)
+    return out
+
+
+class Extractor:
+    """Unpack archives on background threads while other assets download.
+
+    Parameters
+    ----------
+    workers : int
+        Archives unpacked at once. Threads are started on first use.
+    manifest : Manifest | None
+        Passed to extract_zip.
+    sync : SyncPolicy | None
+        Passed to extract_zip.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_EXTRACT_JOBS,
+        manifest: Manifest | None = None,
+        sync: SyncPolicy | None = None,
+    ) -> None:
+        """Create an idle extractor."""
+        self.workers = max(1, workers)
+        self.manifest = manifest
+        self.sync = sync
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self, archive: Path, policy: ExtractPolicy, *, unchanged: bool = False
+    ) -> "Future[list[ExtractedMember]]":
+        """Queue an archive for extraction and return a future of its members."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="paperkit-extract")
+            pool = self._pool
+        return pool.submit(
+            extract_zip,
+            archive,
+            policy,
+            manifest=self.manifest,
+            unchanged=unchanged,
+            sync=self.sync,
+        )
+
+    def close(self) -> None:
+        """Wait for queued extractions and stop the threads."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
@@ -0,0 +1,221 @@
+"""Asyncio HTTP client with retries, backoff and a bounded connection pool.
+
+This module provides the AsyncHttpClient dataclass, an asyncio counterpart
+of HttpClient built on httpx. It keeps the same get contract (timeout,
+retries, backoff, user-agent, conditional requests) but waits with
+non-blocking sleeps, so thousands of requests can be in flight from one
+event loop.
+
+httpx is an optional dependency: install ``civic-paperkit[async]``.
+
+File: src/civic_interconnect/paperkit/async_client.py
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import time
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self, cast
+
+from .http_client import request_headers
+from .instrument import span
+from .log import logger
+from .metrics import note_connection, note_request, note_retry
+from .ratelimit import (
+    DEFAULT_MAX_BACKOFF_SECONDS,
+    RETRYABLE_STATUS,
+    HostRateLimiter,
+    backoff_delay,
+    parse_retry_after,
+)
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_MAX_CONNECTIONS: int = 100
+DEFAULT_MAX_KEEPALIVE: int = 20
+
+
+def _import_httpx() -> Any:
+    try:
+        import httpx
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "AsyncHttpClient requires httpx; install it with: pip install 'civic-paperkit[async]'"
+        ) from exc
+    return httpx
+
+
+def _is_retryable(httpx: Any, exc: Exception) -> bool:
+    """Classify an httpx error the same way is_retryable classifies requests errors."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return cast("httpx.HTTPStatusError", exc).response.status_code in RETRYABLE_STATUS
+    if isinstance(exc, httpx.UnsupportedProtocol):
+        return False
+    return isinstance(exc, httpx.TransportError)
+
+
+async def _trace_connections(event: str, info: dict[str, Any]) -> None:
+    """Count new connections in the current fetch's metrics (an httpx trace hook)."""
+    if event == "connection.connect_tcp.complete":
+        note_connection()
+
+
+@dataclass
+class AsyncHttpClient:
+    """Asyncio HTTP client for GET requests with retries, backoff, and custom user-agent.
+
+    The underlying httpx.AsyncClient is created on first use and limits the
+    number of open connections, so concurrency beyond the pool size queues
+    for a connection instead of opening new sockets.
+
+    Attributes
+    ----------
+    timeout : int
+        Timeout for each request in seconds.
+    retries : int
+        Number of retry attempts for failed requests.
+    backoff_seconds : int
+        Base seconds for exponential backoff (with jitter) between retries.
+    user_agent : str
+        User-Agent header for requests.
+    max_connections : int
+        Maximum number of open connections in the pool.
+    max_keepalive_connections : int
+        Maximum number of idle connections kept alive for reuse.
+    max_backoff_seconds : float
+        Upper bound for a single backoff, including server Retry-After values.
+    rate_limiter : HostRateLimiter | None
+        Optional per-host token bucket shared by all callers of this client.
+    http2 : bool
+        Negotiate HTTP/2 where servers support it, multiplexing concurrent
+        requests to a host over one connection (needs the h2 package).
+    """
+
+    timeout: int = 30
+    retries: int = 3
+    backoff_seconds: int = 2
+    user_agent: str = "ci-paper-fetcher/1.0"
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE
+    max_backoff_seconds: float = DEFAULT_MAX_BACKOFF_SECONDS
+    rate_limiter: HostRateLimiter | None = None
+    http2: bool = False
+    _client: "httpx.AsyncClient | None" = field(default=None, init=False, repr=False)
+
+    def _session(self) -> "httpx.AsyncClient":
+        client = self._client
+        if client is None:
+            httpx = _import_httpx()
+            client = self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": self.user_agent},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+            )
+        return client
+
+    async def get(
+        self,
+        url: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        quiet: bool = False,
+    ) -> "httpx.Response":
+        """Perform an HTTP GET request with retries and backoff.
+
+        Parameters
+        ----------
+        url : str
+            The URL to send the GET request to.
+        etag : str | None
+            If given, sent as If-None-Match to make the request conditional.
+        last_modified : str | None
+            If given, sent as If-Modified-Since to make the request conditional.
+        quiet : bool
+            Log fatal errors at DEBUG rather than ERROR, for callers that
+            expect and handle them (e.g. a missing robots.txt).
+
+        Returns
+        -------
+        httpx.Response
+            The HTTP response object with its body loaded. A conditional
+            request whose resource is unchanged returns status 304.
+
+        Raises
+        ------
+        httpx.HTTPError
+            Immediately for fatal errors (e.g. 403, 404), or the last
+            exception once all retry attempts fail.
+        """
+        session = self._session()
+        httpx = _import_httpx()
+        headers = request_headers(None, etag=etag, last_modified=last_modified)
+        with span("http.get", url=url) as sp:
+            last_exc: Exception | None = None
+            for attempt in range(1, self.retries + 1):
+                sp.set("attempt", attempt)
+                if self.rate_limiter is not None:
+                    wait = self.rate_limiter.reserve(url)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                retry_after: float | None = None
+                try:
+                    logger.debug("HTTP GET %s (attempt %s)", url, attempt)
+                    sent = time.perf_counter()
+                    resp = await session.get(
+                        url, headers=headers, extensions={"trace": _trace_connections}
+                    )
+                    note_request(resp.status_code, time.perf_counter() - sent)
+                    sp.set("status", resp.status_code)
+                    if resp.status_code == 304:
+                        logger.debug("HTTP 304 not modified for %s", url)
+                        return resp
+                    if resp.status_code >= 400:
+                        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    resp.raise_for_status()
+                    return resp
+                except httpx.HTTPError as exc:
+                    if not _is_retryable(httpx, exc):
+                        level = logging.DEBUG if quiet else logging.ERROR
+                        logger.log(level, "HTTP GET failed for %s (not retryable): %s", url, exc)
+                        raise
+                    logger.warning("HTTP GET failed for %s on attempt %s: %s", url, attempt, exc)
+                    last_exc = exc
+                    if attempt < self.retries:
+                        note_retry()
+                        if retry_after is not None and self.rate_limiter is not None:
+                            self.rate_limiter.pause(url, min(retry_after, self.max_backoff_seconds))
+                        await asyncio.sleep(
+                            backoff_delay(
+                                attempt, self.backoff_seconds, self.max_backoff_seconds, retry_after
+                            )
+                        )
+            logger.error("HTTP GET giving up for %s", url)
+            raise last_exc if last_exc else RuntimeError("HTTP get failed unexpectedly")
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> Self:
+        """Open the client for use in an ``async with`` block."""
+        self._session()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the connection pool on leaving an ``async with`` block."""
+        await self.aclose()
@@ -3,19 +3,33 @@
 This module provides functionality for loading and processing BibTeX files:
 - BibEntry: TypedDict for bibliography entries
 - BibDatabaseLike: Protocol for bibliography database objects
+- scan_bib_entries: Streaming scanner yielding entry types and citation keys
 - load_bib_keys: Function to extract citation keys from BibTeX files
 
+The scanner memory-maps the file and only looks at entry headers, skipping
+each body by brace matching, so it never builds field values. It handles
+text outside entries, @comment, @string and @preamble blocks, nested braces
+and parenthesized entries. Unlike a full parse with bibtexparser, it keeps
+entries of non-standard types (e.g. @dataset, @online) and entries without
+fields.
+
 File: src/civic_interconnect/paperkit/bib.py
 
 """
 
+from collections.abc import Iterator
+import mmap
 from pathlib import Path
+import re
 from typing import Protocol, TypedDict
 
-import bibtexparser  # pyright: ignore[reportMissingTypeStubs]
-
 from .log import logger
 
+_ENTRY_HEAD = re.compile(rb"@[ \t]*([A-Za-z][\w-]*)\s*([{(])")
+_BRACES = re.compile(rb"[{}]")
+_PAREN_BODY = re.compile(rb"[{})]")
+_NON_ENTRY_TYPES = frozenset({"comment", "string", "preamble"})
+
 
 class BibEntry(TypedDict, total=False):
     """A bibliography entry from a BibTeX file.
@@ -53,13 +67,93 @@ class BibDatabaseLike(Protocol):
         ...
 
 
-def load_bib_keys(bib_path: Path) -> list[str]:
-    """Load citation keys from a BibTeX file."""
+def _body_end(buf: bytes | mmap.mmap, start: int, opener: bytes) -> int:
+    """Return the index just past the delimiter closing the body opened before `start`."""
+    depth = 0
+    pattern = _BRACES if opener == b"{" else _PAREN_BODY
+    for m in pattern.finditer(buf, start):
+        ch = m.group()
+        if ch == b"{":
+            depth += 1
+        elif ch == b"}":
+            if depth == 0 and opener == b"{":
+                return m.end()
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            return m.end()
+    return len(buf)
+
+
+def _scan(buf: bytes | mmap.mmap) -> Iterator[tuple[str, str]]:
+    pos = 0
+    while (at := buf.find(b"@", pos)) >= 0:
+        head = _ENTRY_HEAD.match(buf, at)
+        if head is None:
+            pos = at + 1
+            continue
+        pos = _body_end(buf, head.end(), head.group(2))
+        entry_type = head.group(1).decode("ascii").lower()
+        if entry_type in _NON_ENTRY_TYPES:
+            continue
+        comma = buf.find(b",", head.end(), pos)
+        key_end = comma if comma >= 0 else pos - 1
+        key = bytes(buf[head.end() : key_end]).decode("utf-8").strip()
+        if key:
+            yield entry_type, key
+
+
+def scan_bib_entries(bib_path: Path) -> Iterator[tuple[str, str]]:
+    """Yield the type and citation key of each entry in a BibTeX file.
+
+    Parameters
+    ----------
+    bib_path : Path
+        Path to the BibTeX file.
+
+    Yields
+    ------
+    tuple[str, str]
+        ``(entry_type, key)`` in file order, with the type lowercased.
+        @comment, @string and @preamble blocks are skipped.
+    """
+    with bib_path.open("rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield from _scan(buf)
+
+
+def _parse_bib_keys(bib_path: Path) -> list[str]:
+    import bibtexparser  # pyright: ignore[reportMissingTypeStubs]
+
     with bib_path.open("r", encoding="utf-8") as f:
         db_raw: BibDatabaseLike = bibtexparser.load(f)  # type: ignore[assignment]
 
     entries: list[BibEntry] = db_raw.entries
-    keys: list[str] = [e["ID"] for e in entries if "ID" in e]
+    return [e["ID"] for e in entries if "ID" in e]
+
+
+def load_bib_keys(bib_path: Path, *, full_parse: bool = False) -> list[str]:
+    """Load citation keys from a BibTeX file.
+
+    Parameters
+    ----------
+    bib_path : Path
+        Path to the BibTeX file.
+    full_parse : bool
+        If True, parse every entry with bibtexparser instead of using the
+        fast key scanner. Only needed when field values must be validated;
+        note that bibtexparser skips non-standard entry types.
+
+    Returns
+    -------
+    list[str]
+        Citation keys in file order.
+    """
+    if full_parse:
+        keys = _parse_bib_keys(bib_path)
+    else:
+        keys = [key for _, key in scan_bib_entries(bib_path)]
 
     logger.debug("Loaded %d keys from %s", len(keys), bib_path)
     return keys
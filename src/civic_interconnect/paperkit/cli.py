@@ -8,29 +8,429 @@ File: src/civic_interconnect/paperkit/cli.py
 """
 
 import argparse
+from collections.abc import Callable
+from contextlib import ExitStack
+import json
 from pathlib import Path
+import sys
+from typing import IO, TYPE_CHECKING
 
-import requests
-
-from .http_client import HttpClient
+from .config import DEFAULT_OUTPUT_ROOT
+from .durability import DURABILITY_MODES
 from .log import configure, logger
-from .orchestrate import DEFAULT_OUTPUT_ROOT, run
+from .page_cache import DEFAULT_PAGE_TTL_SECONDS
+from .scheduler import DEFAULT_EXTRACT_JOBS, DEFAULT_JOBS, DEFAULT_PER_HOST
+
+if TYPE_CHECKING:
+    from .metrics import AssetMetrics
+    from .orchestrate import Summary
+    from .selection import Selection
+
+# Only light modules are imported above so that --help and the verify
+# subcommand start without loading requests, PyYAML or the scraping stack;
+# the fetch path imports them once arguments have been parsed.
+
+
+def _positive_float(value: str) -> float:
+    """Parse an argparse value that must be a number greater than zero."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}") from None
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0: {value!r}")
+    return number
+
+
+def _ndjson_writer(f: IO[str]) -> Callable[[str, "AssetMetrics"], None]:
+    """Return an on_asset callback that writes one JSON line per fetch."""
+
+    def write(bibkey: str, metrics: "AssetMetrics") -> None:
+        f.write(json.dumps({"bibkey": bibkey, **metrics.to_dict()}) + "\n")
+        f.flush()
+
+    return write
+
 
+def _write_report(path: Path, summary: "Summary") -> None:
+    """Write the run summary with per-fetch metrics and totals as JSON."""
+    from .metrics import totals
 
-def main() -> int:
-    """Run the paperkit CLI."""
-    ap = argparse.ArgumentParser(description="Fetch public data for .bib references")
+    report = summary.to_dict()
+    report["totals"] = totals(m for rec in summary.processed for m in rec.metrics)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info("Wrote run report to %s", path)
+
+
+def _add_input_args(ap: argparse.ArgumentParser) -> None:
+    """Add the input and output options shared by fetch and plan."""
     ap.add_argument("--bib", type=Path, default=Path("paper/refs.bib"))
-    ap.add_argument("--meta", type=Path, default=Path("paper/refs_meta.yaml"))
+    ap.add_argument(
+        "--meta",
+        type=Path,
+        default=Path("paper/refs_meta.yaml"),
+        help="Metadata YAML file, or a directory of YAML shards",
+    )
     ap.add_argument("--out", type=Path, default=DEFAULT_OUTPUT_ROOT)
+    ap.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory to cache parsed --bib/--meta files in, reused while they are unchanged",
+    )
+
+
+def _add_selection_args(ap: argparse.ArgumentParser) -> None:
+    """Add the bibkey, asset-type and host filters shared by fetch and plan."""
+    ap.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Only process bibkeys matching this glob (repeatable)",
+    )
+    ap.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Skip bibkeys matching this glob (repeatable)",
+    )
+    ap.add_argument(
+        "--asset-type",
+        action="append",
+        default=[],
+        choices=["direct", "page", "socrata"],
+        help="Only process assets of this type (repeatable)",
+    )
+    ap.add_argument(
+        "--host",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Only process assets whose URL host matches this glob (repeatable)",
+    )
+    ap.add_argument(
+        "--exclude-host",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Skip assets whose URL host matches this glob (repeatable)",
+    )
+    ap.add_argument(
+        "--failed-only",
+        action="store_true",
+        help="Only process bibkeys that had errors in the previous run into --out",
+    )
+
+
+def _selection(args: argparse.Namespace) -> "Selection":
+    """Build the Selection described by the _add_selection_args options."""
+    from .selection import Selection
+
+    return Selection(
+        only=args.only,
+        exclude=args.exclude,
+        asset_types=args.asset_type,
+        hosts=args.host,
+        exclude_hosts=args.exclude_host,
+        failed_only=args.failed_only,
+    )
+
+
+def _verify(argv: list[str]) -> int:
+    """Run ``ci-paperkit verify``: check saved files against recorded checksums."""
+    ap = argparse.ArgumentParser(
+        prog="ci-paperkit verify",
+        description="Hash saved files and compare them with the manifest and refs_meta checksums",
+    )
+    ap.add_argument("--out", type=Path, default=DEFAULT_OUTPUT_ROOT)
+    ap.add_argument(
+        "--meta",
+        type=Path,
+        default=None,
+        help="Also check the checksums in this metadata YAML file or directory of shards",
+    )
+    ap.add_argument(
+        "--workers", type=int, default=None, help="Files hashed at once (default: CPU count)"
+    )
+    ap.add_argument("--processes", action="store_true", help="Hash on a process pool")
+    ap.add_argument("--json", type=Path, default=None, help="Write every check to this JSON file")
+    ap.add_argument("--log-level", type=str, default="INFO", help="DEBUG, INFO, WARNING, ERROR")
+    args = ap.parse_args(argv)
+
+    from .verify import verify_tree
+
+    configure(args.log_level)
+    report = verify_tree(args.out, args.meta, workers=args.workers, processes=args.processes)
+    for c in report.checks:
+        if c.status in ("mismatch", "missing", "error"):
+            logger.error("%s %s %s", c.status.upper(), c.path, c.error or c.expected)
+    if args.json is not None:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+    return 1 if report.failed else 0
+
+
+def _plan(argv: list[str]) -> int:
+    """Run ``ci-paperkit plan``: resolve what a fetch would download, without downloading."""
+    ap = argparse.ArgumentParser(
+        prog="ci-paperkit plan",
+        description="List every URL a fetch would download, with output paths and HEAD sizes",
+    )
+    _add_input_args(ap)
+    ap.add_argument(
+        "--jobs", type=int, default=DEFAULT_JOBS, help="Pages or HEAD requests in flight at once"
+    )
+    ap.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help="Maximum concurrent requests to a single host",
+    )
+    ap.add_argument(
+        "--no-head",
+        action="store_true",
+        help="Do not send HEAD requests; sizes are left unknown",
+    )
+    ap.add_argument(
+        "--page-cache",
+        type=Path,
+        default=None,
+        help="Directory caching scraped pages and their extracted links across runs",
+    )
+    _add_selection_args(ap)
+    ap.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Write the plan as JSON to this file ('-' for standard output)",
+    )
+    ap.add_argument("--log-level", type=str, default="INFO", help="DEBUG, INFO, WARNING, ERROR")
+    args = ap.parse_args(argv)
+
+    from .http_client import HttpClient
+    from .orchestrate import plan
+    from .page_cache import PageCache
+    from .transport import TransportConfig
+
+    configure(args.log_level)
+    client = HttpClient(transport=TransportConfig.for_run(args.jobs, args.per_host))
+    try:
+        result = plan(
+            args.bib,
+            args.meta,
+            args.out,
+            client,
+            jobs=args.jobs,
+            per_host=args.per_host,
+            cache_dir=args.cache_dir,
+            select=_selection(args),
+            page_cache=PageCache(args.page_cache) if args.page_cache else None,
+            head=not args.no_head,
+        )
+    finally:
+        client.session.close()
+    if args.json is None:
+        print(result.format())
+    elif str(args.json) == "-":
+        print(json.dumps(result.to_dict(), indent=2))
+    else:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(result.to_dict(), indent=2), encoding="utf-8")
+        logger.info("Wrote plan to %s", args.json)
+    for c in result.collisions:
+        logger.error("COLLISION %s: %s", c.path, ", ".join(c.urls))
+    return 1 if result.failed else 0
+
+
+_COMMANDS: dict[str, Callable[[list[str]], int]] = {"verify": _verify, "plan": _plan}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the paperkit CLI.
+
+    ``ci-paperkit verify ...`` and ``ci-paperkit plan ...`` run a subcommand;
+    any other arguments run a fetch.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in _COMMANDS:
+        return _COMMANDS[argv[0]](argv[1:])
+    ap = argparse.ArgumentParser(
+        description="Fetch public data for .bib references",
+        epilog=(
+            "Subcommands: verify (check saved files offline; see ci-paperkit verify --help), "
+            "plan (dry run listing URLs, paths and sizes; see ci-paperkit plan --help)"
+        ),
+    )
+    _add_input_args(ap)
+    ap.add_argument(
+        "--jobs", type=int, default=DEFAULT_JOBS, help="Number of assets fetched concurrently"
+    )
+    ap.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help="Maximum concurrent requests to a single host",
+    )
+    ap.add_argument(
+        "--rate",
+        type=_positive_float,
+        default=None,
+        help="Maximum requests per second to any single host (default: unlimited)",
+    )
+    ap.add_argument(
+        "--pool-size",
+        type=int,
+        default=None,
+        help="Connections kept open per host (default: the larger of 16, --jobs and --per-host)",
+    )
+    ap.add_argument(
+        "--pool-block",
+        action="store_true",
+        help="Wait for a pooled connection instead of opening extra ones when all are busy",
+    )
+    ap.add_argument(
+        "--no-keepalive",
+        action="store_true",
+        help="Close each connection after its request instead of reusing it",
+    )
+    ap.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use HTTP/2 via httpx so requests to one host share a connection (needs [http2])",
+    )
+    ap.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Ignore the download manifest and fetch every asset again",
+    )
+    ap.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Store identical files once under <out>/.paperkit/blobs and hardlink them into place",
+    )
+    ap.add_argument(
+        "--request-cache",
+        type=Path,
+        default=None,
+        help="Directory to persist fetched pages and small responses in; entries from "
+        "earlier runs are revalidated before use",
+    )
+    ap.add_argument(
+        "--page-cache",
+        type=Path,
+        default=None,
+        help="Directory caching scraped pages and their extracted links across runs",
+    )
+    ap.add_argument(
+        "--page-ttl",
+        type=float,
+        default=DEFAULT_PAGE_TTL_SECONDS,
+        help="Seconds a cached page is used before it is revalidated (default: one day)",
+    )
+    _add_selection_args(ap)
+    ap.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="Write a JSON report with per-asset bytes, timings, retries and status",
+    )
+    ap.add_argument(
+        "--report-ndjson",
+        type=Path,
+        default=None,
+        help="Stream one JSON line per fetched asset to this file as the run progresses",
+    )
+    ap.add_argument(
+        "--extract-jobs",
+        type=int,
+        default=DEFAULT_EXTRACT_JOBS,
+        help="Archives of extract: true assets unpacked at once, alongside downloads",
+    )
+    ap.add_argument(
+        "--durability",
+        choices=DURABILITY_MODES,
+        default="none",
+        help="fsync saved files: none, file (each file as saved) or batch (once at the end)",
+    )
+    ap.add_argument(
+        "--profile",
+        action="store_true",
+        help="Log a per-stage timing breakdown (HTTP, scrape, write, hash) after the run",
+    )
     ap.add_argument("--log-level", type=str, default="INFO", help="DEBUG, INFO, WARNING, ERROR")
-    args = ap.parse_args()
+    return _fetch(ap.parse_args(argv))
+
+
+def _fetch(args: argparse.Namespace) -> int:
+    """Run a fetch with the parsed command-line arguments."""
+    from .http_client import HttpClient
+    from .instrument import ProfilerSink, add_sink, remove_sink
+    from .metrics import totals
+    from .orchestrate import run
+    from .page_cache import PageCache
+    from .ratelimit import HostRateLimiter
+    from .request_cache import RequestCache
+    from .transport import TransportConfig
 
     configure(args.log_level)
     logger.info("Starting paperkit fetch with bib=%s meta=%s out=%s", args.bib, args.meta, args.out)
 
-    client: HttpClient = HttpClient(session=requests.Session())
-    summary = run(args.bib, args.meta, args.out, client)
+    limiter = HostRateLimiter(args.rate) if args.rate is not None else None
+    pool = {"pool_maxsize": args.pool_size} if args.pool_size else {}
+    client: HttpClient = HttpClient(
+        rate_limiter=limiter,
+        cache=RequestCache(args.request_cache),
+        transport=TransportConfig.for_run(
+            args.jobs,
+            args.per_host,
+            pool_block=args.pool_block,
+            keepalive=not args.no_keepalive,
+            http2=args.http2,
+            **pool,
+        ),
+    )
+    with ExitStack() as stack:
+        stack.callback(client.session.close)
+        on_asset = None
+        if args.report_ndjson is not None:
+            args.report_ndjson.parent.mkdir(parents=True, exist_ok=True)
+            f = stack.enter_context(args.report_ndjson.open("w", encoding="utf-8"))
+            on_asset = _ndjson_writer(f)
+        profiler = ProfilerSink() if args.profile else None
+        if profiler is not None:
+            add_sink(profiler)
+            stack.callback(remove_sink, profiler)
+        summary = run(
+            args.bib,
+            args.meta,
+            args.out,
+            client,
+            jobs=args.jobs,
+            per_host=args.per_host,
+            incremental=not args.full_refresh,
+            dedupe=args.dedupe,
+            cache_dir=args.cache_dir,
+            select=_selection(args),
+            on_asset=on_asset,
+            durability=args.durability,
+            page_cache=PageCache(args.page_cache, args.page_ttl) if args.page_cache else None,
+            extract_jobs=args.extract_jobs,
+        )
+    if profiler is not None:
+        logger.info("Stage profile:\n%s", profiler.report())
+    agg = totals(m for rec in summary.processed for m in rec.metrics)
+    if agg["requests"]:
+        logger.info(
+            "Sent %d requests over %d new connections (%.0f%% reused)",
+            agg["requests"],
+            agg["connections"],
+            100 * agg["connection_reuse"],
+        )
+    if args.report is not None:
+        _write_report(args.report, summary)
 
     for rec in summary.processed:
         for p in rec.paths:
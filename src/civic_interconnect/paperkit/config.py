@@ -2,22 +2,40 @@
 
 This module provides:
 - TypedDict definitions for asset and metadata configuration
-- Functions to load and normalize metadata from YAML files
+- Functions to load and normalize metadata from YAML files (using libyaml's
+  CSafeLoader when PyYAML was built with it)
+- LazyMeta: A read-only mapping that parses each entry on first access
 - Default file extension configurations for allowed assets
+- The name of the run-state directory kept under the output root
 
 File: src/civic_interconnect/paperkit/config.py
 """
 
+from collections.abc import Iterator, Mapping
+from functools import cache
 from pathlib import Path
+import re
 from typing import Any, NotRequired, TypedDict, cast
 
-import yaml
-
 from .log import logger
 
 DEFAULT_ALLOWED_EXTS: list[str] = [".csv", ".xlsx", ".xls", ".zip", ".tsv", ".json", ".xml", ".pdf"]
 
 
+# A top-level block mapping key: plain, "double" or 'single' quoted.
+_TOP_LEVEL_KEY = re.compile(
+    r"""(?:"([^"\\]*)"|'([^']*)'|([^\s#'"&*!|>%@`{}\[\],?:-][^#]*?))[ \t]*:(?:[ \t]|$)"""
+)
+# Anchors and aliases can tie entries together, so such files are parsed eagerly.
+_ANCHOR_OR_ALIAS = re.compile(r"(?:^|[\s\[{,])[&*][^\s\[\]{},]")
+
+# Default output root of the CLI and of verify.
+DEFAULT_OUTPUT_ROOT: Path = Path("data/raw")
+
+# Directory under the output root that holds run state (manifest, caches).
+STATE_DIR_NAME: str = ".paperkit"
+
+
 class DirectAssetTD(TypedDict, total=False):
     """TypedDict for direct asset configuration.
 
@@ -29,11 +47,23 @@ class DirectAssetTD(TypedDict, total=False):
         Optional filename for the asset.
     checksum : NotRequired[str]
         Optional checksum for the asset.
+    extract : NotRequired[bool]
+        Unpack downloaded .zip files into a folder named after the archive.
+    extract_include : NotRequired[list[str]]
+        Globs of archive members to unpack (default: all).
+    extract_exclude : NotRequired[list[str]]
+        Globs of archive members to skip.
+    extract_max_bytes : NotRequired[int]
+        Most uncompressed bytes unpacked from one archive (default 2 GiB).
     """
 
     url: str
     filename: NotRequired[str]
     checksum: NotRequired[str]
+    extract: NotRequired[bool]
+    extract_include: NotRequired[list[str]]
+    extract_exclude: NotRequired[list[str]]
+    extract_max_bytes: NotRequired[int]
 
 
 class PageAssetTD(TypedDict, total=False):
@@ -51,6 +81,24 @@ class PageAssetTD(TypedDict, total=False):
         Optional limit on number of assets to collect.
     base_url : NotRequired[str]
         Optional base URL for relative links.
+    max_depth : NotRequired[int]
+        Levels of linked pages to crawl below page_url (default 0: no crawl).
+    same_host : NotRequired[bool]
+        Only crawl pages on page_url's host (default True).
+    follow_regex : NotRequired[str]
+        Only crawl page links matching this regex.
+    max_pages : NotRequired[int]
+        Most pages crawled for this asset (default 50).
+    respect_robots : NotRequired[bool]
+        Skip crawled URLs disallowed by robots.txt (default True).
+    extract : NotRequired[bool]
+        Unpack downloaded .zip files into a folder named after the archive.
+    extract_include : NotRequired[list[str]]
+        Globs of archive members to unpack (default: all).
+    extract_exclude : NotRequired[list[str]]
+        Globs of archive members to skip.
+    extract_max_bytes : NotRequired[int]
+        Most uncompressed bytes unpacked from one archive (default 2 GiB).
     """
 
     page_url: str
@@ -58,9 +106,42 @@ class PageAssetTD(TypedDict, total=False):
     href_regex: NotRequired[str]
     limit: NotRequired[int]
     base_url: NotRequired[str]
+    max_depth: NotRequired[int]
+    same_host: NotRequired[bool]
+    follow_regex: NotRequired[str]
+    max_pages: NotRequired[int]
+    respect_robots: NotRequired[bool]
+    extract: NotRequired[bool]
+    extract_include: NotRequired[list[str]]
+    extract_exclude: NotRequired[list[str]]
+    extract_max_bytes: NotRequired[int]
+
+
+class SocrataAssetTD(TypedDict, total=False):
+    """TypedDict for a paged Socrata (SODA) export.
+
+    Attributes
+    ----------
+    soda_url : str
+        The dataset's resource URL, e.g. https://data.cdc.gov/resource/e2d5-ggg7.csv.
+    filename : NotRequired[str]
+        Optional filename for the saved CSV.
+    page_size : NotRequired[int]
+        Rows requested per page (default 50000).
+    order : NotRequired[str]
+        $order clause keeping pages stable (default ":id").
+    where : NotRequired[str]
+        Optional $where filter.
+    """
 
+    soda_url: str
+    filename: NotRequired[str]
+    page_size: NotRequired[int]
+    order: NotRequired[str]
+    where: NotRequired[str]
 
-AssetTD = DirectAssetTD | PageAssetTD
+
+AssetTD = DirectAssetTD | PageAssetTD | SocrataAssetTD
 
 
 class EntryMetaTD(TypedDict, total=False):
@@ -86,6 +167,8 @@ MetaTD = dict[str, EntryMetaTD]
 
 def _normalize_entry(entry: EntryMetaTD) -> EntryMetaTD:
     # Ensure assets list exists if present and normalize allow_ext
+    if not isinstance(entry, dict):
+        return entry
     assets = entry.get("assets")
     if isinstance(assets, list):
         norm_assets: list[AssetTD] = []
@@ -98,36 +181,136 @@ def _normalize_entry(entry: EntryMetaTD) -> EntryMetaTD:
     return entry
 
 
-def load_meta(meta_path: Path) -> MetaTD:
-    """Load metadata from a YAML file.
+@cache
+def _yaml() -> tuple[Any, Any]:
+    """Import PyYAML on first use; return the module and its fastest safe loader."""
+    import yaml
+
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _parse_yaml_mapping(text: str, source: Path) -> MetaTD:
+    yaml, loader = _yaml()
+    loaded: Any = yaml.load(text, Loader=loader)
+    if loaded is None:
+        return {}
+    if isinstance(loaded, dict):
+        return cast("MetaTD", loaded)
+    raise ValueError(f"{source} must be a mapping of bibkeys")
+
+
+def _index_entries(text: str) -> dict[str, tuple[int, int]] | None:
+    """Map each top-level key of a YAML block mapping to its (start, end) offsets.
+
+    Returns None when the document cannot be split safely by lines, e.g. it
+    uses anchors/aliases, flow style or directives at the top level.
+    """
+    if _ANCHOR_OR_ALIAS.search(text):
+        return None
+    spans: dict[str, tuple[int, int]] = {}
+    key: str | None = None
+    start = pos = 0
+    for line in text.splitlines(keepends=True):
+        if line[:1] not in ("", " ", "\t", "#", "\r", "\n"):
+            m = _TOP_LEVEL_KEY.match(line)
+            if m is None:
+                return None
+            if key is not None:
+                spans[key] = (start, pos)
+            key = next(g for g in m.groups() if g is not None)
+            start = pos
+        pos += len(line)
+    if key is not None:
+        spans[key] = (start, pos)
+    return spans
+
+
+class LazyMeta(Mapping[str, EntryMetaTD]):
+    """Read-only mapping of bibkey to metadata that parses entries on demand.
+
+    Keys are known from a line index of each YAML source; an entry's text
+    is parsed and normalized the first time it is looked up.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty mapping; sources are added with _add_source."""
+        # Every key maps to its unparsed text span, or None once parsed eagerly.
+        self._spans: dict[str, tuple[str, int, int, Path] | None] = {}
+        self._loaded: dict[str, EntryMetaTD] = {}
+
+    def _add_source(self, text: str, source: Path) -> None:
+        spans = _index_entries(text)
+        if spans is None:
+            logger.debug("Parsing %s eagerly (not a plain block mapping)", source)
+            for key, entry in _parse_yaml_mapping(text, source).items():
+                self._spans[key] = None
+                self._loaded[key] = _normalize_entry(entry)
+            return
+        for key, (start, end) in spans.items():
+            self._loaded.pop(key, None)
+            self._spans[key] = (text, start, end, source)
+
+    def __getitem__(self, key: str) -> EntryMetaTD:
+        """Return the normalized entry for a bibkey, parsing it if needed."""
+        if key in self._loaded:
+            return self._loaded[key]
+        span = self._spans[key]
+        assert span is not None
+        text, start, end, source = span
+        parsed = _parse_yaml_mapping(text[start:end], source)
+        if len(parsed) != 1:
+            raise ValueError(f"Could not isolate entry {key!r} in {source}")
+        entry = _normalize_entry(next(iter(parsed.values())))
+        self._loaded[key] = entry
+        return entry
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over bibkeys without parsing entries."""
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        """Return the number of bibkeys."""
+        return len(self._spans)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if the bibkey has metadata."""
+        return key in self._spans
+
+
+def _meta_sources(meta_path: Path) -> list[Path]:
+    if not meta_path.is_dir():
+        return [meta_path]
+    return sorted(p for p in meta_path.rglob("*") if p.suffix in (".yaml", ".yml") and p.is_file())
+
+
+def load_meta(meta_path: Path) -> Mapping[str, EntryMetaTD]:
+    """Load metadata from a YAML file or a directory of YAML shards.
+
+    Only the top-level keys are read up front; each entry is parsed and
+    normalized when it is first looked up, so a large shared catalog costs
+    little when a bibliography cites only a few of its keys. Documents that
+    use anchors, aliases or top-level flow style are parsed eagerly. In a
+    directory, shards are read in sorted path order and a key in a later
+    shard overrides an earlier one.
 
     Parameters
     ----------
     meta_path : Path
-        Path to the YAML metadata file.
+        Path to the YAML metadata file, or a directory of ``*.yaml``/``*.yml`` shards.
 
     Returns
     -------
-    MetaTD
-        Dictionary containing the loaded and normalized metadata entries.
+    Mapping[str, EntryMetaTD]
+        Mapping of bibkeys to normalized metadata entries.
 
     Raises
     ------
     ValueError
-        If the YAML file does not contain a mapping of bibkeys.
+        If a YAML file does not contain a mapping of bibkeys.
     """
-    raw_text = meta_path.read_text(encoding="utf-8")
-    loaded: Any = yaml.safe_load(raw_text)
-    if loaded is None:
-        data: MetaTD = {}
-    elif isinstance(loaded, dict):
-        data = cast("MetaTD", loaded)
-    else:
-        raise ValueError("refs_meta.yaml must be a mapping of bibkeys")
-
-    # Normalize each entry
-    for key, entry in list(data.items()):
-        data[key] = _normalize_entry(entry)
-
-    logger.info("Loaded meta for %d keys from %s", len(data), meta_path)
-    return data
+    meta = LazyMeta()
+    for source in _meta_sources(meta_path):
+        meta._add_source(source.read_text(encoding="utf-8"), source)
+
+    logger.info("Loaded meta for %d keys from %s", len(meta), meta_path)
+    return meta
@@ -0,0 +1,336 @@
+"""Bounded breadth-first crawling below a page_url asset.
+
+This module provides:
+- CrawlPolicy: Depth, host, follow-pattern, frontier and robots.txt settings
+  of a page asset
+- RobotsRules: robots.txt rules per origin, parsed locally with
+  urllib.robotparser from text fetched by the caller's HTTP client
+- crawl / crawl_async: Visit pages level by level and collect the data links
+  found on them
+
+A crawl starts at the configured page (depth 0). Links that look like HTML
+pages, pass the host restriction and the optional ``follow_regex`` are
+queued for the next level, each URL at most once, until ``max_depth`` is
+reached or ``max_pages`` pages have been queued. Pages of one level are
+fetched concurrently. The configured page itself is always fetched; every
+URL discovered from it is checked against robots.txt when
+``respect_robots`` is set.
+
+File: src/civic_interconnect/paperkit/crawl.py
+"""
+
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+import re
+import threading
+from urllib.parse import urldefrag, urlparse
+from urllib.robotparser import RobotFileParser
+
+from .config import PageAssetTD
+from .log import logger
+from .scheduler import map_ordered
+
+DEFAULT_MAX_PAGES: int = 50
+DEFAULT_CRAWL_JOBS: int = 4
+
+# Suffixes of links that are followed as pages (no suffix, or a web page type).
+PAGE_SUFFIXES: frozenset[str] = frozenset(
+    {"", ".htm", ".html", ".shtml", ".xhtml", ".php", ".asp", ".aspx", ".jsp", ".cfm"}
+)
+
+# Visit a page: return its data links (allow_ext / href_regex applied) and all its links.
+Visit = Callable[[str], tuple[list[str], list[str]]]
+# Fetch a robots.txt URL: return its text (None if unavailable) and HTTP status.
+FetchRobots = Callable[[str], tuple[str | None, int | None]]
+
+
+@dataclass
+class CrawlPolicy:
+    """How far to crawl below a page asset.
+
+    Attributes
+    ----------
+    max_depth : int
+        Levels of linked pages to visit below the configured page (0 = only
+        the page itself, the default single-level behaviour).
+    same_host : bool
+        Only follow links to the configured page's host.
+    follow_regex : str | None
+        Only follow page links whose URL matches this pattern.
+    max_pages : int
+        Most pages queued for one asset, including the configured page.
+    respect_robots : bool
+        Skip discovered URLs disallowed by the host's robots.txt.
+    """
+
+    max_depth: int = 0
+    same_host: bool = True
+    follow_regex: str | None = None
+    max_pages: int = DEFAULT_MAX_PAGES
+    respect_robots: bool = True
+    _follow: re.Pattern[str] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compile the follow pattern."""
+        self._follow = re.compile(self.follow_regex, re.IGNORECASE) if self.follow_regex else None
+
+    @classmethod
+    def from_asset(cls, asset: PageAssetTD) -> "CrawlPolicy":
+        """Read the crawl settings of a page asset."""
+        return cls(
+            max_depth=int(asset.get("max_depth", 0)),
+            same_host=bool(asset.get("same_host", True)),
+            follow_regex=asset.get("follow_regex"),
+            max_pages=int(asset.get("max_pages", DEFAULT_MAX_PAGES)),
+            respect_robots=bool(asset.get("respect_robots", True)),
+        )
+
+    def follows(self, start_url: str, url: str) -> bool:
+        """Return True if a link found while crawling should be visited as a page."""
+        parts = urlparse(url)
+        if parts.scheme not in ("http", "https"):
+            return False
+        if self.same_host and parts.hostname != urlparse(start_url).hostname:
+            return False
+        if Path(parts.path).suffix.lower() not in PAGE_SUFFIXES:
+            return False
+        return self._follow is None or self._follow.search(url) is not None
+
+
+class _OriginRules(RobotFileParser):
+    """Parsed robots.txt rules, or a blanket verdict for an origin without them."""
+
+    def __init__(self, url: str, everything: bool | None = None) -> None:
+        super().__init__(url)
+        # True/False allows/disallows every URL; None defers to the parsed rules.
+        self.everything = everything
+
+    def can_fetch(self, useragent: str, url: str) -> bool:
+        """Return the blanket verdict if there is one, else apply the parsed rules."""
+        if self.everything is not None:
+            return self.everything
+        return super().can_fetch(useragent, url)
+
+
+class RobotsRules:
+    """robots.txt rules per origin.
+
+    Parameters
+    ----------
+    user_agent : str
+        The user agent matched against the rules.
+    """
+
+    def __init__(self, user_agent: str = "*") -> None:
+        """Create an empty rule set."""
+        self.user_agent = user_agent
+        self._parsers: dict[str, _OriginRules] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def robots_url(url: str) -> str:
+        """Return the robots.txt URL for the origin of a URL."""
+        parts = urlparse(url)
+        return f"{parts.scheme}://{parts.netloc}/robots.txt"
+
+    def known(self, url: str) -> bool:
+        """Return True if the rules for the URL's origin have been added."""
+        with self._lock:
+            return self.robots_url(url) in self._parsers
+
+    def add(self, robots_url: str, text: str | None, status: int | None = None) -> None:
+        """Add the rules of one origin.
+
+        Parameters
+        ----------
+        robots_url : str
+            The robots.txt URL.
+        text : str | None
+            The robots.txt body, or None if it could not be fetched.
+        status : int | None
+            HTTP status of the attempt; 401 and 403 disallow the whole origin,
+            any other failure allows it.
+        """
+        if text is not None:
+            parser = _OriginRules(robots_url)
+            parser.parse(text.splitlines())
+        else:
+            parser = _OriginRules(robots_url, everything=status not in (401, 403))
+        with self._lock:
+            self._parsers[robots_url] = parser
+
+    def allowed(self, url: str) -> bool:
+        """Return True unless the origin's robots.txt disallows the URL."""
+        with self._lock:
+            parser = self._parsers.get(self.robots_url(url))
+        return parser is None or parser.can_fetch(self.user_agent, url)
+
+
+@dataclass
+class _Frontier:
+    """Visited pages and the data links collected so far for one crawl."""
+
+    policy: CrawlPolicy
+    start_url: str
+    queued: set[str] = field(default_factory=set)
+    found: list[str] = field(default_factory=list)
+    seen_data: set[str] = field(default_factory=set)
+
+    def __post_init__(self) -> None:
+        self.queued.add(urldefrag(self.start_url).url)
+
+    def collect(self, data_links: Iterable[str], robots: RobotsRules | None) -> None:
+        for u in data_links:
+            if u not in self.seen_data and (robots is None or robots.allowed(u)):
+                self.seen_data.add(u)
+                self.found.append(u)
+
+    def candidates(self, links: Iterable[str]) -> list[str]:
+        """Return unvisited, followable links (before the robots check)."""
+        out: list[str] = []
+        for link in links:
+            url = urldefrag(link).url
+            if (
+                url not in self.queued
+                and url not in out
+                and self.policy.follows(self.start_url, url)
+            ):
+                out.append(url)
+        return out
+
+    def absorb(
+        self, results: Iterable[tuple[list[str], list[str]]], depth: int, robots: RobotsRules | None
+    ) -> list[str]:
+        """Collect the data links of one level and return candidate pages for the next."""
+        nxt: list[str] = []
+        for data, links in results:
+            self.collect(data, robots)
+            if depth < self.policy.max_depth:
+                nxt.extend(self.candidates(links))
+        return nxt
+
+    def enqueue(self, urls: Iterable[str], robots: RobotsRules | None) -> list[str]:
+        level: list[str] = []
+        for url in urls:
+            if len(self.queued) >= self.policy.max_pages:
+                logger.info("Crawl of %s stopped at %d pages", self.start_url, len(self.queued))
+                break
+            if url in self.queued:
+                continue
+            if robots is not None and not robots.allowed(url):
+                logger.debug("robots.txt disallows %s", url)
+                continue
+            self.queued.add(url)
+            level.append(url)
+        return level
+
+
+def _missing_robots(robots: RobotsRules, urls: Iterable[str]) -> list[str]:
+    return sorted({robots.robots_url(u) for u in urls if not robots.known(u)})
+
+
+def crawl(
+    start_url: str,
+    visit: Visit,
+    policy: CrawlPolicy,
+    *,
+    robots: RobotsRules | None = None,
+    fetch_robots: FetchRobots | None = None,
+    jobs: int = DEFAULT_CRAWL_JOBS,
+) -> list[str]:
+    """Crawl from a page and return the data links found, in discovery order.
+
+    Parameters
+    ----------
+    start_url : str
+        The configured page (depth 0). Errors fetching it propagate; errors on
+        deeper pages are logged and the page is skipped.
+    visit : Callable[[str], tuple[list[str], list[str]]]
+        Fetches a page and returns its data links and all of its links.
+    policy : CrawlPolicy
+        Depth, host and frontier limits.
+    robots : RobotsRules | None
+        Rules to check discovered URLs against (with policy.respect_robots).
+    fetch_robots : Callable[[str], tuple[str | None, int | None]] | None
+        Fetches a robots.txt the rules do not know yet.
+    jobs : int
+        Pages of one level fetched at once.
+
+    Returns
+    -------
+    list[str]
+        Unique data links from all visited pages.
+    """
+    rules = robots if policy.respect_robots else None
+    frontier = _Frontier(policy, start_url)
+
+    def guarded(url: str) -> tuple[list[str], list[str]]:
+        if url == start_url:
+            return visit(url)
+        try:
+            return visit(url)
+        except Exception as exc:  # noqa: BLE001 - one bad subpage must not end the crawl
+            logger.warning("Skipping crawled page %s: %s", url, exc)
+            return [], []
+
+    def learn_robots(urls: Iterable[str]) -> None:
+        if rules is not None and fetch_robots is not None:
+            for robots_url in _missing_robots(rules, urls):
+                rules.add(robots_url, *fetch_robots(robots_url))
+
+    level = [start_url]
+    for depth in range(policy.max_depth + 1):
+        results = map_ordered(guarded, level, jobs)
+        learn_robots(u for data, _ in results for u in data)
+        nxt = frontier.absorb(results, depth, rules)
+        learn_robots(nxt)
+        level = frontier.enqueue(nxt, rules)
+        if not level:
+            break
+    logger.debug("Crawled %d pages from %s", len(frontier.queued), start_url)
+    return frontier.found
+
+
+async def crawl_async(
+    start_url: str,
+    visit: Callable[[str], Awaitable[tuple[list[str], list[str]]]],
+    policy: CrawlPolicy,
+    *,
+    robots: RobotsRules | None = None,
+    fetch_robots: Callable[[str], Awaitable[tuple[str | None, int | None]]] | None = None,
+    jobs: int = DEFAULT_CRAWL_JOBS,
+) -> list[str]:
+    """Asyncio counterpart of crawl, with awaitable visit and fetch_robots."""
+    import asyncio
+
+    rules = robots if policy.respect_robots else None
+    frontier = _Frontier(policy, start_url)
+    gate = asyncio.Semaphore(max(1, jobs))
+
+    async def guarded(url: str) -> tuple[list[str], list[str]]:
+        async with gate:
+            if url == start_url:
+                return await visit(url)
+            try:
+                return await visit(url)
+            except Exception as exc:  # noqa: BLE001 - one bad subpage must not end the crawl
+                logger.warning("Skipping crawled page %s: %s", url, exc)
+                return [], []
+
+    async def learn_robots(urls: Iterable[str]) -> None:
+        if rules is not None and fetch_robots is not None:
+            for robots_url in _missing_robots(rules, urls):
+                rules.add(robots_url, *(await fetch_robots(robots_url)))
+
+    level = [start_url]
+    for depth in range(policy.max_depth + 1):
+        results = await asyncio.gather(*(guarded(u) for u in level))
+        await learn_robots(u for data, _ in results for u in data)
+        nxt = frontier.absorb(results, depth, rules)
+        await learn_robots(nxt)
+        level = frontier.enqueue(nxt, rules)
+        if not level:
+            break
+    logger.debug("Crawled %d pages from %s", len(frontier.queued), start_url)
+    return frontier.found
@@ -4,19 +4,37 @@ This module provides:
 - ensure_dir: Create directories recursively if they don't exist
 - safe_filename: Convert strings to filesystem-safe filenames
 - sha256_file: Calculate SHA256 hash of a file
-- write_bytes: Write bytes to a file with directory creation
-- download_file: Download files with optional checksum verification
+- write_bytes: Write bytes to a file atomically (temp file + rename)
+- write_chunks: Stream byte chunks to a file atomically, hashing in the same pass
+- download_file_async: Asyncio counterpart of download_file for small assets
+- download_file: Stream files to disk with optional checksum verification,
+  skipping unchanged files via conditional GET when a Manifest is given and
+  resuming interrupted transfers with HTTP Range requests
 
 File: src/civic_interconnect/paperkit/download.py
 """
 
+from collections.abc import Iterable
 import hashlib
 from html import unescape
+import json
+import os
 from pathlib import Path
 import re
+import threading
 from typing import Any
 
+from .durability import SyncPolicy
+from .instrument import span
 from .log import logger
+from .manifest import Manifest, ManifestEntry
+from .metrics import note_bytes, note_cache, note_retry
+from .store import BlobStore
+
+DEFAULT_CHUNK_SIZE: int = 1024 * 1024
+PART_SUFFIX: str = ".part"
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-\d+/(\d+|\*)")
 
 
 def ensure_dir(p: Path) -> None:
@@ -64,14 +82,34 @@ def sha256_file(path: Path) -> str:
         The SHA256 hexadecimal digest of the file.
     """
     h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+    with span("download.sha256_file", path=str(path)) as sp, path.open("rb") as f:
+        size = 0
+        for chunk in iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b""):
             h.update(chunk)
+            size += len(chunk)
+        sp.set("bytes", size)
     return h.hexdigest()
 
 
-def write_bytes(path: Path, content: bytes) -> None:
-    """Write bytes to a file, creating parent directories if necessary.
+def _temp_path(path: Path) -> Path:
+    """Return a temporary name next to `path`, unique per process and thread."""
+    return path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+def _install(tmp: Path, path: Path, sync: SyncPolicy | None) -> None:
+    """Rename a finished temporary file over `path`, applying the sync policy."""
+    if sync is not None:
+        sync.before_rename(tmp)
+    tmp.replace(path)
+    if sync is not None:
+        sync.saved(path)
+
+
+def write_bytes(path: Path, content: bytes, sync: SyncPolicy | None = None) -> None:
+    """Write bytes to a file atomically, creating parent directories if necessary.
+
+    The content goes to a temporary file in the same directory, which is then
+    renamed over `path`, so readers see either the old file or the new one.
 
     Parameters
     ----------
@@ -79,30 +117,418 @@ def write_bytes(path: Path, content: bytes) -> None:
         The file path to write to.
     content : bytes
         The bytes content to write.
+    sync : SyncPolicy | None, optional
+        Durability policy applied around the rename (default: no fsync).
 
     Returns
     -------
     None
     """
     ensure_dir(path.parent)
-    with path.open("wb") as f:
-        f.write(content)
+    tmp = _temp_path(path)
+    try:
+        with span("download.write_bytes", path=str(path), bytes=len(content)), tmp.open("wb") as f:
+            f.write(content)
+        _install(tmp, path, sync)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    logger.info("Saved %s", path)
+
+
+def write_chunks(path: Path, chunks: Iterable[bytes], sync: SyncPolicy | None = None) -> str:
+    """Write byte chunks to a file atomically and return the SHA256 of what was written.
+
+    Only one chunk is held in memory at a time, so peak memory is bounded by
+    the chunk size rather than the file size. As in write_bytes, the file
+    appears at `path` only once it is complete.
+
+    Parameters
+    ----------
+    path : Path
+        The file path to write to.
+    chunks : Iterable[bytes]
+        Byte chunks in file order; empty chunks are skipped.
+    sync : SyncPolicy | None, optional
+        Durability policy applied around the rename (default: no fsync).
+
+    Returns
+    -------
+    str
+        The SHA256 hexadecimal digest of the written content.
+    """
+    ensure_dir(path.parent)
+    h = hashlib.sha256()
+    tmp = _temp_path(path)
+    try:
+        with span("download.write_chunks", path=str(path)) as sp, tmp.open("wb") as f:
+            size = 0
+            for chunk in chunks:
+                if chunk:
+                    h.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            sp.set("bytes", size)
+        _install(tmp, path, sync)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
     logger.info("Saved %s", path)
+    return h.hexdigest()
+
+
+def _validators(
+    manifest: Manifest | None, url: str, out_path: Path, checksum: str | None
+) -> ManifestEntry | None:
+    """Return the manifest entry usable for a conditional GET, if any.
+
+    The entry is only trusted when it was recorded for the same URL, the file
+    is still on disk with the recorded size, and (when a checksum is expected)
+    the recorded digest matches it.
+    """
+    if manifest is None:
+        return None
+    prev = manifest.get(out_path)
+    if prev is None or prev.url != url or not (prev.etag or prev.last_modified):
+        return None
+    try:
+        size = out_path.stat().st_size
+    except OSError:
+        return None
+    if prev.size is not None and size != prev.size:
+        return None
+    if checksum and (prev.sha256 or "").lower() != checksum.lower():
+        return None
+    return prev
+
+
+class _PartialDownload:
+    """State of an in-progress download kept in a ``.part`` file.
+
+    A JSON sidecar next to the part file records the source URL and the
+    validator (strong ETag or Last-Modified) used for If-Range, so a later
+    attempt or a later run can resume with a Range request.
+    """
+
+    def __init__(self, out_path: Path, url: str) -> None:
+        self.url = url
+        self.part = out_path.with_name(out_path.name + PART_SUFFIX)
+        self.sidecar = self.part.with_name(self.part.name + ".json")
+        self.offset = 0
+        self.hasher = hashlib.sha256()
+        self.validator: str | None = None
+        self.resumable = False
+
+    def restore(self) -> None:
+        """Pick up a part file left by an earlier run, if it can be resumed."""
+        try:
+            state: Any = json.loads(self.sidecar.read_text(encoding="utf-8"))
+            usable = state.get("url") == self.url and state.get("validator")
+        except (OSError, ValueError, AttributeError):
+            usable = False
+        if not usable or not self.part.exists():
+            self.discard()
+            return
+        self.validator = state["validator"]
+        self.resumable = True
+        with self.part.open("rb") as f:
+            for chunk in iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b""):
+                self.hasher.update(chunk)
+                self.offset += len(chunk)
+        logger.info("Resuming %s from %d bytes", self.part, self.offset)
+
+    def start(self, resp: Any) -> None:
+        """Begin a fresh part file for a full (200) response."""
+        self.offset = 0
+        self.hasher = hashlib.sha256()
+        self.validator = _range_validator(resp)
+        self.resumable = self.validator is not None and _accepts_ranges(resp)
+        ensure_dir(self.part.parent)
+        self.part.write_bytes(b"")
+        self.sidecar.write_text(
+            json.dumps({"url": self.url, "validator": self.validator if self.resumable else None}),
+            encoding="utf-8",
+        )
+
+    def append(self, chunks: Iterable[bytes]) -> None:
+        """Append chunks to the part file, updating the running digest."""
+        start = self.offset
+        with span("download.receive", url=self.url) as sp, self.part.open("ab") as f:
+            try:
+                for chunk in chunks:
+                    if chunk:
+                        self.hasher.update(chunk)
+                        f.write(chunk)
+                        self.offset += len(chunk)
+            finally:
+                sp.set("bytes", self.offset - start)
+
+    def discard(self) -> None:
+        """Remove the part file and its sidecar."""
+        self.part.unlink(missing_ok=True)
+        self.sidecar.unlink(missing_ok=True)
+        self.offset = 0
+        self.hasher = hashlib.sha256()
+        self.resumable = False
+
+    def commit(self, out_path: Path, sync: SyncPolicy | None = None) -> None:
+        """Atomically move the completed part file into place."""
+        _install(self.part, out_path, sync)
+        self.sidecar.unlink(missing_ok=True)
+        logger.info("Saved %s", out_path)
+
+
+def _identity_encoded(resp: Any) -> bool:
+    return resp.headers.get("Content-Encoding", "identity").lower() in ("", "identity")
+
+
+def _accepts_ranges(resp: Any) -> bool:
+    if not _identity_encoded(resp):
+        return False
+    return resp.status_code == 206 or resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+
+
+def _range_validator(resp: Any) -> str | None:
+    """Return a validator usable in If-Range (strong ETag or Last-Modified)."""
+    etag = resp.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return resp.headers.get("Last-Modified")
+
+
+def _range_start(resp: Any) -> int | None:
+    m = _CONTENT_RANGE_RE.match(resp.headers.get("Content-Range", ""))
+    return int(m.group(1)) if m else None
 
 
-def download_file(client: Any, url: str, out_path: Path, checksum: str | None = None) -> Path:
+def _total_size(resp: Any, offset: int) -> int | None:
+    """Return the expected full size of the file, or None if unknown."""
+    if not _identity_encoded(resp):
+        return None
+    if resp.status_code == 206:
+        m = _CONTENT_RANGE_RE.match(resp.headers.get("Content-Range", ""))
+        return int(m.group(2)) if m and m.group(2) != "*" else None
+    length = resp.headers.get("Content-Length", "")
+    return int(length) + offset if length.isdigit() else None
+
+
+def _request(
+    client: Any, url: str, partial: _PartialDownload, prev: ManifestEntry | None, final: bool
+) -> Any | None:
+    """Send a conditional, ranged or plain GET for the next attempt.
+
+    Returns None when the server rejected the resume range (416); the part
+    file is then discarded so the next attempt starts from zero.
+    """
+    import requests
+
+    resuming = partial.resumable and partial.offset > 0
+    try:
+        return client.get(
+            url,
+            stream=True,
+            etag=prev.etag if prev and not resuming else None,
+            last_modified=prev.last_modified if prev and not resuming else None,
+            range_start=partial.offset if resuming else None,
+            if_range=partial.validator if resuming else None,
+        )
+    except requests.HTTPError as exc:
+        status = exc.response.status_code if exc.response is not None else None
+        if not resuming or status != 416 or final:
+            raise
+    logger.warning("Range not satisfiable for %s; restarting", url)
+    partial.discard()
+    return None
+
+
+def _receive(resp: Any, partial: _PartialDownload) -> int | None:
+    """Stream a response body into the part file; return the expected total size."""
+    if resp.status_code == 206:
+        import requests
+
+        if not (partial.resumable and _range_start(resp) == partial.offset):
+            partial.discard()
+            raise requests.RequestException(f"unexpected partial response for {partial.url}")
+        logger.info("Resuming %s at byte %d", partial.url, partial.offset)
+    else:
+        partial.start(resp)
+    total = _total_size(resp, partial.offset)
+    before = partial.offset
+    try:
+        partial.append(resp.iter_content(chunk_size=DEFAULT_CHUNK_SIZE))
+    finally:
+        note_bytes(partial.offset - before)
+    return total
+
+
+def _transfer(
+    client: Any, url: str, partial: _PartialDownload, prev: ManifestEntry | None
+) -> Any | None:
+    """Fetch url into the part file, resuming after interruptions.
+
+    Returns the headers of the final response, or None if the server
+    answered 304 Not Modified.
+    """
+    import requests
+
+    attempts = max(1, int(getattr(client, "retries", 3)))
+    for attempt in range(1, attempts + 1):
+        final = attempt == attempts
+        resp = _request(client, url, partial, prev, final)
+        if resp is None:
+            continue
+        try:
+            if resp.status_code == 304:
+                partial.discard()
+                note_cache("not_modified")
+                return None
+            total = _receive(resp, partial)
+        except requests.RequestException as exc:
+            if final:
+                if not partial.resumable:
+                    partial.discard()
+                raise
+            note_retry()
+            how = "resuming" if partial.resumable else "restarting"
+            logger.warning(
+                "Download of %s interrupted at %d bytes (%s): %s", url, partial.offset, how, exc
+            )
+            continue
+        finally:
+            resp.close()
+        if total is None or partial.offset == total:
+            return resp.headers
+        msg = f"incomplete download of {url}: got {partial.offset} of {total} bytes"
+        if final:
+            raise ValueError(msg)
+        note_retry()
+        logger.warning("%s; retrying", msg)
+    raise RuntimeError(f"download of {url} failed unexpectedly")
+
+
+def download_file(
+    client: Any,
+    url: str,
+    out_path: Path,
+    checksum: str | None = None,
+    manifest: Manifest | None = None,
+    store: BlobStore | None = None,
+    sync: SyncPolicy | None = None,
+) -> Path:
     """Download a file from a URL, save it to a path, and optionally verify its checksum.
 
+    The response body is streamed in chunks to ``<out_path>.part`` and hashed
+    while it is written, so the file is never held fully in memory or read
+    back. Only after the size (Content-Length / Content-Range) and optional
+    checksum are validated is the part file renamed over `out_path`, so an
+    interrupted download never truncates an existing file.
+
+    If the stream breaks and the server advertised ``Accept-Ranges: bytes``,
+    the download resumes with ``Range: bytes=N-`` (guarded by If-Range) up to
+    the client's retry count. A resumable part file left by an earlier run is
+    picked up the same way.
+
+    When a manifest is given and it holds validators for this file, the
+    request is sent with If-None-Match/If-Modified-Since; a 304 response
+    leaves the existing file untouched. Fresh downloads are recorded in the
+    manifest with their validators, size and digest.
+
     Parameters
     ----------
     client : Any
-        HTTP client with a .get(url) method returning a response with .content.
+        HTTP client whose .get(url, stream=True, etag=..., last_modified=...,
+        range_start=..., if_range=...) returns a response with .status_code,
+        .headers, .iter_content() and .close().
     url : str
         The URL to download the file from.
     out_path : Path
         The path to save the downloaded file.
     checksum : str | None, optional
         Optional SHA256 checksum to verify the downloaded file.
+    manifest : Manifest | None, optional
+        Optional manifest used for conditional requests and updated on success.
+    store : BlobStore | None, optional
+        Optional content-addressed store; the saved file is linked to its blob.
+    sync : SyncPolicy | None, optional
+        Durability policy for the saved file (default: no fsync).
+
+    Returns
+    -------
+    Path
+        The path to the saved file.
+
+    Raises
+    ------
+    ValueError
+        If the checksum does not match or the download is incomplete.
+    """
+    prev = _validators(manifest, url, out_path, checksum)
+    logger.info("Downloading %s -> %s", url, out_path)
+    partial = _PartialDownload(out_path, url)
+    partial.restore()
+    with span("download.file", url=url, path=str(out_path)) as sp:
+        headers = _transfer(client, url, partial, prev)
+        sp.set("bytes", partial.offset)
+    if headers is None:
+        logger.info("Up to date %s", out_path)
+        return out_path
+
+    actual = partial.hasher.hexdigest()
+    if checksum and actual.lower() != checksum.lower():
+        partial.discard()
+        logger.error("Checksum mismatch for %s", out_path)
+        raise ValueError(f"checksum mismatch for {out_path}")
+    size = partial.offset
+    partial.commit(out_path, sync)
+    if store is not None:
+        store.ingest(out_path, actual)
+    if manifest is not None:
+        manifest.record(
+            out_path,
+            ManifestEntry(
+                url=url,
+                etag=headers.get("ETag"),
+                last_modified=headers.get("Last-Modified"),
+                size=size,
+                sha256=actual,
+            ),
+        )
+    return out_path
+
+
+async def download_file_async(
+    client: Any,
+    url: str,
+    out_path: Path,
+    checksum: str | None = None,
+    manifest: Manifest | None = None,
+    store: BlobStore | None = None,
+    sync: SyncPolicy | None = None,
+) -> Path:
+    """Download a file with an async client, verify it, and save it atomically.
+
+    The body is read by the client in one piece, which suits the many small
+    assets this path is meant for; use download_file for very large files.
+    Disk writes run in a worker thread so the event loop is never blocked.
+    Conditional requests and manifest updates work as in download_file.
+
+    Parameters
+    ----------
+    client : Any
+        Async HTTP client whose awaitable .get(url, etag=..., last_modified=...)
+        returns a response with .status_code, .headers and .content.
+    url : str
+        The URL to download the file from.
+    out_path : Path
+        The path to save the downloaded file.
+    checksum : str | None, optional
+        Optional SHA256 checksum to verify the downloaded file.
+    manifest : Manifest | None, optional
+        Optional manifest used for conditional requests and updated on success.
+    store : BlobStore | None, optional
+        Optional content-addressed store; the saved file is linked to its blob.
+    sync : SyncPolicy | None, optional
+        Durability policy for the saved file (default: no fsync).
 
     Returns
     -------
@@ -114,12 +540,37 @@ def download_file(client: Any, url: str, out_path: Path, checksum: str | None =
     ValueError
         If the checksum does not match.
     """
+    import asyncio
+
+    prev = _validators(manifest, url, out_path, checksum)
     logger.info("Downloading %s -> %s", url, out_path)
-    resp = client.get(url)
-    write_bytes(out_path, resp.content)
-    if checksum:
-        actual = sha256_file(out_path)
-        if actual.lower() != checksum.lower():
-            logger.error("Checksum mismatch for %s", out_path)
-            raise ValueError(f"checksum mismatch for {out_path}")
+    resp = await client.get(
+        url,
+        etag=prev.etag if prev else None,
+        last_modified=prev.last_modified if prev else None,
+    )
+    if prev is not None and resp.status_code == 304:
+        note_cache("not_modified")
+        logger.info("Up to date %s", out_path)
+        return out_path
+    content: bytes = resp.content
+    note_bytes(len(content))
+    actual = hashlib.sha256(content).hexdigest()
+    if checksum and actual.lower() != checksum.lower():
+        logger.error("Checksum mismatch for %s", out_path)
+        raise ValueError(f"checksum mismatch for {out_path}")
+    await asyncio.to_thread(write_bytes, out_path, content, sync)
+    if store is not None:
+        await asyncio.to_thread(store.ingest, out_path, actual)
+    if manifest is not None:
+        manifest.record(
+            out_path,
+            ManifestEntry(
+                url=url,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+                size=len(content),
+                sha256=actual,
+            ),
+        )
     return out_path
@@ -1,17 +1,91 @@
 """HTTP client wrapper for making GET requests with retries and logging.
 
-This module provides the HttpClient dataclass for robust HTTP GET requests,
-including configurable timeout, retries, backoff, and user-agent.
+This module provides the HttpClient dataclass for robust HTTP GET (and HEAD) requests,
+including configurable timeout, retries, backoff, user-agent, connection
+pooling (see transport) and optional per-host rate limiting, plus is_retryable for classifying failures and
+request_headers for building conditional and ranged requests.
 
 File: src/civic_interconnect/paperkit/http_client.py
 """
 
 from dataclasses import dataclass
+from functools import partial
+import logging
 import time
+from typing import Any
 
 import requests
 
+from .instrument import span
 from .log import logger
+from .metrics import note_cache, note_request, note_retry
+from .ratelimit import (
+    DEFAULT_MAX_BACKOFF_SECONDS,
+    RETRYABLE_STATUS,
+    HostRateLimiter,
+    backoff_delay,
+    parse_retry_after,
+)
+from .request_cache import RequestCache
+from .transport import TransportConfig, new_session
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Return True if a failed request is worth retrying.
+
+    Timeouts, dropped connections and retryable HTTP statuses (408, 425,
+    429, 5xx) are transient; everything else, such as 403/404, TLS errors or
+    malformed URLs, is fatal.
+    """
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code in RETRYABLE_STATUS
+    if isinstance(exc, requests.exceptions.SSLError):
+        return False
+    return isinstance(
+        exc, requests.ConnectionError | requests.Timeout | requests.exceptions.ChunkedEncodingError
+    )
+
+
+def request_headers(
+    user_agent: str | None,
+    *,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    range_start: int | None = None,
+    if_range: str | None = None,
+) -> dict[str, str]:
+    """Build request headers for a plain, conditional or ranged GET.
+
+    Parameters
+    ----------
+    user_agent : str | None
+        User-Agent header value, or None to leave it to the session.
+    etag : str | None
+        Sent as If-None-Match.
+    last_modified : str | None
+        Sent as If-Modified-Since.
+    range_start : int | None
+        Sent as ``Range: bytes=N-``.
+    if_range : str | None
+        Sent as If-Range alongside a Range header.
+
+    Returns
+    -------
+    dict[str, str]
+        The headers to send.
+    """
+    headers: dict[str, str] = {}
+    if user_agent:
+        headers["User-Agent"] = user_agent
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    if range_start is not None:
+        headers["Range"] = f"bytes={range_start}-"
+        if if_range:
+            headers["If-Range"] = if_range
+    return headers
 
 
 @dataclass
@@ -20,54 +94,189 @@ class HttpClient:
 
     Attributes
     ----------
-    session : requests.Session
-        The requests session used for HTTP requests.
+    session : requests.Session | HttpxSession | None
+        The session used for HTTP requests; None builds one from `transport`.
     timeout : int
         Timeout for each request in seconds.
     retries : int
         Number of retry attempts for failed requests.
     backoff_seconds : int
-        Base seconds to wait between retries (multiplied by attempt number).
+        Base seconds for exponential backoff (with jitter) between retries.
     user_agent : str
         User-Agent header for requests.
+    max_backoff_seconds : float
+        Upper bound for a single backoff, including server Retry-After values.
+    rate_limiter : HostRateLimiter | None
+        Optional per-host token bucket shared by all callers of this client.
+    cache : RequestCache | None
+        Optional cache that coalesces and memoizes plain, non-streamed GETs by
+        normalized URL.
+    transport : TransportConfig | None
+        Pool size, pool blocking, keep-alive and HTTP/2 settings for the
+        session built when none is given (default: TransportConfig()).
     """
 
-    session: requests.Session
+    session: Any = None
     timeout: int = 30
     retries: int = 3
     backoff_seconds: int = 2
     user_agent: str = "ci-paper-fetcher/1.0"
+    max_backoff_seconds: float = DEFAULT_MAX_BACKOFF_SECONDS
+    rate_limiter: HostRateLimiter | None = None
+    cache: RequestCache | None = None
+    transport: TransportConfig | None = None
+
+    def __post_init__(self) -> None:
+        """Build a pooled session from the transport settings if none was given."""
+        if self.session is None:
+            self.session = new_session(self.transport)
 
-    def get(self, url: str) -> requests.Response:
-        """Perform an HTTP GET request with retries and exponential backoff.
+    def get(
+        self,
+        url: str,
+        *,
+        stream: bool = False,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        range_start: int | None = None,
+        if_range: str | None = None,
+        quiet: bool = False,
+    ) -> requests.Response:
+        """Perform an HTTP GET request with rate limiting, retries and exponential backoff.
 
         Parameters
         ----------
         url : str
             The URL to send the GET request to.
+        stream : bool
+            If True, defer downloading the body so it can be consumed in
+            chunks with ``iter_content``. The caller must close the response.
+        etag : str | None
+            If given, sent as If-None-Match to make the request conditional.
+        last_modified : str | None
+            If given, sent as If-Modified-Since to make the request conditional.
+        range_start : int | None
+            If given, request only the bytes from this offset (``Range: bytes=N-``).
+        if_range : str | None
+            Validator sent as If-Range with a range request, so the server
+            returns the full resource instead if it has changed.
+        quiet : bool
+            Log fatal errors at DEBUG rather than ERROR, for callers that
+            expect and handle them (e.g. a missing robots.txt).
 
         Returns
         -------
         requests.Response
-            The HTTP response object.
+            The HTTP response object. A conditional request whose resource is
+            unchanged returns status 304 with an empty body. With a cache
+            attached, plain non-streamed GETs of the same URL share one request.
 
         Raises
         ------
-        Exception
-            If all retry attempts fail, the last exception is raised.
+        requests.RequestException
+            Immediately for fatal errors (e.g. 403, 404, invalid URL), or the
+            last exception once all retry attempts fail. Timeouts, connection
+            errors, 408/425/429 and 5xx are retried, waiting at least as long
+            as the server's Retry-After.
         """
-        last_exc: Exception | None = None
-        headers = {"User-Agent": self.user_agent}
-        for attempt in range(1, self.retries + 1):
-            try:
-                logger.debug("HTTP GET %s (attempt %s)", url, attempt)
-                resp = self.session.get(url, timeout=self.timeout, headers=headers)
-                resp.raise_for_status()
-                return resp
-            except Exception as exc:
-                logger.warning("HTTP GET failed for %s on attempt %s: %s", url, attempt, exc)
-                last_exc = exc
-                if attempt < self.retries:
-                    time.sleep(self.backoff_seconds * attempt)
-        logger.error("HTTP GET giving up for %s", url)
-        raise last_exc if last_exc else RuntimeError("HTTP get failed unexpectedly")
+        headers = request_headers(
+            self.user_agent,
+            etag=etag,
+            last_modified=last_modified,
+            range_start=range_start,
+            if_range=if_range,
+        )
+        plain = not (stream or etag or last_modified or range_start is not None)
+        if self.cache is not None and plain:
+            loaded = False
+
+            def load(validators: dict[str, str]) -> requests.Response:
+                nonlocal loaded
+                loaded = True
+                return self._get(url, {**headers, **validators}, False, quiet=quiet)
+
+            resp = self.cache.fetch(url, load)
+            if not loaded:
+                note_cache("hit", resp.status_code)
+            return resp
+        return self._get(url, headers, stream, quiet=quiet)
+
+    def head(self, url: str) -> requests.Response:
+        """Perform an HTTP HEAD request, following redirects, with the same retries as get.
+
+        Parameters
+        ----------
+        url : str
+            The URL to send the HEAD request to.
+
+        Returns
+        -------
+        requests.Response
+            The response of the final redirect target, without a body.
+
+        Raises
+        ------
+        requests.RequestException
+            As for get; servers that do not allow HEAD answer 405 or 501,
+            which are not retried.
+        """
+        # probe callers report HEAD failures themselves
+        return self._get(url, request_headers(self.user_agent), False, method="HEAD", quiet=True)
+
+    def _get(
+        self,
+        url: str,
+        headers: dict[str, str],
+        stream: bool,
+        method: str = "GET",
+        *,
+        quiet: bool = False,
+    ) -> requests.Response:
+        if method == "HEAD":
+            send = partial(self.session.head, allow_redirects=True)
+        else:
+            send = self.session.get
+        with span(f"http.{method.lower()}", url=url) as sp:
+            last_exc: Exception | None = None
+            for attempt in range(1, self.retries + 1):
+                sp.set("attempt", attempt)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(url)
+                retry_after: float | None = None
+                try:
+                    logger.debug("HTTP %s %s (attempt %s)", method, url, attempt)
+                    sent = time.perf_counter()
+                    resp = send(url, timeout=self.timeout, headers=headers, stream=stream)
+                    note_request(resp.status_code, time.perf_counter() - sent)
+                    sp.set("status", resp.status_code)
+                    if resp.status_code >= 400:
+                        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                        try:
+                            resp.raise_for_status()
+                        finally:
+                            resp.close()
+                    if resp.status_code == 304:
+                        logger.debug("HTTP 304 not modified for %s", url)
+                    return resp
+                except requests.RequestException as exc:
+                    if not is_retryable(exc):
+                        level = logging.DEBUG if quiet else logging.ERROR
+                        logger.log(
+                            level, "HTTP %s failed for %s (not retryable): %s", method, url, exc
+                        )
+                        raise
+                    logger.warning(
+                        "HTTP %s failed for %s on attempt %s: %s", method, url, attempt, exc
+                    )
+                    last_exc = exc
+                    if attempt < self.retries:
+                        note_retry()
+                        if retry_after is not None and self.rate_limiter is not None:
+                            self.rate_limiter.pause(url, min(retry_after, self.max_backoff_seconds))
+                        time.sleep(
+                            backoff_delay(
+                                attempt, self.backoff_seconds, self.max_backoff_seconds, retry_after
+                            )
+                        )
+            logger.error("HTTP %s giving up for %s", method, url)
+            raise last_exc if last_exc else RuntimeError(f"HTTP {method} failed unexpectedly")
@@ -0,0 +1,130 @@
+"""On-disk cache of parsed refs.bib and refs_meta.yaml.
+
+This module provides:
+- InputCache: Loads bib keys and normalized metadata, reusing pickled results
+  for inputs that have not changed
+
+Each input file gets one pickle under the cache directory, stamped with the
+file's size, mtime and SHA256. A cached result is used when the size matches
+and either the mtime or the content hash matches, so unchanged files load
+without parsing even after a fresh checkout resets their mtimes. The cache
+directory must be trusted: entries are read with pickle.
+
+File: src/civic_interconnect/paperkit/input_cache.py
+"""
+
+from collections.abc import Callable, Mapping
+import hashlib
+import os
+from pathlib import Path
+import pickle
+from typing import Any, cast
+
+from .bib import load_bib_keys
+from .config import EntryMetaTD, load_meta
+from .log import logger
+
+# Bump when the pickled value format or the parsers' output changes.
+CACHE_FORMAT: int = 2
+
+
+def _parse_meta(path: Path) -> dict[str, EntryMetaTD]:
+    """Parse and normalize every entry, so the cached value needs no YAML parsing."""
+    return dict(load_meta(path))
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class InputCache:
+    """Cache of parsed input files.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory holding the cache entries (created on first write).
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Create a cache backed by the given directory."""
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def load_bib_keys(self, bib_path: Path) -> list[str]:
+        """Load citation keys, from the cache when the file is unchanged."""
+        return cast("list[str]", self._load("bib", bib_path, load_bib_keys))
+
+    def load_meta(self, meta_path: Path) -> Mapping[str, EntryMetaTD]:
+        """Load normalized metadata, from the cache when the file is unchanged.
+
+        A cache miss parses and normalizes every entry, so that later hits
+        need no YAML parsing at all. A directory of shards is not cached;
+        its entries are loaded lazily anyway.
+        """
+        if meta_path.is_dir():
+            return load_meta(meta_path)
+        return cast("Mapping[str, EntryMetaTD]", self._load("meta", meta_path, _parse_meta))
+
+    def _entry_path(self, kind: str, path: Path) -> Path:
+        name = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{kind}-{name}.pickle"
+
+    def _load(self, kind: str, path: Path, parse: Callable[[Path], Any]) -> Any:
+        st = path.stat()
+        entry_path = self._entry_path(kind, path)
+        entry = self._read(entry_path)
+        digest: str | None = None
+        if entry is not None and entry["size"] == st.st_size:
+            if entry["mtime_ns"] == st.st_mtime_ns:
+                self.hits += 1
+                logger.debug("Input cache hit for %s", path)
+                return entry["value"]
+            digest = _sha256(path)
+            if entry["sha256"] == digest:
+                self.hits += 1
+                logger.debug("Input cache hit for %s (content unchanged)", path)
+                self._write(entry_path, {**entry, "mtime_ns": st.st_mtime_ns})
+                return entry["value"]
+
+        self.misses += 1
+        value = parse(path)
+        self._write(
+            entry_path,
+            {
+                "format": CACHE_FORMAT,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sha256": digest or _sha256(path),
+                "value": value,
+            },
+        )
+        return value
+
+    def _read(self, entry_path: Path) -> dict[str, Any] | None:
+        try:
+            with entry_path.open("rb") as f:
+                entry: Any = pickle.load(f)  # noqa: S301 - trusted local cache
+        except FileNotFoundError:
+            return None
+        except Exception as exc:  # noqa: BLE001 - any unpickling error means a stale entry
+            logger.debug("Ignoring unreadable input cache entry %s: %s", entry_path, exc)
+            return None
+        if not isinstance(entry, dict) or entry.get("format") != CACHE_FORMAT:
+            return None
+        return cast("dict[str, Any]", entry)
+
+    def _write(self, entry_path: Path, entry: dict[str, Any]) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+            with tmp.open("wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(entry_path)
+        except OSError as exc:
+            logger.warning("Could not write input cache entry %s: %s", entry_path, exc)
@@ -0,0 +1,233 @@
+"""Lightweight span instrumentation for the fetch pipeline.
+
+This module provides:
+- span: Context manager that times one stage and reports it to the installed sinks
+- Span: A timed stage with a name, attributes and parent span
+- SpanSink: Protocol for receiving span start/end events
+- add_sink / remove_sink: Install or remove sinks process-wide
+- ProfilerSink: Built-in sink that aggregates time per stage
+
+With no sink installed, span() returns a shared no-op object, so the cost
+of an instrumented call is one function call and a global lookup.
+
+Instrumented stages: ``asset`` (bibkey, url), ``http.get`` and ``http.head``
+(url, attempt, status), ``scrape.extract_links`` (url, bytes, links), ``download.file``
+(url, path, bytes), ``download.write_bytes`` / ``download.write_chunks``
+(path, bytes), ``download.receive`` (url, bytes), ``download.sha256_file``
+(path, bytes), ``extract`` (archive, members, bytes) and ``socrata.page``
+(url, offset, rows).
+
+File: src/civic_interconnect/paperkit/instrument.py
+"""
+
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+import threading
+import time
+from types import TracebackType
+from typing import Any, Protocol, Self
+
+_current: ContextVar["Span | None"] = ContextVar("paperkit_span", default=None)
+
+
+class SpanSink(Protocol):
+    """Receiver of span events. Methods may be called from any thread."""
+
+    def span_started(self, span: "Span") -> None:
+        """Handle a span that has just started."""
+        ...
+
+    def span_ended(self, span: "Span") -> None:
+        """Handle a span that has just ended (duration and attributes are final)."""
+        ...
+
+
+_sinks: tuple[SpanSink, ...] = ()
+_sinks_lock = threading.Lock()
+
+
+def add_sink(sink: SpanSink) -> None:
+    """Install a sink; spans started afterwards are reported to it."""
+    global _sinks
+    with _sinks_lock:
+        _sinks = (*_sinks, sink)
+
+
+def remove_sink(sink: SpanSink) -> None:
+    """Remove a previously installed sink (no error if absent)."""
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+
+
+class Span:
+    """One timed stage.
+
+    Attributes
+    ----------
+    name : str
+        Stage name, e.g. ``"http.get"``.
+    attributes : dict[str, Any]
+        Key/value details such as url, bytes, attempt or bibkey.
+    parent : Span | None
+        The enclosing span in the same thread or task.
+    start : float
+        ``time.perf_counter()`` at entry.
+    duration : float
+        Seconds spent inside the span (set on exit).
+    child_time : float
+        Seconds spent in direct child spans.
+    """
+
+    __slots__ = (
+        "_sinks",
+        "_token",
+        "attributes",
+        "child_time",
+        "duration",
+        "name",
+        "parent",
+        "start",
+    )
+
+    def __init__(self, name: str, attributes: dict[str, Any], sinks: tuple[SpanSink, ...]) -> None:
+        """Create a span; it starts when entered."""
+        self.name = name
+        self.attributes = attributes
+        self.parent: Span | None = None
+        self.start = 0.0
+        self.duration = 0.0
+        self.child_time = 0.0
+        self._sinks = sinks
+        self._token: Token[Span | None] | None = None
+
+    def set(self, key: str, value: Any) -> None:
+        """Set an attribute (e.g. a byte count known only at the end)."""
+        self.attributes[key] = value
+
+    @property
+    def self_time(self) -> float:
+        """Seconds spent in this span outside its child spans."""
+        return max(0.0, self.duration - self.child_time)
+
+    def __enter__(self) -> Self:
+        """Start timing and notify sinks."""
+        self.parent = _current.get()
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        for sink in self._sinks:
+            sink.span_started(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Stop timing and notify sinks; exceptions propagate."""
+        self.duration = time.perf_counter() - self.start
+        if self._token is not None:
+            _current.reset(self._token)
+        if exc is not None:
+            self.attributes["error"] = type(exc).__name__
+        if self.parent is not None:
+            self.parent.child_time += self.duration
+        for sink in self._sinks:
+            sink.span_ended(self)
+
+
+class _NoopSpan:
+    """Stand-in returned by span() while no sink is installed."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        """Ignore the attribute."""
+
+    def __enter__(self) -> Self:
+        """Do nothing."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Do nothing."""
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """Return a context manager timing the stage `name`.
+
+    Parameters
+    ----------
+    name : str
+        Stage name.
+    **attributes : Any
+        Initial attributes (url, path, bibkey, ...).
+
+    Returns
+    -------
+    Span | _NoopSpan
+        A Span reported to the installed sinks, or a shared no-op object
+        when no sink is installed.
+    """
+    sinks = _sinks
+    if not sinks:
+        return _NOOP
+    return Span(name, attributes, sinks)
+
+
+@dataclass
+class StageStats:
+    """Aggregated timings for one stage name."""
+
+    count: int = 0
+    total: float = 0.0
+    self_time: float = 0.0
+    max: float = 0.0
+    bytes: int = 0
+
+
+class ProfilerSink:
+    """Sink that aggregates span durations per stage name."""
+
+    def __init__(self) -> None:
+        """Create an empty profile."""
+        self.stages: dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def span_started(self, span: Span) -> None:
+        """Ignore span starts."""
+
+    def span_ended(self, span: Span) -> None:
+        """Add the span's duration to its stage."""
+        with self._lock:
+            st = self.stages.setdefault(span.name, StageStats())
+            st.count += 1
+            st.total += span.duration
+            st.self_time += span.self_time
+            st.max = max(st.max, span.duration)
+            size = span.attributes.get("bytes")
+            if isinstance(size, int):
+                st.bytes += size
+
+    def report(self) -> str:
+        """Return a per-stage breakdown, sorted by self time (slowest first).
+
+        ``total`` includes nested stages (e.g. ``download.file`` includes
+        ``http.get``); ``self`` excludes them, so the self column sums to the
+        instrumented time.
+        """
+        with self._lock:
+            rows = sorted(self.stages.items(), key=lambda kv: -kv[1].self_time)
+        lines = [
+            f"{'stage':<24}{'count':>8}{'total s':>10}{'self s':>10}{'mean ms':>10}{'max ms':>10}{'MiB':>9}"
+        ]
+        for name, st in rows:
+            mean_ms = st.total / st.count * 1000 if st.count else 0.0
+            lines.append(
+                f"{name:<24}{st.count:>8}{st.total:>10.3f}{st.self_time:>10.3f}"
+                f"{mean_ms:>10.2f}{st.max * 1000:>10.2f}{st.bytes / 2**20:>9.2f}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,128 @@
+"""Persistent manifest of downloaded files for incremental fetching.
+
+This module provides:
+- ManifestEntry: Validators and digest recorded for one saved file
+- Manifest: A JSON-backed mapping from saved paths to ManifestEntry
+
+The manifest lives under the output root (``<out>/.paperkit/manifest.json``).
+Its ETag and Last-Modified values let later runs issue conditional GETs and
+skip files the server reports as unchanged (HTTP 304).
+
+File: src/civic_interconnect/paperkit/manifest.py
+"""
+
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+import threading
+from typing import Any
+
+from .config import STATE_DIR_NAME
+from .log import logger
+
+MANIFEST_FILENAME: str = "manifest.json"
+MANIFEST_VERSION: int = 1
+
+
+@dataclass
+class ManifestEntry:
+    """Metadata recorded for one saved file.
+
+    Attributes
+    ----------
+    url : str
+        The URL the file was downloaded from.
+    etag : str | None
+        The ETag response header, if the server sent one.
+    last_modified : str | None
+        The Last-Modified response header, if the server sent one.
+    size : int | None
+        Size of the saved file in bytes.
+    sha256 : str | None
+        SHA256 hexadecimal digest of the saved file.
+    """
+
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    size: int | None = None
+    sha256: str | None = None
+
+
+class Manifest:
+    """Thread-safe mapping from saved file paths to ManifestEntry.
+
+    Paths are stored relative to the output root so the tree can be moved.
+
+    Parameters
+    ----------
+    root : Path
+        The output root that saved paths are relative to.
+    path : Path | None
+        Location of the manifest file (default ``<root>/.paperkit/manifest.json``).
+    """
+
+    def __init__(self, root: Path, path: Path | None = None) -> None:
+        """Create an empty manifest for the given output root."""
+        self.root = root
+        self.path = path or root / STATE_DIR_NAME / MANIFEST_FILENAME
+        self._entries: dict[str, ManifestEntry] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, root: Path, path: Path | None = None) -> "Manifest":
+        """Load the manifest for an output root, or return an empty one.
+
+        A missing or unreadable manifest is treated as empty so that a run
+        simply falls back to full downloads.
+        """
+        m = cls(root, path)
+        if not m.path.exists():
+            return m
+        try:
+            raw: Any = json.loads(m.path.read_text(encoding="utf-8"))
+            for rel, fields in raw.get("entries", {}).items():
+                m._entries[rel] = ManifestEntry(**fields)
+        except (OSError, ValueError, TypeError, AttributeError) as exc:
+            logger.warning("Ignoring unreadable manifest %s: %s", m.path, exc)
+            m._entries.clear()
+        logger.debug("Loaded %d manifest entries from %s", len(m._entries), m.path)
+        return m
+
+    def _key(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def __len__(self) -> int:
+        """Return the number of recorded files."""
+        return len(self._entries)
+
+    def get(self, path: Path) -> ManifestEntry | None:
+        """Return the entry recorded for a saved path, if any."""
+        with self._lock:
+            return self._entries.get(self._key(path))
+
+    def items(self) -> list[tuple[Path, ManifestEntry]]:
+        """Return every recorded (path, entry) pair, sorted by path."""
+        with self._lock:
+            return [(self.root / rel, e) for rel, e in sorted(self._entries.items())]
+
+    def record(self, path: Path, entry: ManifestEntry) -> None:
+        """Record (or replace) the entry for a saved path."""
+        with self._lock:
+            self._entries[self._key(path)] = entry
+
+    def save(self) -> None:
+        """Write the manifest to disk, replacing the previous file atomically."""
+        with self._lock:
+            payload = {
+                "version": MANIFEST_VERSION,
+                "entries": {k: asdict(v) for k, v in sorted(self._entries.items())},
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+        logger.debug("Saved %d manifest entries to %s", len(payload["entries"]), self.path)
@@ -0,0 +1,208 @@
+"""Per-asset transfer metrics for run reports.
+
+This module provides:
+- AssetMetrics: Bytes, timings, retries, status and cache outcome of one fetch
+- measure: Context manager that collects metrics for the current fetch
+- note_request, note_retry, note_bytes, note_cache, note_rows, note_connection:
+  Hooks called by the HTTP clients and downloaders; they do nothing outside a
+  measure() block
+- totals: Aggregate metrics overall and per host
+
+The current AssetMetrics is held in a context variable, so concurrent
+fetches on worker threads or asyncio tasks each record into their own.
+
+File: src/civic_interconnect/paperkit/metrics.py
+"""
+
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+import time
+from typing import Any, Literal
+from urllib.parse import urlparse
+
+CacheState = Literal["miss", "hit", "not_modified", "reused"]
+
+_current: ContextVar["AssetMetrics | None"] = ContextVar("paperkit_asset_metrics", default=None)
+
+
+@dataclass
+class AssetMetrics:
+    """Metrics for fetching one URL.
+
+    Attributes
+    ----------
+    url : str
+        The URL fetched (a direct file, a scraped link or a page).
+    path : str | None
+        Where the file was saved; None for pages.
+    status : int | None
+        HTTP status of the last response.
+    bytes : int
+        Body bytes received over the network.
+    ttfb_seconds : float | None
+        Time from sending the last request to receiving its response headers
+        (with the async client, until its body has been read).
+    duration_seconds : float
+        Wall-clock time for the whole fetch, including waits and retries.
+    requests : int
+        HTTP requests sent.
+    retries : int
+        Attempts that failed and were retried (or resumed).
+    cache : CacheState
+        "miss" (downloaded), "hit" (request cache), "not_modified" (304 from
+        the manifest validators) or "reused" (same URL saved earlier in the run).
+    error : str | None
+        The error message if the fetch failed.
+    rows : int | None
+        Data rows saved, for exports that count them (Socrata assets).
+    connections : int
+        New connections opened; requests beyond this reused a pooled one.
+    """
+
+    url: str
+    path: str | None = None
+    status: int | None = None
+    bytes: int = 0
+    ttfb_seconds: float | None = None
+    duration_seconds: float = 0.0
+    requests: int = 0
+    retries: int = 0
+    cache: CacheState = "miss"
+    error: str | None = None
+    rows: int | None = None
+    connections: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AssetMetrics":
+        """Build metrics from the output of to_dict, ignoring unknown keys."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+@contextmanager
+def measure(url: str, path: Path | None = None) -> Iterator[AssetMetrics]:
+    """Collect metrics for everything fetched inside the block.
+
+    Parameters
+    ----------
+    url : str
+        The URL being fetched.
+    path : Path | None
+        Destination file, if any.
+
+    Yields
+    ------
+    AssetMetrics
+        The metrics being filled in; duration and error are set on exit.
+    """
+    m = AssetMetrics(url=url, path=str(path) if path is not None else None)
+    token = _current.set(m)
+    start = time.perf_counter()
+    try:
+        yield m
+    except Exception as exc:
+        m.error = str(exc)
+        raise
+    finally:
+        m.duration_seconds = time.perf_counter() - start
+        _current.reset(token)
+
+
+def note_request(status: int, ttfb_seconds: float) -> None:
+    """Record a response received for the current fetch."""
+    m = _current.get()
+    if m is not None:
+        m.requests += 1
+        m.status = status
+        m.ttfb_seconds = ttfb_seconds
+
+
+def note_retry() -> None:
+    """Record that the current fetch is retrying a failed attempt."""
+    m = _current.get()
+    if m is not None:
+        m.retries += 1
+
+
+def note_bytes(count: int) -> None:
+    """Record body bytes received for the current fetch."""
+    m = _current.get()
+    if m is not None:
+        m.bytes += count
+
+
+def note_cache(state: CacheState, status: int | None = None) -> None:
+    """Record how the current fetch was satisfied without a full download."""
+    m = _current.get()
+    if m is not None:
+        m.cache = state
+        if status is not None and m.status is None:
+            m.status = status
+
+
+def note_rows(count: int) -> None:
+    """Record the number of data rows saved by the current fetch."""
+    m = _current.get()
+    if m is not None:
+        m.rows = count
+
+
+def note_connection() -> None:
+    """Record that the current fetch opened a new connection."""
+    m = _current.get()
+    if m is not None:
+        m.connections += 1
+
+
+def totals(metrics: Iterable[AssetMetrics]) -> dict[str, Any]:
+    """Aggregate metrics overall and per host.
+
+    Parameters
+    ----------
+    metrics : Iterable[AssetMetrics]
+        Metrics of the fetches to aggregate.
+
+    Returns
+    -------
+    dict[str, Any]
+        ``{"fetches", "bytes", "seconds", "errors", "requests", "connections",
+        "connection_reuse", "cache": {...}, "hosts": {...}}``, with hosts
+        sorted by total seconds, slowest first. ``connection_reuse`` is the
+        share of requests sent over an already open connection (None
+        without requests).
+    """
+    out: dict[str, Any] = {**_empty_totals(), "cache": {}}
+    hosts: dict[str, dict[str, Any]] = {}
+    for m in metrics:
+        host = urlparse(m.url).netloc.lower()
+        h = hosts.setdefault(host, _empty_totals())
+        for agg in (out, h):
+            agg["fetches"] += 1
+            agg["bytes"] += m.bytes
+            agg["seconds"] += m.duration_seconds
+            agg["errors"] += m.error is not None
+            agg["requests"] += m.requests
+            agg["connections"] += m.connections
+        out["cache"][m.cache] = out["cache"].get(m.cache, 0) + 1
+    for agg in (out, *hosts.values()):
+        agg["connection_reuse"] = _reuse_ratio(agg["requests"], agg["connections"])
+    out["hosts"] = dict(sorted(hosts.items(), key=lambda kv: -kv[1]["seconds"]))
+    return out
+
+
+def _empty_totals() -> dict[str, Any]:
+    return {"fetches": 0, "bytes": 0, "seconds": 0.0, "errors": 0, "requests": 0, "connections": 0}
+
+
+def _reuse_ratio(requests: int, connections: int) -> float | None:
+    """Return the share of requests that did not need a new connection."""
+    if requests <= 0:
+        return None
+    return round(max(0, requests - connections) / requests, 3)
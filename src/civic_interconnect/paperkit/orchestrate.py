@@ -2,23 +2,80 @@
 
 This module provides:
 - DownloadRecord and Summary dataclasses for tracking downloads,
-- Functions to guess filenames, run the download process, and handle asset scraping.
+- Functions to guess filenames, run the download process, and handle asset scraping,
+- Concurrent fetching with a global worker cap and per-host limits,
+- run_async, an asyncio variant of run for use with AsyncHttpClient,
+- Per-run URL deduplication and optional content-addressed storage,
+- Selective runs (see Selection) and the last-run summary used by failed-only runs,
+- Per-fetch metrics (AssetMetrics) on each record, optionally streamed via on_asset,
+- An optional PageCache so fresh or unchanged pages are neither fetched nor parsed again,
+- Opt-in crawling below page assets (see CrawlPolicy),
+- Opt-in unpacking of downloaded zip archives, overlapped with later downloads (see Extractor),
+- Paged Socrata exports streamed into one resumable CSV (see fetch_socrata),
+- plan, a dry run that resolves every asset to URLs, paths and sizes (see Plan).
 
 File: src/civic_interconnect/paperkit/orchestrate.py
 """
 
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+import json
 from pathlib import Path
-from typing import Any
+import threading
+from typing import Any, cast
 from urllib.parse import urlparse
 
+from .archive import ExtractedMember, Extractor, ExtractPolicy, is_archive
 from .bib import load_bib_keys
-from .config import DEFAULT_ALLOWED_EXTS, load_meta
-from .download import download_file, ensure_dir, safe_filename
+from .config import (
+    DEFAULT_ALLOWED_EXTS,
+    DEFAULT_OUTPUT_ROOT,  # noqa: F401 - re-exported; defined in config
+    STATE_DIR_NAME,
+    AssetTD,
+    DirectAssetTD,
+    PageAssetTD,
+    SocrataAssetTD,
+    load_meta,
+)
+from .crawl import CrawlPolicy, RobotsRules, crawl, crawl_async
+from .download import (
+    download_file,
+    download_file_async,
+    ensure_dir,
+    safe_filename,
+    sha256_file,
+)
+from .durability import Durability, SyncPolicy
+from .input_cache import InputCache
+from .instrument import span
 from .log import logger
-from .scrape import extract_links
+from .manifest import Manifest
+from .metrics import AssetMetrics, measure, note_bytes, note_cache
+from .page_cache import CachedPage, PageCache
+from .plan import HeadResult, Plan, PlannedAsset, PlannedFile, find_collisions, probe
+from .request_cache import normalize_url
+from .scheduler import (
+    DEFAULT_ASYNC_CONCURRENCY,
+    DEFAULT_EXTRACT_JOBS,
+    DEFAULT_JOBS,
+    DEFAULT_PER_HOST,
+    AsyncHostLimiter,
+    HostLimiter,
+    map_ordered,
+)
+from .selection import Selection, asset_kind
+from .socrata import (
+    DEFAULT_SODA_ORDER,
+    DEFAULT_SODA_PAGE_SIZE,
+    fetch_socrata,
+    fetch_socrata_async,
+    soda_csv_url,
+)
+from .store import BlobStore, link_or_copy
 
-DEFAULT_OUTPUT_ROOT = Path("data/raw")
+LAST_RUN_FILENAME = "last_run.json"
 
 
 @dataclass
@@ -33,11 +90,38 @@ class DownloadRecord:
         List of file paths to successfully downloaded assets.
     errors : list[str]
         List of error messages encountered during download.
+    metrics : list[AssetMetrics]
+        One entry per URL fetched for this bibkey (pages and files), in order.
+    extracted : list[ExtractedMember]
+        Members unpacked from archives of assets with ``extract: true``.
     """
 
     bibkey: str
-    paths: list[Path] = field(default_factory=lambda: [])
-    errors: list[str] = field(default_factory=lambda: [])
+    paths: list[Path] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    metrics: list[AssetMetrics] = field(default_factory=list)
+    extracted: list[ExtractedMember] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "bibkey": self.bibkey,
+            "paths": [str(p) for p in self.paths],
+            "errors": self.errors,
+            "metrics": [m.to_dict() for m in self.metrics],
+            "extracted": [e.to_dict() for e in self.extracted],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "DownloadRecord":
+        """Build a record from the output of to_dict."""
+        return cls(
+            bibkey=str(data["bibkey"]),
+            paths=[Path(p) for p in data.get("paths", [])],
+            errors=[str(e) for e in data.get("errors", [])],
+            metrics=[AssetMetrics.from_dict(m) for m in data.get("metrics", [])],
+            extracted=[ExtractedMember.from_dict(e) for e in data.get("extracted", [])],
+        )
 
 
 @dataclass
@@ -55,6 +139,60 @@ class Summary:
     processed: list[DownloadRecord] = field(default_factory=list)
     skipped: list[str] = field(default_factory=list)
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {"processed": [r.to_dict() for r in self.processed], "skipped": self.skipped}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Summary":
+        """Build a summary from the output of to_dict."""
+        return cls(
+            processed=[DownloadRecord.from_dict(r) for r in data.get("processed", [])],
+            skipped=[str(k) for k in data.get("skipped", [])],
+        )
+
+
+def load_last_summary(out_root: Path) -> Summary | None:
+    """Return the summary saved by the previous run into out_root, if any.
+
+    Parameters
+    ----------
+    out_root : Path
+        Output root of the previous run.
+
+    Returns
+    -------
+    Summary | None
+        The saved summary, or None if there is none or it cannot be read.
+    """
+    path = out_root / STATE_DIR_NAME / LAST_RUN_FILENAME
+    try:
+        return Summary.from_dict(json.loads(path.read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+        logger.warning("Ignoring unreadable run summary %s: %s", path, exc)
+        return None
+
+
+def _save_last_summary(out_root: Path, summary: Summary, *, partial: bool) -> None:
+    """Persist the run summary; a partial (filtered) run updates only its own records."""
+    if partial:
+        previous = load_last_summary(out_root)
+        if previous is not None:
+            ran = {r.bibkey for r in summary.processed}
+            kept = [r for r in previous.processed if r.bibkey not in ran]
+            records = sorted(kept + summary.processed, key=lambda r: r.bibkey)
+            summary = Summary(processed=records, skipped=summary.skipped)
+    path = out_root / STATE_DIR_NAME / LAST_RUN_FILENAME
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(summary.to_dict(), indent=2), encoding="utf-8")
+        tmp.replace(path)
+    except OSError as exc:
+        logger.warning("Could not save run summary to %s: %s", path, exc)
+
 
 def guess_filename_from_url(url: str) -> str:
     """Guess a safe filename from a URL.
@@ -73,9 +211,380 @@ def guess_filename_from_url(url: str) -> str:
     return safe_filename(base)
 
 
-def run(bib_path: Path, meta_path: Path, out_root: Path, client: Any) -> Summary:
+@dataclass
+class _AssetTask:
+    """A single asset scheduled for fetching, tagged with its bibkey."""
+
+    bibkey: str
+    asset: AssetTD
+    out_dir: Path
+
+
+@dataclass
+class _AssetResult:
+    """Paths saved, errors raised and metrics collected while fetching one asset."""
+
+    paths: list[Path] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    metrics: list[AssetMetrics] = field(default_factory=list)
+    extracted: list[ExtractedMember] = field(default_factory=list)
+    # archive -> extraction still running on ctx.extractor
+    pending: list[tuple[Path, "Future[list[ExtractedMember]]"]] = field(default_factory=list)
+
+
+@dataclass
+class _RunContext:
+    """State shared by all assets of one run."""
+
+    client: Any
+    limiter: Any
+    manifest: Manifest | None = None
+    store: BlobStore | None = None
+    # normalized URL -> future resolving to the first path it was saved to in this run
+    once: dict[str, Any] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    on_asset: Callable[[str, AssetMetrics], None] | None = None
+    report_lock: threading.Lock = field(default_factory=threading.Lock)
+    sync: SyncPolicy | None = None
+    pages: PageCache = field(default_factory=PageCache)
+    robots: RobotsRules = field(default_factory=RobotsRules)
+    extractor: Extractor = field(default_factory=Extractor)
+
+
+@contextmanager
+def _measured(
+    ctx: _RunContext, bibkey: str, res: _AssetResult, url: str, path: Path | None = None
+) -> Iterator[AssetMetrics]:
+    """Measure one fetch into res.metrics and pass the result to ctx.on_asset."""
+    m: AssetMetrics | None = None
+    try:
+        with span("asset", bibkey=bibkey, url=url), measure(url, path) as m:
+            res.metrics.append(m)
+            yield m
+    finally:
+        if ctx.on_asset is not None and m is not None:
+            with ctx.report_lock:
+                ctx.on_asset(bibkey, m)
+
+
+def _finish(ctx: _RunContext) -> None:
+    """Wait for extractions, save the manifest and, in batch mode, sync everything saved."""
+    ctx.extractor.close()
+    if ctx.manifest is not None:
+        ctx.manifest.save()
+        if ctx.sync is not None:
+            ctx.sync.saved(ctx.manifest.path)
+    if ctx.sync is not None:
+        ctx.sync.flush()
+
+
+def _reuse(ctx: _RunContext, src: Path, dest: Path, checksum: str | None) -> None:
+    """Materialize a file already fetched in this run at a second path."""
+    if src == dest or (dest.exists() and dest.samefile(src)):
+        return
+    entry = ctx.manifest.get(src) if ctx.manifest is not None else None
+    digest = entry.sha256 if entry and entry.sha256 else sha256_file(src)
+    if checksum and digest.lower() != checksum.lower():
+        raise ValueError(f"checksum mismatch for {dest}")
+    prior = ctx.manifest.get(dest) if ctx.manifest is not None else None
+    if not (
+        prior
+        and prior.sha256 == digest
+        and dest.exists()
+        and dest.stat().st_size == src.stat().st_size
+    ):
+        method = link_or_copy(src, dest, allow_link=ctx.store is not None)
+        if ctx.sync is not None:
+            ctx.sync.saved(dest)
+        logger.info("Reused %s for %s (%s)", src, dest, method)
+    if ctx.manifest is not None and entry is not None:
+        ctx.manifest.record(dest, entry)
+
+
+def _queue_extract(
+    ctx: _RunContext, res: _AssetResult, policy: ExtractPolicy | None, p: Path, m: AssetMetrics
+) -> None:
+    """Hand a saved archive to the extractor, so unpacking overlaps with later downloads."""
+    if policy is None or not is_archive(p):
+        return
+    unchanged = m.cache == "not_modified"
+    res.pending.append((p, ctx.extractor.submit(p, policy, unchanged=unchanged)))
+
+
+def _collect_extractions(results: list[_AssetResult]) -> None:
+    """Wait for queued extractions and move their members or errors into the results."""
+    for res in results:
+        for archive, fut in res.pending:
+            try:
+                res.extracted.extend(fut.result())
+            except Exception as exc:  # noqa: BLE001 - reported per archive, like fetch errors
+                msg = f"extracting {archive}: {exc}"
+                res.errors.append(msg)
+                logger.error(msg)
+        res.pending.clear()
+
+
+def _save(ctx: _RunContext, url: str, p: Path, checksum: str | None = None) -> None:
+    """Download url to p, fetching each normalized URL at most once per run."""
+    key = normalize_url(url)
+    with ctx.lock:
+        fut = ctx.once.get(key)
+        owner = fut is None
+        if fut is None:
+            fut = ctx.once[key] = Future()
+    if owner:
+        try:
+            with ctx.limiter.slot(url):
+                download_file(ctx.client, url, p, checksum, ctx.manifest, ctx.store, ctx.sync)
+        except Exception as exc:
+            fut.set_exception(exc)
+            raise
+        fut.set_result(p)
+        return
+    src = fut.result()
+    note_cache("reused")
+    _reuse(ctx, src, p, checksum)
+
+
+def _get_page(ctx: _RunContext, url: str) -> CachedPage:
+    """Return a page to scrape, from the page cache when fresh or unchanged."""
+    page, fresh = ctx.pages.lookup(url)
+    if page is not None and fresh:
+        note_cache("hit")
+        return page
+    with ctx.limiter.slot(url):
+        resp = ctx.client.get(url, **page.validators()) if page else ctx.client.get(url)
+    if page is not None and resp.status_code == 304:
+        note_cache("not_modified")
+        ctx.pages.renew(page)
+        return page
+    note_bytes(len(resp.content))
+    return ctx.pages.store(url, resp)
+
+
+def _fetch_robots(ctx: _RunContext, url: str) -> tuple[str | None, int | None]:
+    """Fetch a robots.txt for RobotsRules; failures are returned as (None, status).
+
+    A missing robots.txt (404) is common and means "allow all", so fatal
+    errors are not logged as errors.
+    """
+    try:
+        with ctx.limiter.slot(url):
+            resp = ctx.client.get(url, quiet=True)
+    except Exception as exc:  # noqa: BLE001 - any failure is handled by RobotsRules.add
+        return None, getattr(getattr(exc, "response", None), "status_code", None)
+    return resp.text, resp.status_code
+
+
+def _page_links(ctx: _RunContext, key: str, res: _AssetResult, a: PageAssetTD) -> list[str]:
+    """Fetch a page asset, crawling below it if configured, and return its data links."""
+    start = cast("str", a.get("page_url"))
+    allow = a.get("allow_ext") or DEFAULT_ALLOWED_EXTS
+    rx = a.get("href_regex")
+    policy = CrawlPolicy.from_asset(a)
+
+    def visit(url: str) -> tuple[list[str], list[str]]:
+        with _measured(ctx, key, res, url):
+            page = _get_page(ctx, url)
+        base = (a.get("base_url") or start) if url == start else url
+        data = ctx.pages.links(page, base, allow, rx)
+        return data, ctx.pages.links(page, url, [], None) if policy.max_depth > 0 else []
+
+    if policy.max_depth <= 0:
+        return visit(start)[0]
+    return crawl(
+        start,
+        visit,
+        policy,
+        robots=ctx.robots,
+        fetch_robots=lambda u: _fetch_robots(ctx, u),
+    )
+
+
+def _direct_target(a: DirectAssetTD, out_dir: Path) -> Path:
+    """Return where a direct file asset is saved."""
+    url = cast("str", a.get("url"))
+    return out_dir / (a.get("filename") or guess_filename_from_url(url))
+
+
+def _soda_target(a: SocrataAssetTD, out_dir: Path) -> Path:
+    """Return where a Socrata asset is saved."""
+    url = cast("str", a.get("soda_url"))
+    return out_dir / (a.get("filename") or guess_filename_from_url(soda_csv_url(url)))
+
+
+def _soda_options(ctx: _RunContext, a: SocrataAssetTD) -> dict[str, Any]:
+    """Return the fetch_socrata keyword arguments for an asset."""
+    return {
+        "page_size": int(a.get("page_size", DEFAULT_SODA_PAGE_SIZE)),
+        "order": a.get("order", DEFAULT_SODA_ORDER),
+        "where": a.get("where"),
+        "manifest": ctx.manifest,
+        "sync": ctx.sync,
+    }
+
+
+def _save_socrata(
+    ctx: _RunContext, key: str, res: _AssetResult, a: SocrataAssetTD, out_dir: Path
+) -> None:
+    """Export a Socrata dataset into one CSV, one host slot for all its pages."""
+    url = cast("str", a.get("soda_url"))
+    p = _soda_target(a, out_dir)
+    with _measured(ctx, key, res, url, p), ctx.limiter.slot(url):
+        fetch_socrata(ctx.client, url, p, **_soda_options(ctx, a))
+    res.paths.append(p)
+
+
+def _fetch_asset(ctx: _RunContext, task: _AssetTask) -> _AssetResult:
+    """Fetch one asset (direct file or scraped page) and report the outcome."""
+    key, a, out_dir = task.bibkey, task.asset, task.out_dir
+    res = _AssetResult()
+    try:
+        # direct file
+        if "url" in a:
+            ensure_dir(out_dir)
+            p = _direct_target(a, out_dir)
+            with _measured(ctx, key, res, a["url"], p) as m:
+                _save(ctx, a["url"], p, a.get("checksum"))
+            res.paths.append(p)
+            _queue_extract(ctx, res, ExtractPolicy.from_asset(a), p, m)
+        # page scrape
+        elif "page_url" in a:
+            logger.info("[%s] Scraping page %s", key, a["page_url"])
+            limit = a.get("limit")
+            links = _page_links(ctx, key, res, a)
+            if limit is not None:
+                links = links[: int(limit)]
+            ensure_dir(out_dir)
+            extract = ExtractPolicy.from_asset(a)
+            for u in links:
+                p = out_dir / guess_filename_from_url(u)
+                with _measured(ctx, key, res, u, p) as m:
+                    _save(ctx, u, p)
+                res.paths.append(p)
+                _queue_extract(ctx, res, extract, p, m)
+        elif "soda_url" in a:
+            _save_socrata(ctx, key, res, a, out_dir)
+        else:
+            msg = "unknown asset type"
+            res.errors.append(msg)
+            logger.warning("[%s] %s", key, msg)
+    except Exception as exc:
+        res.errors.append(str(exc))
+        logger.error("[%s] %s", key, exc)
+    return res
+
+
+def _previous_failures(out_root: Path) -> set[str]:
+    """Return the bibkeys whose record had errors in the last run into out_root."""
+    previous = load_last_summary(out_root)
+    if previous is None:
+        logger.warning("No previous run summary under %s; nothing to retry.", out_root)
+        return set()
+    failed = {r.bibkey for r in previous.processed if r.errors}
+    logger.info("Retrying %d bibkeys that failed in the previous run", len(failed))
+    return failed
+
+
+def _plan(
+    bib_path: Path,
+    meta_path: Path,
+    out_root: Path,
+    cache_dir: Path | None = None,
+    select: Selection | None = None,
+) -> tuple[list[str], list[str], list[_AssetTask]]:
+    """Load inputs and list the assets to fetch, in bibkey then asset order.
+
+    Returns the bibkeys to process, the bibkeys left out by the selection,
+    and the asset tasks.
+    """
+    if cache_dir is not None:
+        inputs = InputCache(cache_dir)
+        keys = set(inputs.load_bib_keys(bib_path))
+        meta = inputs.load_meta(meta_path)
+    else:
+        keys = set(load_bib_keys(bib_path))
+        meta = load_meta(meta_path)
+    common = sorted(keys.intersection(meta.keys()))
+    if not common:
+        logger.warning("No overlapping keys between .bib and meta; nothing to do.")
+
+    select = select or Selection()
+    failed = _previous_failures(out_root) if select.failed_only else None
+    planned: list[str] = []
+    skipped: list[str] = []
+    tasks: list[_AssetTask] = []
+    for key in common:
+        if not select.keeps_key(key) or (failed is not None and key not in failed):
+            skipped.append(key)
+            continue
+        entry_meta = meta[key] or {}
+        subdir = entry_meta.get("out_dir")
+        out_dir = out_root / key / (subdir or ".")
+        assets = entry_meta.get("assets", [])
+        kept = [a for a in assets if select.keeps_asset(a)]
+        if assets and not kept:
+            skipped.append(key)
+            continue
+        planned.append(key)
+        tasks.extend(_AssetTask(key, a, out_dir) for a in kept)
+    if skipped:
+        logger.info("Selection left out %d of %d bibkeys", len(skipped), len(common))
+    return planned, skipped, tasks
+
+
+def _summarize(
+    common: list[str], skipped: list[str], tasks: list[_AssetTask], results: list[_AssetResult]
+) -> Summary:
+    """Fold per-asset results into one DownloadRecord per bibkey."""
+    records = {key: DownloadRecord(bibkey=key) for key in common}
+    for task, res in zip(tasks, results, strict=True):
+        rec = records[task.bibkey]
+        rec.paths.extend(res.paths)
+        rec.errors.extend(res.errors)
+        rec.metrics.extend(res.metrics)
+        rec.extracted.extend(res.extracted)
+    return Summary(processed=[records[key] for key in common], skipped=skipped)
+
+
+def run(
+    bib_path: Path,
+    meta_path: Path,
+    out_root: Path,
+    client: Any,
+    *,
+    jobs: int = DEFAULT_JOBS,
+    per_host: int = DEFAULT_PER_HOST,
+    incremental: bool = True,
+    dedupe: bool = False,
+    cache_dir: Path | None = None,
+    select: Selection | None = None,
+    on_asset: Callable[[str, AssetMetrics], None] | None = None,
+    durability: Durability = "none",
+    page_cache: PageCache | None = None,
+    extract_jobs: int = DEFAULT_EXTRACT_JOBS,
+) -> Summary:
     """Orchestrate the download of assets for bibliography entries.
 
+    Assets are fetched by up to `jobs` workers at once, with at most
+    `per_host` concurrent requests to any single host. The resulting
+    Summary lists records in sorted bibkey order and paths in asset order,
+    independent of which downloads finish first.
+
+    When `incremental` is True, a manifest under ``<out_root>/.paperkit/``
+    records ETag/Last-Modified, size and sha256 for every saved file, and
+    later runs revalidate those files with conditional GETs instead of
+    downloading them again.
+
+    A URL that appears more than once in a run is fetched only once; other
+    destinations receive a copy, or a hardlink to the shared blob when
+    `dedupe` is True. URLs are compared after normalize_url, so host case
+    and fragments do not make them differ.
+
+    The Summary is also saved to ``<out_root>/.paperkit/last_run.json``
+    (merged into the previous one for filtered runs), which is what
+    ``Selection(failed_only=True)`` reads.
+
     Parameters
     ----------
     bib_path : Path
@@ -86,59 +595,405 @@ def run(bib_path: Path, meta_path: Path, out_root: Path, client: Any) -> Summary
         Root directory for output files.
     client : any
         HTTP client for downloading files.
+    jobs : int
+        Maximum number of assets fetched concurrently (1 = sequential).
+    per_host : int
+        Maximum number of concurrent requests per host.
+    incremental : bool
+        Use and update the download manifest (False forces full downloads).
+    dedupe : bool
+        Store files once by content under ``<out_root>/.paperkit/blobs`` and
+        hardlink them into place.
+    cache_dir : Path | None
+        Directory for the parsed-input cache; when given, unchanged bib and
+        meta files are loaded from it instead of being parsed again.
+    select : Selection | None
+        Restrict the run to some bibkeys, asset types or hosts, or to the
+        bibkeys that failed last time. Left-out bibkeys are listed in
+        ``Summary.skipped``.
+    on_asset : Callable[[str, AssetMetrics], None] | None
+        Called with the bibkey and metrics as soon as each URL has been
+        fetched (e.g. to stream NDJSON); calls are serialized.
+    durability : {"none", "file", "batch"}
+        When saved files are fsynced: never, each file as it is saved, or
+        all files and their directories once at the end of the run.
+    page_cache : PageCache | None
+        Cache of scraped pages and extracted links; fresh pages are not
+        fetched again and unchanged pages are not parsed again.
+    extract_jobs : int
+        Archives of ``extract: true`` assets unpacked at once, alongside
+        the downloads still running.
 
     Returns
     -------
     Summary
         Summary of processed entries and any errors encountered.
     """
-    keys = set(load_bib_keys(bib_path))
-    meta = load_meta(meta_path)
-    common = sorted(keys.intersection(meta.keys()))
-    summary = Summary()
+    common, skipped, tasks = _plan(bib_path, meta_path, out_root, cache_dir, select)
+    if not common:
+        return Summary(skipped=skipped)
+
+    manifest = Manifest.load(out_root) if incremental else None
+    sync = SyncPolicy(durability) if durability != "none" else None
+    ctx = _RunContext(
+        client=client,
+        limiter=HostLimiter(per_host),
+        manifest=manifest,
+        store=BlobStore.for_output(out_root) if dedupe else None,
+        on_asset=on_asset,
+        sync=sync,
+        pages=page_cache or PageCache(),
+        robots=RobotsRules(getattr(client, "user_agent", None) or "*"),
+        extractor=Extractor(extract_jobs, manifest, sync),
+    )
+    try:
+        results = map_ordered(lambda t: _fetch_asset(ctx, t), tasks, jobs)
+        _collect_extractions(results)
+    finally:
+        _finish(ctx)
+    summary = _summarize(common, skipped, tasks, results)
+    _save_last_summary(out_root, summary, partial=select is not None and not select.is_empty())
+    return summary
+
+
+async def _save_async(ctx: _RunContext, url: str, p: Path, checksum: str | None = None) -> None:
+    """Asyncio counterpart of _save."""
+    import asyncio
+
+    key = normalize_url(url)
+    fut = ctx.once.get(key)
+    if fut is None:
+        fut = ctx.once[key] = asyncio.get_running_loop().create_future()
+        try:
+            async with ctx.limiter.slot(url):
+                await download_file_async(
+                    ctx.client, url, p, checksum, ctx.manifest, ctx.store, ctx.sync
+                )
+        except Exception as exc:
+            fut.set_exception(exc)
+            fut.exception()  # mark retrieved; waiters re-raise it themselves
+            raise
+        fut.set_result(p)
+        return
+    src = await asyncio.shield(fut)
+    note_cache("reused")
+    await asyncio.to_thread(_reuse, ctx, src, p, checksum)
+
+
+async def _get_page_async(ctx: _RunContext, url: str) -> CachedPage:
+    """Asyncio counterpart of _get_page."""
+    import asyncio
+
+    page, fresh = await asyncio.to_thread(ctx.pages.lookup, url)
+    if page is not None and fresh:
+        note_cache("hit")
+        return page
+    async with ctx.limiter.slot(url):
+        resp = await (ctx.client.get(url, **page.validators()) if page else ctx.client.get(url))
+    if page is not None and resp.status_code == 304:
+        note_cache("not_modified")
+        await asyncio.to_thread(ctx.pages.renew, page)
+        return page
+    note_bytes(len(resp.content))
+    return await asyncio.to_thread(ctx.pages.store, url, resp)
+
+
+async def _fetch_robots_async(ctx: _RunContext, url: str) -> tuple[str | None, int | None]:
+    """Asyncio counterpart of _fetch_robots."""
+    try:
+        async with ctx.limiter.slot(url):
+            resp = await ctx.client.get(url, quiet=True)
+    except Exception as exc:  # noqa: BLE001 - any failure is handled by RobotsRules.add
+        return None, getattr(getattr(exc, "response", None), "status_code", None)
+    return resp.text, resp.status_code
+
 
+async def _page_links_async(
+    ctx: _RunContext, key: str, res: _AssetResult, a: PageAssetTD
+) -> list[str]:
+    """Asyncio counterpart of _page_links."""
+    import asyncio
+
+    start = cast("str", a.get("page_url"))
+    allow = a.get("allow_ext") or DEFAULT_ALLOWED_EXTS
+    rx = a.get("href_regex")
+    policy = CrawlPolicy.from_asset(a)
+
+    async def visit(url: str) -> tuple[list[str], list[str]]:
+        with _measured(ctx, key, res, url):
+            page = await _get_page_async(ctx, url)
+        base = (a.get("base_url") or start) if url == start else url
+        data = await asyncio.to_thread(ctx.pages.links, page, base, allow, rx)
+        if policy.max_depth <= 0:
+            return data, []
+        return data, await asyncio.to_thread(ctx.pages.links, page, url, [], None)
+
+    if policy.max_depth <= 0:
+        return (await visit(start))[0]
+    return await crawl_async(
+        start,
+        visit,
+        policy,
+        robots=ctx.robots,
+        fetch_robots=lambda u: _fetch_robots_async(ctx, u),
+    )
+
+
+async def _save_socrata_async(
+    ctx: _RunContext, key: str, res: _AssetResult, a: SocrataAssetTD, out_dir: Path
+) -> None:
+    """Asyncio counterpart of _save_socrata."""
+    url = cast("str", a.get("soda_url"))
+    p = _soda_target(a, out_dir)
+    with _measured(ctx, key, res, url, p):
+        async with ctx.limiter.slot(url):
+            await fetch_socrata_async(ctx.client, url, p, **_soda_options(ctx, a))
+    res.paths.append(p)
+
+
+async def _fetch_asset_async(ctx: _RunContext, task: _AssetTask) -> _AssetResult:
+    """Asyncio counterpart of _fetch_asset."""
+    key, a, out_dir = task.bibkey, task.asset, task.out_dir
+    res = _AssetResult()
+    try:
+        if "url" in a:
+            ensure_dir(out_dir)
+            p = _direct_target(a, out_dir)
+            with _measured(ctx, key, res, a["url"], p) as m:
+                await _save_async(ctx, a["url"], p, a.get("checksum"))
+            res.paths.append(p)
+            _queue_extract(ctx, res, ExtractPolicy.from_asset(a), p, m)
+        elif "page_url" in a:
+            logger.info("[%s] Scraping page %s", key, a["page_url"])
+            limit = a.get("limit")
+            links = await _page_links_async(ctx, key, res, a)
+            if limit is not None:
+                links = links[: int(limit)]
+            ensure_dir(out_dir)
+            extract = ExtractPolicy.from_asset(a)
+            for u in links:
+                p = out_dir / guess_filename_from_url(u)
+                with _measured(ctx, key, res, u, p) as m:
+                    await _save_async(ctx, u, p)
+                res.paths.append(p)
+                _queue_extract(ctx, res, extract, p, m)
+        elif "soda_url" in a:
+            await _save_socrata_async(ctx, key, res, a, out_dir)
+        else:
+            msg = "unknown asset type"
+            res.errors.append(msg)
+            logger.warning("[%s] %s", key, msg)
+    except Exception as exc:
+        res.errors.append(str(exc))
+        logger.error("[%s] %s", key, exc)
+    return res
+
+
+async def run_async(
+    bib_path: Path,
+    meta_path: Path,
+    out_root: Path,
+    client: Any,
+    *,
+    concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+    per_host: int = DEFAULT_PER_HOST,
+    incremental: bool = True,
+    dedupe: bool = False,
+    cache_dir: Path | None = None,
+    select: Selection | None = None,
+    on_asset: Callable[[str, AssetMetrics], None] | None = None,
+    durability: Durability = "none",
+    page_cache: PageCache | None = None,
+    extract_jobs: int = DEFAULT_EXTRACT_JOBS,
+) -> Summary:
+    """Orchestrate asset downloads on an asyncio event loop.
+
+    Behaves like run(), but every asset is a coroutine awaiting an
+    AsyncHttpClient, so many small assets can be in flight from a single
+    thread. The Summary ordering is the same as for run().
+
+    Parameters
+    ----------
+    bib_path : Path
+        Path to the bibliography file.
+    meta_path : Path
+        Path to the metadata file.
+    out_root : Path
+        Root directory for output files.
+    client : any
+        Async HTTP client whose .get is awaitable (e.g. AsyncHttpClient).
+    concurrency : int
+        Maximum number of assets in flight at once.
+    per_host : int
+        Maximum number of concurrent requests per host.
+    incremental : bool
+        Use and update the download manifest (False forces full downloads).
+    dedupe : bool
+        Store files once by content under ``<out_root>/.paperkit/blobs`` and
+        hardlink them into place.
+    cache_dir : Path | None
+        Directory for the parsed-input cache; when given, unchanged bib and
+        meta files are loaded from it instead of being parsed again.
+    select : Selection | None
+        Restrict the run to some bibkeys, asset types or hosts, or to the
+        bibkeys that failed last time. Left-out bibkeys are listed in
+        ``Summary.skipped``.
+    on_asset : Callable[[str, AssetMetrics], None] | None
+        Called with the bibkey and metrics as soon as each URL has been
+        fetched (e.g. to stream NDJSON); calls are serialized.
+    durability : {"none", "file", "batch"}
+        When saved files are fsynced: never, each file as it is saved, or
+        all files and their directories once at the end of the run.
+    page_cache : PageCache | None
+        Cache of scraped pages and extracted links; fresh pages are not
+        fetched again and unchanged pages are not parsed again.
+    extract_jobs : int
+        Archives of ``extract: true`` assets unpacked at once, alongside
+        the downloads still running.
+
+    Returns
+    -------
+    Summary
+        Summary of processed entries and any errors encountered.
+    """
+    import asyncio
+
+    common, skipped, tasks = _plan(bib_path, meta_path, out_root, cache_dir, select)
     if not common:
-        logger.warning("No overlapping keys between .bib and meta; nothing to do.")
-        return summary
+        return Summary(skipped=skipped)
 
-    for key in common:
-        rec = DownloadRecord(bibkey=key)
-        entry_meta = meta[key] or {}
-        subdir = entry_meta.get("out_dir")
-        assets = entry_meta.get("assets", [])
+    manifest = Manifest.load(out_root) if incremental else None
+    sync = SyncPolicy(durability) if durability != "none" else None
+    ctx = _RunContext(
+        client=client,
+        limiter=AsyncHostLimiter(per_host),
+        manifest=manifest,
+        store=BlobStore.for_output(out_root) if dedupe else None,
+        on_asset=on_asset,
+        sync=sync,
+        pages=page_cache or PageCache(),
+        robots=RobotsRules(getattr(client, "user_agent", None) or "*"),
+        extractor=Extractor(extract_jobs, manifest, sync),
+    )
+    gate = asyncio.Semaphore(max(1, concurrency))
 
-        for a in assets:
-            try:
-                # direct file
-                if "url" in a:
-                    out_dir = out_root / key / (subdir or ".")
-                    ensure_dir(out_dir)
-                    fname = a.get("filename") or guess_filename_from_url(a["url"])
-                    p = out_dir / fname
-                    download_file(client, a["url"], p, a.get("checksum"))
-                    rec.paths.append(p)
-                # page scrape
-                elif "page_url" in a:
-                    logger.info("[%s] Scraping page %s", key, a["page_url"])
-                    allow = a.get("allow_ext") or DEFAULT_ALLOWED_EXTS
-                    rx = a.get("href_regex")
-                    limit = a.get("limit")
-                    resp = client.get(a["page_url"])
-                    links = extract_links(resp.text, a.get("base_url") or a["page_url"], allow, rx)
-                    if limit is not None:
-                        links = links[: int(limit)]
-                    out_dir = out_root / key / (subdir or ".")
-                    ensure_dir(out_dir)
-                    for u in links:
-                        p = out_dir / guess_filename_from_url(u)
-                        download_file(client, u, p)
-                        rec.paths.append(p)
-                else:
-                    msg = "unknown asset type"
-                    rec.errors.append(msg)
-                    logger.warning("[%s] %s", key, msg)
-            except Exception as exc:
-                rec.errors.append(str(exc))
-                logger.error("[%s] %s", key, exc)
-        summary.processed.append(rec)
+    async def one(task: _AssetTask) -> _AssetResult:
+        async with gate:
+            return await _fetch_asset_async(ctx, task)
+
+    try:
+        results = list(await asyncio.gather(*(one(t) for t in tasks)))
+        await asyncio.to_thread(_collect_extractions, results)
+    finally:
+        _finish(ctx)
+    summary = _summarize(common, skipped, tasks, results)
+    _save_last_summary(out_root, summary, partial=select is not None and not select.is_empty())
     return summary
+
+
+def _resolve_asset(ctx: _RunContext, task: _AssetTask) -> PlannedAsset:
+    """List the files one asset would download, scraping page assets but saving nothing."""
+    key, a, out_dir = task.bibkey, task.asset, task.out_dir
+    source = a.get("url") or a.get("page_url") or a.get("soda_url") or ""
+    planned = PlannedAsset(key, asset_kind(a) or "unknown", source)
+    try:
+        if "url" in a:
+            planned.files.append(PlannedFile(a["url"], _direct_target(a, out_dir)))
+        elif "page_url" in a:
+            links = _page_links(ctx, key, _AssetResult(), a)
+            limit = a.get("limit")
+            if limit is not None:
+                links = links[: int(limit)]
+            planned.files.extend(
+                PlannedFile(u, out_dir / guess_filename_from_url(u)) for u in links
+            )
+        elif "soda_url" in a:
+            planned.files.append(PlannedFile(soda_csv_url(a["soda_url"]), _soda_target(a, out_dir)))
+        else:
+            planned.errors.append("unknown asset type")
+    except Exception as exc:  # noqa: BLE001 - reported per asset, like fetch errors
+        planned.errors.append(str(exc))
+        logger.error("[%s] %s", key, exc)
+    return planned
+
+
+def _probe_files(ctx: _RunContext, assets: list[PlannedAsset], jobs: int) -> None:
+    """HEAD every distinct direct or scraped URL and note which files are unchanged."""
+    urls = list(dict.fromkeys(f.url for a in assets if a.kind != "socrata" for f in a.files))
+
+    def one(url: str) -> HeadResult:
+        with ctx.limiter.slot(url):
+            return probe(ctx.client, url)
+
+    heads = dict(zip(urls, map_ordered(one, urls, jobs), strict=True))
+    for f in (f for a in assets for f in a.files):
+        f.head = heads.get(f.url)
+        if f.head is not None and ctx.manifest is not None:
+            f.unchanged = f.head.matches(ctx.manifest.get(f.path)) and f.path.exists()
+
+
+def plan(
+    bib_path: Path,
+    meta_path: Path,
+    out_root: Path,
+    client: Any,
+    *,
+    jobs: int = DEFAULT_JOBS,
+    per_host: int = DEFAULT_PER_HOST,
+    cache_dir: Path | None = None,
+    select: Selection | None = None,
+    page_cache: PageCache | None = None,
+    head: bool = True,
+) -> Plan:
+    """Resolve what run would download, without downloading or writing data files.
+
+    Page assets are fetched and scraped (and crawled, if configured) so their
+    links are known; every distinct data URL is then sent a HEAD request,
+    `jobs` at a time and at most `per_host` per host, for its size and
+    validators. Files whose validators match the manifest are marked
+    unchanged. Nothing is written under `out_root`, although a page cache
+    with a directory is updated as usual.
+
+    Parameters
+    ----------
+    bib_path : Path
+        Path to the bibliography file.
+    meta_path : Path
+        Path to the metadata file.
+    out_root : Path
+        Root directory files would be saved under.
+    client : any
+        HTTP client with .get and .head (e.g. HttpClient).
+    jobs : int
+        Maximum number of pages or HEAD requests in flight at once.
+    per_host : int
+        Maximum number of concurrent requests per host.
+    cache_dir : Path | None
+        Directory for the parsed-input cache, as for run.
+    select : Selection | None
+        Restrict the plan to some bibkeys, asset types or hosts, as for run.
+    page_cache : PageCache | None
+        Cache of scraped pages and extracted links.
+    head : bool
+        Send HEAD requests (False plans from the configuration and scraped
+        pages alone, with sizes unknown).
+
+    Returns
+    -------
+    Plan
+        Planned assets in bibkey then asset order, with totals and any
+        output paths that different URLs would collide on.
+    """
+    _, skipped, tasks = _plan(bib_path, meta_path, out_root, cache_dir, select)
+    ctx = _RunContext(
+        client=client,
+        limiter=HostLimiter(per_host),
+        manifest=Manifest.load(out_root),
+        pages=page_cache or PageCache(),
+        robots=RobotsRules(getattr(client, "user_agent", None) or "*"),
+    )
+    assets = map_ordered(lambda t: _resolve_asset(ctx, t), tasks, jobs)
+    if head:
+        _probe_files(ctx, assets, jobs)
+    files = (f for a in assets for f in a.files)
+    return Plan(assets=assets, skipped=skipped, collisions=find_collisions(files))
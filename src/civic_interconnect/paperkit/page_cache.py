@@ -0,0 +1,232 @@
+"""Disk-backed cache of scraped pages and the links extracted from them.
+
+This module provides:
+- CachedPage: A fetched page's validators, content hash and memoized links
+- PageCache: Stores pages by URL with a freshness TTL and memoizes
+  extract_links results by page content and filter settings
+
+A page fetched less than ``ttl_seconds`` ago is used without any request.
+An older page is revalidated with a conditional GET (If-None-Match /
+If-Modified-Since); a 304 renews it. Link lists are keyed by the SHA256 of
+the page body plus ``allow_ext``, ``href_regex`` and the base URL, so an
+unchanged page is not parsed again, and a changed page never reuses stale
+links.
+
+Without a directory the cache keeps nothing between runs and simply holds
+the page text for the extraction step.
+
+File: src/civic_interconnect/paperkit/page_cache.py
+"""
+
+from dataclasses import asdict, dataclass, field
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+from .log import logger
+from .request_cache import normalize_url
+
+DEFAULT_PAGE_TTL_SECONDS: float = 24 * 60 * 60
+
+
+@dataclass
+class CachedPage:
+    """A scraped page as recorded in the cache.
+
+    Attributes
+    ----------
+    url : str
+        The page URL.
+    sha256 : str
+        SHA256 of the response body.
+    fetched_at : float
+        When the page was last fetched or revalidated (seconds since the epoch).
+    etag : str | None
+        The ETag response header, if any.
+    last_modified : str | None
+        The Last-Modified response header, if any.
+    links : dict[str, list[str]]
+        Extracted links by memo key (see PageCache.links).
+    text : str | None
+        The decoded page, once loaded; not stored in the metadata file.
+    """
+
+    url: str
+    sha256: str
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    links: dict[str, list[str]] = field(default_factory=dict)
+    text: str | None = field(default=None, repr=False, compare=False)
+
+    def validators(self) -> dict[str, str]:
+        """Return the etag / last_modified keyword arguments for a conditional GET."""
+        out: dict[str, str] = {}
+        if self.etag:
+            out["etag"] = self.etag
+        if self.last_modified:
+            out["last_modified"] = self.last_modified
+        return out
+
+
+class PageCache:
+    """Cache of scraped pages and their extracted links.
+
+    Parameters
+    ----------
+    directory : Path | None
+        Directory holding the cached pages; None keeps nothing across runs.
+    ttl_seconds : float
+        How long a fetched page is used without revalidation.
+    """
+
+    def __init__(
+        self, directory: Path | None = None, ttl_seconds: float = DEFAULT_PAGE_TTL_SECONDS
+    ) -> None:
+        """Create a cache backed by the given directory."""
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.link_hits = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, url: str) -> tuple[CachedPage | None, bool]:
+        """Return the cached page for a URL and whether it is still fresh."""
+        page = self._load(url)
+        if page is None:
+            return None, False
+        fresh = time.time() - page.fetched_at < self.ttl_seconds
+        if fresh:
+            with self._lock:
+                self.hits += 1
+            logger.debug("Page cache hit for %s", url)
+        return page, fresh
+
+    def store(self, url: str, resp: Any) -> CachedPage:
+        """Record a full (200) response for a page and return its entry.
+
+        Parameters
+        ----------
+        url : str
+            The page URL.
+        resp : Any
+            The response, with .content, .text and .headers.
+
+        Returns
+        -------
+        CachedPage
+            The new entry, with the page text loaded.
+        """
+        with self._lock:
+            self.misses += 1
+        page = CachedPage(
+            url=url,
+            sha256=hashlib.sha256(resp.content).hexdigest(),
+            fetched_at=time.time(),
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            text=resp.text,
+        )
+        if self.directory is not None:
+            _, body_path = self._paths(url)
+            self._write(body_path, page.text.encode("utf-8") if page.text else b"")
+            self._save(page)
+        return page
+
+    def renew(self, page: CachedPage) -> None:
+        """Mark a page as fresh again after the server answered 304 Not Modified."""
+        with self._lock:
+            self.revalidated += 1
+        page.fetched_at = time.time()
+        self._save(page)
+
+    def links(
+        self, page: CachedPage, base_url: str, allow_ext: list[str], href_regex: str | None
+    ) -> list[str]:
+        """Return extract_links for the page, parsing it only on a memo miss.
+
+        Parameters
+        ----------
+        page : CachedPage
+            The page from lookup or store.
+        base_url : str
+            Base URL for resolving relative links.
+        allow_ext : list[str]
+            Allowed file extensions.
+        href_regex : str | None
+            Optional href filter.
+
+        Returns
+        -------
+        list[str]
+            The filtered, absolute links.
+        """
+        memo_key = hashlib.sha256(
+            json.dumps([page.sha256, [e.lower() for e in allow_ext], href_regex, base_url]).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        cached = page.links.get(memo_key)
+        if cached is not None:
+            with self._lock:
+                self.link_hits += 1
+            logger.debug("Reusing %d extracted links for %s", len(cached), page.url)
+            return list(cached)
+        from .scrape import extract_links
+
+        text = page.text if page.text is not None else self._read_text(page.url)
+        found = extract_links(text, base_url, allow_ext, href_regex)
+        page.links[memo_key] = found
+        self._save(page)
+        return list(found)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        assert self.directory is not None
+        name = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        return self.directory / f"{name}.json", self.directory / f"{name}.html"
+
+    def _load(self, url: str) -> CachedPage | None:
+        if self.directory is None:
+            return None
+        meta_path, body_path = self._paths(url)
+        try:
+            raw: Any = json.loads(meta_path.read_text(encoding="utf-8"))
+            if normalize_url(raw["url"]) != normalize_url(url) or not body_path.exists():
+                return None
+            return CachedPage(
+                url=url,
+                sha256=str(raw["sha256"]),
+                fetched_at=float(raw["fetched_at"]),
+                etag=raw.get("etag"),
+                last_modified=raw.get("last_modified"),
+                links={str(k): list(v) for k, v in raw.get("links", {}).items()},
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _read_text(self, url: str) -> str:
+        _, body_path = self._paths(url)
+        return body_path.read_text(encoding="utf-8")
+
+    def _save(self, page: CachedPage) -> None:
+        if self.directory is None:
+            return
+        meta = asdict(page)
+        del meta["text"]
+        meta_path, _ = self._paths(page.url)
+        self._write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _write(self, path: Path, data: bytes) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+        except OSError as exc:
+            logger.warning("Could not write page cache entry %s: %s", path, exc)
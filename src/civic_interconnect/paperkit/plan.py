@@ -0,0 +1,310 @@
+"""Dry-run plans: what a fetch would download, where to, and how much.
+
+This module provides:
+- HeadResult: Status, size and validators reported by a HEAD request
+- probe: HEAD one URL, falling back to a bodiless GET where HEAD is refused
+- PlannedFile: One URL to download with its output path and HeadResult
+- PlannedAsset: The files one configured asset resolves to, or its errors
+- Collision: Different URLs that would be saved to the same path
+- find_collisions: Detect output paths shared by different URLs
+- Plan: Every planned asset with totals and collisions, as text or JSON
+
+Plans are built by orchestrate.plan, which resolves assets the way run does
+(scraping page assets and crawling below them) but downloads and writes no
+data files. Paths are compared case-insensitively, because on macOS and
+Windows such files would overwrite each other. Socrata exports are paged
+queries whose size is only known once they run, so they are not probed.
+
+File: src/civic_interconnect/paperkit/plan.py
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .log import logger
+from .manifest import ManifestEntry
+
+# Statuses of servers that do not implement HEAD for a resource.
+HEAD_UNSUPPORTED: frozenset[int] = frozenset({405, 501})
+
+
+@dataclass
+class HeadResult:
+    """What a HEAD request revealed about a URL.
+
+    Attributes
+    ----------
+    status : int | None
+        Final HTTP status, or None if no response was received.
+    size : int | None
+        Content-Length in bytes, if the server sent one.
+    content_type : str | None
+        Content-Type header.
+    etag : str | None
+        ETag header.
+    last_modified : str | None
+        Last-Modified header.
+    final_url : str | None
+        URL after redirects.
+    error : str | None
+        Why the probe failed.
+    """
+
+    status: int | None = None
+    size: int | None = None
+    content_type: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    final_url: str | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_response(cls, resp: Any) -> "HeadResult":
+        """Read status, size and validators from a response's headers."""
+        length = resp.headers.get("Content-Length")
+        return cls(
+            status=resp.status_code,
+            size=int(length) if length and length.isdigit() else None,
+            content_type=resp.headers.get("Content-Type"),
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            final_url=getattr(resp, "url", None),
+        )
+
+    def matches(self, entry: ManifestEntry | None) -> bool:
+        """Return True if a manifest entry carries the same ETag or Last-Modified."""
+        if entry is None:
+            return False
+        if self.etag and entry.etag:
+            return self.etag == entry.etag
+        return bool(self.last_modified and self.last_modified == entry.last_modified)
+
+
+def _status(exc: Exception) -> int | None:
+    return getattr(getattr(exc, "response", None), "status_code", None)
+
+
+def probe(client: Any, url: str) -> HeadResult:
+    """HEAD a URL and report its size and validators.
+
+    Parameters
+    ----------
+    client : Any
+        HTTP client with .head(url) and .get(url, stream=True) (e.g. HttpClient).
+    url : str
+        The URL to probe.
+
+    Returns
+    -------
+    HeadResult
+        The response headers, or the error. Where HEAD is answered with 405
+        or 501, a streamed GET is sent instead and closed before its body
+        is read.
+    """
+    try:
+        try:
+            resp = client.head(url)
+        except Exception as exc:
+            if _status(exc) not in HEAD_UNSUPPORTED:
+                raise
+            logger.debug("HEAD not allowed for %s; using GET", url)
+            resp = client.get(url, stream=True)
+            resp.close()
+    except Exception as exc:  # noqa: BLE001 - recorded on the planned file
+        return HeadResult(status=_status(exc), error=str(exc))
+    return HeadResult.from_response(resp)
+
+
+@dataclass
+class PlannedFile:
+    """One URL a fetch would download.
+
+    Attributes
+    ----------
+    url : str
+        The URL to download.
+    path : Path
+        Where it would be saved.
+    head : HeadResult | None
+        The probe result; None if the URL was not probed.
+    unchanged : bool
+        True if the file exists and the manifest records the same validators,
+        so a fetch would only revalidate it.
+    """
+
+    url: str
+    path: Path
+    head: HeadResult | None = None
+    unchanged: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        head = asdict(self.head) if self.head is not None else {}
+        return {"url": self.url, "path": str(self.path), "unchanged": self.unchanged, **head}
+
+
+@dataclass
+class PlannedAsset:
+    """What one configured asset resolves to.
+
+    Attributes
+    ----------
+    bibkey : str
+        The bibliography entry.
+    kind : str
+        "direct", "page", "socrata" or "unknown".
+    source : str
+        The configured URL (for page assets, the page).
+    files : list[PlannedFile]
+        The files it would download, in download order.
+    errors : list[str]
+        Why it could not be resolved (e.g. the page failed to load).
+    """
+
+    bibkey: str
+    kind: str
+    source: str
+    files: list[PlannedFile] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "kind": self.kind,
+            "source": self.source,
+            "files": [f.to_dict() for f in self.files],
+            "errors": list(self.errors),
+        }
+
+
+@dataclass
+class Collision:
+    """Different URLs that would be saved to the same path.
+
+    Attributes
+    ----------
+    path : Path
+        The shared output path (as planned for the first URL).
+    urls : list[str]
+        The URLs, in plan order.
+    """
+
+    path: Path
+    urls: list[str]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {"path": str(self.path), "urls": list(self.urls)}
+
+
+def find_collisions(files: Iterable[PlannedFile]) -> list[Collision]:
+    """Return the output paths that different URLs would be saved to.
+
+    The same URL planned twice for one path is not a collision: a run fetches
+    it once.
+    """
+    by_path: dict[str, Collision] = {}
+    for f in files:
+        key = str(f.path).casefold()
+        c = by_path.setdefault(key, Collision(f.path, []))
+        if f.url not in c.urls:
+            c.urls.append(f.url)
+    return [c for c in by_path.values() if len(c.urls) > 1]
+
+
+def _size(n: int) -> str:
+    """Return a byte count in B, KB, MB or GB."""
+    if n < 1024:
+        return f"{n} B"
+    value = float(n)
+    for unit in ("KB", "MB", "GB"):
+        value /= 1024
+        if value < 1024 or unit == "GB":
+            break
+    return f"{value:.1f} {unit}"
+
+
+@dataclass
+class Plan:
+    """Everything a fetch would download.
+
+    Attributes
+    ----------
+    assets : list[PlannedAsset]
+        Planned assets in bibkey then asset order.
+    skipped : list[str]
+        Bibkeys left out by the selection.
+    collisions : list[Collision]
+        Output paths shared by different URLs.
+    """
+
+    assets: list[PlannedAsset] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    collisions: list[Collision] = field(default_factory=list)
+
+    def files(self) -> Iterator[PlannedFile]:
+        """Yield every planned file in plan order."""
+        for a in self.assets:
+            yield from a.files
+
+    def totals(self) -> dict[str, int]:
+        """Return counts and expected bytes, counting each URL once."""
+        unique = {f.url: f for f in self.files()}
+        sizes = [f.head.size if f.head else None for f in unique.values()]
+        to_fetch = [f.head.size for f in unique.values() if f.head and not f.unchanged]
+        return {
+            "bibkeys": len({a.bibkey for a in self.assets}),
+            "assets": len(self.assets),
+            "files": len(unique),
+            "bytes": sum(s for s in sizes if s is not None),
+            "unknown_sizes": sum(1 for s in sizes if s is None),
+            "unchanged": sum(1 for f in unique.values() if f.unchanged),
+            "bytes_to_fetch": sum(s for s in to_fetch if s is not None),
+            "errors": sum(len(a.errors) for a in self.assets)
+            + sum(1 for f in unique.values() if f.head and f.head.error),
+            "collisions": len(self.collisions),
+        }
+
+    @property
+    def failed(self) -> bool:
+        """True if an asset could not be resolved, a probe failed or paths collide."""
+        t = self.totals()
+        return bool(t["errors"] or t["collisions"])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation grouped by bibkey."""
+        entries: dict[str, list[dict[str, Any]]] = {}
+        for a in self.assets:
+            entries.setdefault(a.bibkey, []).append(a.to_dict())
+        return {
+            "entries": [{"bibkey": k, "assets": v} for k, v in entries.items()],
+            "skipped": list(self.skipped),
+            "collisions": [c.to_dict() for c in self.collisions],
+            "totals": self.totals(),
+        }
+
+    def format(self) -> str:
+        """Return the plan as readable text, one line per file."""
+        lines: list[str] = []
+        for a in self.assets:
+            lines.append(f"{a.bibkey} [{a.kind}] {a.source}")
+            for f in a.files:
+                head = f.head
+                size = _size(head.size) if head and head.size is not None else "size unknown"
+                note = " (unchanged)" if f.unchanged else ""
+                if head and head.error:
+                    note = f" ERROR {head.error}"
+                lines.append(f"  {f.url} -> {f.path} [{size}]{note}")
+            lines.extend(f"  ERROR {e}" for e in a.errors)
+        for c in self.collisions:
+            lines.append(f"COLLISION {c.path}: " + ", ".join(c.urls))
+        t = self.totals()
+        lines.append(
+            f"{t['files']} files from {t['assets']} assets of {t['bibkeys']} bibkeys: "
+            f"{_size(t['bytes'])} known, {t['unknown_sizes']} of unknown size, "
+            f"{_size(t['bytes_to_fetch'])} to fetch ({t['unchanged']} unchanged), "
+            f"{t['errors']} errors, {t['collisions']} collisions"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,182 @@
+"""Per-host rate limiting and retry backoff policy for the HTTP clients.
+
+This module provides:
+- TokenBucket: A thread-safe token bucket that hands out send times
+- HostRateLimiter: One token bucket per host, shared by all callers of a client
+- RETRYABLE_STATUS: HTTP status codes worth retrying
+- parse_retry_after: Parse a Retry-After header into seconds
+- backoff_delay: Exponential backoff with jitter, honoring Retry-After
+
+File: src/civic_interconnect/paperkit/ratelimit.py
+"""
+
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+# Timeouts, throttling and transient server errors; other 4xx (403, 404, ...) are fatal.
+RETRYABLE_STATUS: frozenset[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+DEFAULT_MAX_BACKOFF_SECONDS: float = 60.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Each
+    call to reserve() takes one token, possibly going into debt, and returns
+    how long the caller must wait before sending; callers are therefore
+    served in arrival order without busy-waiting.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second (requests per second).
+    capacity : float
+        Maximum burst size.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        """Create a full bucket."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        # Tokens accrue from this time on; it lies in the future while paused.
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0
+            debt = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return (self._updated - now) + debt
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all reservations for the next `seconds` (e.g. after Retry-After).
+
+        No tokens accrue during the pause and at most one is left for its
+        end, so callers queued meanwhile resume at `rate`, not in a burst.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 1.0)
+            self._updated = max(self._updated, now + seconds)
+
+
+class HostRateLimiter:
+    """Token-bucket rate limiter keyed by URL host.
+
+    Parameters
+    ----------
+    rate : float
+        Requests per second allowed to each host.
+    burst : float
+        Number of requests a host may receive back to back.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        """Create a limiter; buckets are added per host on first use."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def reserve(self, url: str) -> float:
+        """Reserve a request slot for the URL's host; return seconds to wait."""
+        return self._bucket(url).reserve()
+
+    def acquire(self, url: str) -> None:
+        """Block the calling thread until a request to the URL's host may be sent."""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, url: str, seconds: float) -> None:
+        """Stop sending to the URL's host for `seconds`."""
+        self._bucket(url).pause(seconds)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+
+    Parameters
+    ----------
+    value : str | None
+        The raw header value.
+
+    Returns
+    -------
+    float | None
+        Non-negative seconds to wait, or None if absent or unparseable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    cap: float = DEFAULT_MAX_BACKOFF_SECONDS,
+    retry_after: float | None = None,
+) -> float:
+    """Return the delay before the next attempt.
+
+    Uses exponential backoff with "equal jitter": half of ``base * 2**(attempt-1)``
+    is fixed and half is random, capped at `cap`. A server-provided
+    Retry-After takes precedence when it is longer, but is also capped.
+
+    Parameters
+    ----------
+    attempt : int
+        The attempt that just failed (1-based).
+    base : float
+        Base delay in seconds.
+    cap : float
+        Maximum delay in seconds.
+    retry_after : float | None
+        Seconds requested by the server, if any.
+
+    Returns
+    -------
+    float
+        Seconds to wait.
+    """
+    ceiling = min(cap, base * (2 ** max(0, attempt - 1)))
+    delay = ceiling / 2 + random.uniform(0, ceiling / 2)  # noqa: S311 - jitter, not crypto
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return min(delay, cap)
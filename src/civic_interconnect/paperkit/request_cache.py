@@ -0,0 +1,296 @@
+"""Request deduplication cache for HttpClient.
+
+This module provides:
+- normalize_url: Canonical form of a URL used as the cache key
+- RequestCache: Coalesces concurrent GETs of the same URL and memoizes bodies
+
+Within one run the same page or file URL can be requested by several
+entries. With a RequestCache attached, HttpClient.get performs at most one
+request per normalized URL: concurrent callers wait for the in-flight
+request and share its result, and later callers are served from memory.
+
+With a cache directory, entries are also carried over to later runs. An
+entry older than ``max_age`` seconds (by default, any entry from an earlier
+run) is revalidated with a conditional GET using its stored ETag or
+Last-Modified, and fetched again if it has neither.
+
+Only plain, non-streamed GETs are cached; conditional, ranged and streamed
+requests always go to the network, so downloads stay streamed. Bodies larger
+than ``max_entry_bytes`` are passed through uncached.
+
+File: src/civic_interconnect/paperkit/request_cache.py
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+import hashlib
+import json
+from pathlib import Path
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit, urlunsplit
+
+from .log import logger
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_MAX_ENTRY_BYTES: int = 8 * 1024 * 1024
+DEFAULT_MAX_MEMORY_BYTES: int = 64 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS: float = 0.0
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Return a canonical form of a URL for use as a cache key.
+
+    Lowercases the scheme and host, drops default ports and the fragment,
+    and uses "/" for an empty path. The query string and any credentials
+    are kept as is, so different credentials never share an entry.
+
+    Parameters
+    ----------
+    url : str
+        The URL to normalize.
+
+    Returns
+    -------
+    str
+        The normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    port = parts.port
+    netloc = host if port is None or _DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    if parts.username is not None:
+        userinfo = parts.username
+        if parts.password is not None:
+            userinfo = f"{userinfo}:{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+@dataclass
+class _Entry:
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    encoding: str | None
+    stored_at: float = 0.0
+
+    def validators(self) -> dict[str, str]:
+        """Return the conditional request headers that revalidate this entry."""
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        out: dict[str, str] = {}
+        if "etag" in headers:
+            out["If-None-Match"] = headers["etag"]
+        if "last-modified" in headers:
+            out["If-Modified-Since"] = headers["last-modified"]
+        return out
+
+    def to_response(self) -> "requests.Response":
+        """Build a fresh, fully-read Response for one caller."""
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        resp = requests.Response()
+        resp.status_code = self.status_code
+        resp.headers = CaseInsensitiveDict(self.headers)
+        resp.url = self.url
+        resp.encoding = self.encoding
+        resp._content = self.content
+        # requests' own flag for a body that has been read; not in its stubs
+        resp._content_consumed = True  # pyright: ignore[reportAttributeAccessIssue]
+        return resp
+
+
+class RequestCache:
+    """Thread-safe cache that coalesces and memoizes GET requests.
+
+    Parameters
+    ----------
+    directory : Path | None
+        Optional directory to persist entries in.
+    max_entry_bytes : int
+        Largest body that is cached.
+    max_memory_bytes : int
+        Total size of bodies kept in memory; least recently used entries are
+        evicted beyond it (they remain on disk when a directory is set).
+    max_age : float
+        Seconds an entry loaded from disk is used without revalidation.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+    ) -> None:
+        """Create an empty cache."""
+        self.directory = directory
+        self.max_entry_bytes = max_entry_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._memory = 0
+        self._inflight: dict[str, Future[_Entry | None]] = {}
+
+    def fetch(
+        self, url: str, load: Callable[[dict[str, str]], "requests.Response"]
+    ) -> "requests.Response":
+        """Return the response for url, calling `load` at most once per key.
+
+        Parameters
+        ----------
+        url : str
+            The requested URL.
+        load : Callable[[dict[str, str]], requests.Response]
+            Performs the real request (including retries), adding the given
+            conditional headers; they are empty unless a stale entry is
+            being revalidated.
+
+        Returns
+        -------
+        requests.Response
+            A response owned by the caller.
+        """
+        key = normalize_url(url)
+        with self._lock:
+            entry, stale = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                logger.debug("Request cache hit for %s", url)
+                return entry.to_response()
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if fut is None:
+                fut = self._inflight[key] = Future()
+                self.misses += 1
+
+        if not owner:
+            shared = fut.result()
+            if shared is not None:
+                with self._lock:
+                    self.hits += 1
+                logger.debug("Shared in-flight request for %s", url)
+                return shared.to_response()
+            return load({})
+
+        unchanged = False
+        try:
+            resp = load(stale.validators() if stale is not None else {})
+            if stale is not None and resp.status_code == 304:
+                unchanged = True
+                resp.close()
+                entry = replace(stale, stored_at=time.time())
+                with self._lock:
+                    self.revalidated += 1
+                logger.debug("Request cache entry for %s is unchanged", url)
+            else:
+                entry = self._capture(resp)
+        except Exception as exc:
+            with self._lock:
+                del self._inflight[key]
+            fut.set_exception(exc)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is not None:
+            self._persist(key, entry, body=not unchanged)
+        fut.set_result(entry)
+        return entry.to_response() if entry is not None else resp
+
+    def _capture(self, resp: "requests.Response") -> _Entry | None:
+        if resp.status_code != 200:
+            return None
+        content = resp.content
+        resp.close()
+        if len(content) > self.max_entry_bytes:
+            return None
+        return _Entry(
+            resp.url, resp.status_code, dict(resp.headers), content, resp.encoding, time.time()
+        )
+
+    def _lookup(self, key: str) -> tuple[_Entry | None, _Entry | None]:
+        """Return a usable entry, or else a stored entry that must be revalidated first."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry, None
+        entry = self._load(key)
+        if entry is None:
+            return None, None
+        if time.time() - entry.stored_at < self.max_age:
+            self._remember(key, entry)
+            return entry, None
+        return None, entry
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._memory += len(entry.content)
+        while self._memory > self.max_memory_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self._memory -= len(old.content)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        assert self.directory is not None
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{name}.json", self.directory / f"{name}.body"
+
+    def _load(self, key: str) -> _Entry | None:
+        if self.directory is None:
+            return None
+        meta_path, body_path = self._paths(key)
+        try:
+            meta: Any = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta.get("key") != key:
+                return None
+            return _Entry(
+                meta["url"],
+                int(meta["status_code"]),
+                dict(meta["headers"]),
+                body_path.read_bytes(),
+                meta.get("encoding"),
+                float(meta.get("stored_at", 0.0)),
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _persist(self, key: str, entry: _Entry, *, body: bool = True) -> None:
+        if self.directory is None:
+            return
+        meta_path, body_path = self._paths(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if body:
+                tmp = body_path.with_name(body_path.name + ".tmp")
+                tmp.write_bytes(entry.content)
+                tmp.replace(body_path)
+            meta = {
+                "key": key,
+                "url": entry.url,
+                "status_code": entry.status_code,
+                "headers": entry.headers,
+                "encoding": entry.encoding,
+                "stored_at": entry.stored_at,
+            }
+            tmp = meta_path.with_name(meta_path.name + ".tmp")
+            tmp.write_text(json.dumps(meta), encoding="utf-8")
+            tmp.replace(meta_path)
+        except OSError as exc:
+            logger.warning("Could not persist request cache entry for %s: %s", entry.url, exc)
@@ -3,46 +3,121 @@
 This module provides utilities to parse HTML, extract anchor links,
 filter them by extension and regular expression, and log the results.
 
+The default parser is a streaming extractor built on html.parser.HTMLParser:
+it only collects ``<a href>`` values, never builds a document tree, and
+applies the regex and extension filters before resolving URLs. The
+BeautifulSoup implementation is kept as ``parser="bs4"``; both return
+identical results.
+
 File: src/civic_interconnect/paperkit/scrape.py
 """
 
+from collections.abc import Iterator
+from html.parser import HTMLParser
 from pathlib import Path
 import re
+from typing import Literal
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
-
+from .instrument import span
 from .log import logger
 
+_FEED_CHUNK = 64 * 1024
 
-def extract_links(
-    html: str, base_url: str, allow_ext: list[str], href_regex: str | None
-) -> list[str]:
-    """Extract and filter anchor links from an HTML document.
+ParserName = Literal["stream", "bs4"]
+
+
+class _AnchorHrefParser(HTMLParser):
+    """Collect the href of every <a> start tag, in document order."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.hrefs: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag != "a":
+            return
+        href: str | None = None
+        for name, value in attrs:
+            # Last duplicate wins and a bare `href` counts as empty, as in BeautifulSoup.
+            if name == "href":
+                href = value or ""
+        if href is not None:
+            self.hrefs.append(href)
+
+
+def iter_hrefs(html: str) -> Iterator[str]:
+    """Yield the raw href of each anchor in an HTML document.
+
+    The document is fed to the parser in chunks and hrefs are yielded as
+    they are found, so no tree is built and memory stays proportional to
+    one chunk plus the pending hrefs.
 
     Parameters
     ----------
     html : str
-        The HTML content to parse.
-    base_url : str
-        The base URL to resolve relative links.
-    allow_ext : list[str]
-        List of allowed file extensions (e.g., ['.pdf', '.html']).
-    href_regex : str | None
-        Optional regular expression to further filter hrefs.
+        The HTML content to scan.
 
-    Returns
-    -------
-    list[str]
-        List of filtered, absolute URLs extracted from the HTML.
+    Yields
+    ------
+    str
+        Each href attribute value (character references decoded).
     """
-    soup = BeautifulSoup(html, "html.parser")
-    rx = re.compile(href_regex, re.I) if href_regex else None
+    parser = _AnchorHrefParser()
+    for start in range(0, len(html), _FEED_CHUNK):
+        parser.feed(html[start : start + _FEED_CHUNK])
+        if parser.hrefs:
+            yield from parser.hrefs
+            parser.hrefs.clear()
+    parser.close()
+    yield from parser.hrefs
+
+
+def _href_suffix(href: str) -> str | None:
+    """Return the extension a link will resolve to, or None if it depends on the base URL.
+
+    The last path segment survives urljoin unchanged unless it is empty or a
+    dot segment, so its suffix can be checked before resolving the URL.
+    """
+    last = urlparse(href).path.rsplit("/", 1)[-1]
+    if last in ("", ".", ".."):
+        return None
+    return Path(last).suffix.lower()
+
+
+def _extract_links_stream(
+    html: str, base_url: str, allow: list[str], rx: re.Pattern[str] | None
+) -> list[str]:
     out: list[str] = []
     seen: set[str] = set()
+    allowed = set(allow)
+    for raw in iter_hrefs(html):
+        href = raw.strip()
+        if rx and not rx.search(href):
+            continue
+        if allowed:
+            ext = _href_suffix(href)
+            if ext is not None and ext not in allowed:
+                continue
+            full = urljoin(base_url, href)
+            if ext is None and Path(urlparse(full).path).suffix.lower() not in allowed:
+                continue
+        else:
+            full = urljoin(base_url, href)
+        if full not in seen:
+            seen.add(full)
+            out.append(full)
+    return out
 
-    allow = [e.lower() for e in allow_ext] if allow_ext else []
 
+def _extract_links_bs4(
+    html: str, base_url: str, allow: list[str], rx: re.Pattern[str] | None
+) -> list[str]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    out: list[str] = []
+    seen: set[str] = set()
     for a in soup.find_all("a", href=True):
         href = str(a["href"]).strip()
         full = urljoin(base_url, href)
@@ -54,5 +129,45 @@ def extract_links(
         if full not in seen:
             seen.add(full)
             out.append(full)
+    return out
+
+
+def extract_links(
+    html: str,
+    base_url: str,
+    allow_ext: list[str],
+    href_regex: str | None,
+    *,
+    parser: ParserName = "stream",
+) -> list[str]:
+    """Extract and filter anchor links from an HTML document.
+
+    Parameters
+    ----------
+    html : str
+        The HTML content to parse.
+    base_url : str
+        The base URL to resolve relative links.
+    allow_ext : list[str]
+        List of allowed file extensions (e.g., ['.pdf', '.html']).
+    href_regex : str | None
+        Optional regular expression to further filter hrefs.
+    parser : {"stream", "bs4"}
+        Extraction backend. "stream" (default) is the fast HTMLParser-based
+        scanner; "bs4" builds a BeautifulSoup tree.
+
+    Returns
+    -------
+    list[str]
+        List of filtered, absolute URLs extracted from the HTML.
+    """
+    rx = re.compile(href_regex, re.IGNORECASE) if href_regex else None
+    allow = [e.lower() for e in allow_ext] if allow_ext else []
+    with span("scrape.extract_links", url=base_url, bytes=len(html)) as sp:
+        if parser == "bs4":
+            out = _extract_links_bs4(html, base_url, allow, rx)
+        else:
+            out = _extract_links_stream(html, base_url, allow, rx)
+        sp.set("links", len(out))
     logger.debug("Extracted %d links from %s", len(out), base_url)
     return out
@@ -0,0 +1,101 @@
+"""Filters that restrict a run to some bibkeys and assets.
+
+This module provides:
+- Selection: Bibkey, asset type and host filters, plus a failed-only flag
+- asset_kind: Classify an asset as "direct", "page" or "socrata"
+
+Patterns are shell-style globs (``fnmatch``). Bibkeys are matched case
+sensitively; hosts are matched in lowercase against the host of the
+asset's configured URL (for page assets, the page itself, not the links
+found on it).
+
+File: src/civic_interconnect/paperkit/selection.py
+"""
+
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Literal
+from urllib.parse import urlparse
+
+from .config import AssetTD
+
+AssetKind = Literal["direct", "page", "socrata"]
+
+
+def asset_kind(asset: AssetTD) -> AssetKind | None:
+    """Return "direct", "page" or "socrata" by the asset's URL key, else None."""
+    if "url" in asset:
+        return "direct"
+    if "page_url" in asset:
+        return "page"
+    if "soda_url" in asset:
+        return "socrata"
+    return None
+
+
+def _asset_url(asset: AssetTD) -> str:
+    if "url" in asset:
+        return asset["url"]
+    if "page_url" in asset:
+        return asset["page_url"]
+    if "soda_url" in asset:
+        return asset["soda_url"]
+    return ""
+
+
+@dataclass
+class Selection:
+    """Which entries and assets a run should visit.
+
+    Empty lists mean "no restriction".
+
+    Attributes
+    ----------
+    only : list[str]
+        Bibkey globs to include.
+    exclude : list[str]
+        Bibkey globs to leave out (applied after `only`).
+    asset_types : list[AssetKind]
+        Asset kinds to fetch ("direct", "page", "socrata").
+    hosts : list[str]
+        Host globs to include, e.g. ``"*.cdc.gov"``.
+    exclude_hosts : list[str]
+        Host globs to leave out.
+    failed_only : bool
+        Only retry bibkeys whose record had errors in the previous run.
+    """
+
+    only: list[str] = field(default_factory=list)
+    exclude: list[str] = field(default_factory=list)
+    asset_types: list[AssetKind] = field(default_factory=list)
+    hosts: list[str] = field(default_factory=list)
+    exclude_hosts: list[str] = field(default_factory=list)
+    failed_only: bool = False
+
+    def is_empty(self) -> bool:
+        """Return True if the selection does not filter anything."""
+        return not (
+            self.only
+            or self.exclude
+            or self.asset_types
+            or self.hosts
+            or self.exclude_hosts
+            or self.failed_only
+        )
+
+    def keeps_key(self, bibkey: str) -> bool:
+        """Return True if the bibkey passes the include/exclude patterns."""
+        if self.only and not any(fnmatchcase(bibkey, p) for p in self.only):
+            return False
+        return not any(fnmatchcase(bibkey, p) for p in self.exclude)
+
+    def keeps_asset(self, asset: AssetTD) -> bool:
+        """Return True if the asset passes the type and host filters."""
+        if self.asset_types and asset_kind(asset) not in self.asset_types:
+            return False
+        if not (self.hosts or self.exclude_hosts):
+            return True
+        host = (urlparse(_asset_url(asset)).hostname or "").lower()
+        if self.hosts and not any(fnmatchcase(host, p.lower()) for p in self.hosts):
+            return False
+        return not any(fnmatchcase(host, p.lower()) for p in self.exclude_hosts)
@@ -0,0 +1,411 @@
+"""Paged CSV exports from Socrata (SODA) endpoints such as data.cdc.gov.
+
+This module provides:
+- soda_csv_url / soda_page_url: Build the CSV resource URL and the URL of one
+  ``$limit``/``$offset`` page
+- SodaResult: The saved file with its row and page counts
+- fetch_socrata / fetch_socrata_async: Stream every page of a dataset into one
+  CSV file, resuming after a failure from the last completed page
+
+Pages are requested with ``Accept-Encoding: gzip`` and decoded while they
+stream, so neither a page nor the dataset is held in memory. Each page's
+header row is checked against the first one and dropped, and rows are
+counted as CSV records, so quoted fields spanning lines count once.
+
+Progress is kept next to the target in ``<file>.part`` and
+``<file>.soda.json``: after every page the part file's length and the next
+offset are saved, so a later attempt or run truncates the part file to the
+last completed page and continues from there. A dataset is complete when a
+page returns fewer rows than ``page_size``.
+
+With a manifest, the first page's ETag and Last-Modified are recorded with
+the saved file, and the next export requests the first page with
+If-None-Match/If-Modified-Since. SODA derives these validators from the
+dataset's version rather than from the page, so a 304 means the dataset is
+unchanged and the saved file is kept without paging through it again.
+
+File: src/civic_interconnect/paperkit/socrata.py
+"""
+
+import codecs
+from collections.abc import Iterable, Iterator
+import csv
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from .download import (
+    DEFAULT_CHUNK_SIZE,
+    PART_SUFFIX,
+    _validators,
+    ensure_dir,
+    sha256_file,
+    write_bytes,
+)
+from .durability import SyncPolicy
+from .instrument import span
+from .log import logger
+from .manifest import Manifest, ManifestEntry
+from .metrics import note_bytes, note_cache, note_retry, note_rows
+
+DEFAULT_SODA_PAGE_SIZE: int = 50_000
+DEFAULT_SODA_ORDER: str = ":id"
+STATE_SUFFIX: str = ".soda.json"
+
+
+def soda_csv_url(url: str) -> str:
+    """Return the CSV form of a SODA resource URL (``.json`` or no suffix become ``.csv``)."""
+    parts = urlparse(url)
+    path = parts.path.removesuffix(".json")
+    if not path.endswith(".csv"):
+        path += ".csv"
+    return urlunparse(parts._replace(path=path))
+
+
+def soda_page_url(
+    url: str, limit: int, offset: int, order: str = DEFAULT_SODA_ORDER, where: str | None = None
+) -> str:
+    """Return the URL of one page of a SODA query.
+
+    Parameters
+    ----------
+    url : str
+        The resource URL; query parameters already on it are kept.
+    limit : int
+        Rows per page (``$limit``).
+    offset : int
+        Rows to skip (``$offset``).
+    order : str
+        Sort order (``$order``); paging needs a stable order.
+    where : str | None
+        Optional filter (``$where``).
+
+    Returns
+    -------
+    str
+        The page URL.
+    """
+    parts = urlparse(soda_csv_url(url))
+    params = [(k, v) for k, v in parse_qsl(parts.query) if k not in ("$limit", "$offset")]
+    if order and not any(k == "$order" for k, _ in params):
+        params.append(("$order", order))
+    if where and not any(k == "$where" for k, _ in params):
+        params.append(("$where", where))
+    params += [("$limit", str(limit)), ("$offset", str(offset))]
+    return urlunparse(parts._replace(query=urlencode(params)))
+
+
+@dataclass
+class SodaResult:
+    """Outcome of a Socrata export.
+
+    Attributes
+    ----------
+    path : Path
+        The saved CSV file.
+    rows : int
+        Data rows written (excluding the header); 0 if unchanged.
+    pages : int
+        Pages fetched, including those of earlier attempts that were resumed.
+    sha256 : str
+        SHA256 hexadecimal digest of the saved file.
+    resumed : bool
+        True if the export continued from a previous attempt's progress.
+    unchanged : bool
+        True if the server reported the dataset unchanged since the saved
+        export, which was kept as is.
+    """
+
+    path: Path
+    rows: int
+    pages: int
+    sha256: str
+    resumed: bool = False
+    unchanged: bool = False
+
+
+@dataclass
+class _SodaState:
+    """Progress of an export, saved after every completed page."""
+
+    query: str
+    offset: int = 0
+    rows: int = 0
+    pages: int = 0
+    size: int = 0
+    header: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def _lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode UTF-8 chunks and yield lines with their line endings."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    for chunk in chunks:
+        note_bytes(len(chunk))
+        buf += decoder.decode(chunk)
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buf += decoder.decode(b"", final=True)
+    if buf:
+        yield buf
+
+
+def _records(lines: Iterable[str]) -> Iterator[str]:
+    """Group lines into CSV records, keeping each record's original text."""
+    pending: list[str] = []
+
+    def feed() -> Iterator[str]:
+        for line in lines:
+            pending.append(line)
+            yield line
+
+    for _ in csv.reader(feed()):
+        record = "".join(pending)
+        pending.clear()
+        yield record if record.endswith("\n") else record + "\n"
+
+
+class _SodaExport:
+    """The part file and saved progress of one export."""
+
+    def __init__(
+        self, url: str, out_path: Path, page_size: int, order: str, where: str | None
+    ) -> None:
+        self.url = url
+        self.out_path = out_path
+        self.page_size = max(1, page_size)
+        self.order = order
+        self.where = where
+        self.part = out_path.with_name(out_path.name + PART_SUFFIX)
+        self.state_path = out_path.with_name(out_path.name + STATE_SUFFIX)
+        query = soda_page_url(url, self.page_size, 0, order, where)
+        self.state = self._load(query) or _SodaState(query)
+        self.resumed = self.state.pages > 0
+        if self.resumed:
+            logger.info(
+                "Resuming %s at row %d (page %d)", url, self.state.offset, self.state.pages + 1
+            )
+        ensure_dir(out_path.parent)
+        with self.part.open("ab") as f:
+            f.truncate(self.state.size)
+
+    def _load(self, query: str) -> _SodaState | None:
+        try:
+            raw: Any = json.loads(self.state_path.read_text(encoding="utf-8"))
+            state = _SodaState(**raw)
+        except (OSError, ValueError, TypeError):
+            return None
+        if state.query != query or not self.part.exists() or self.part.stat().st_size < state.size:
+            return None
+        return state
+
+    def previous(self, manifest: Manifest | None) -> ManifestEntry | None:
+        """Return the manifest entry to revalidate the saved export with, unless resuming."""
+        if self.resumed:
+            return None
+        return _validators(manifest, self.state.query, self.out_path, None)
+
+    def note_validators(self, headers: Any) -> None:
+        """Keep the first page's ETag and Last-Modified for the manifest."""
+        if self.state.pages == 0:
+            self.state.etag = headers.get("ETag")
+            self.state.last_modified = headers.get("Last-Modified")
+
+    def next_url(self) -> str:
+        """Return the URL of the next page."""
+        return soda_page_url(self.url, self.page_size, self.state.offset, self.order, self.where)
+
+    def rollback(self) -> None:
+        """Drop whatever a failed page appended to the part file."""
+        with self.part.open("ab") as f:
+            f.truncate(self.state.size)
+
+    def append(self, chunks: Iterable[bytes]) -> bool:
+        """Append one page and save progress; return True if more pages may follow."""
+        state = self.state
+        records = _records(_lines(chunks))
+        rows = 0
+        with span("socrata.page", url=self.url, offset=state.offset) as sp:
+            with self.part.open("ab") as f:
+                header = next(records, None)
+                if header is not None and state.header is None:
+                    f.write(header.encode("utf-8"))
+                elif header is not None and header != state.header:
+                    raise ValueError(f"column header of {self.url} changed between pages")
+                for record in records:
+                    f.write(record.encode("utf-8"))
+                    rows += 1
+                size = f.tell()
+            sp.set("rows", rows)
+        state.header = state.header or header
+        state.rows += rows
+        state.pages += 1
+        state.offset += self.page_size
+        state.size = size
+        write_bytes(self.state_path, json.dumps(asdict(state)).encode("utf-8"))
+        logger.debug("Page %d of %s: %d rows", state.pages, self.url, rows)
+        return rows >= self.page_size
+
+    def finish(self, manifest: Manifest | None, sync: SyncPolicy | None) -> SodaResult:
+        """Move the part file into place, record it and drop the saved progress."""
+        if sync is not None:
+            sync.before_rename(self.part)
+        self.part.replace(self.out_path)
+        if sync is not None:
+            sync.saved(self.out_path)
+        self.state_path.unlink(missing_ok=True)
+        digest = sha256_file(self.out_path)
+        if manifest is not None:
+            size = self.out_path.stat().st_size
+            entry = ManifestEntry(
+                url=self.state.query,
+                etag=self.state.etag,
+                last_modified=self.state.last_modified,
+                size=size,
+                sha256=digest,
+            )
+            manifest.record(self.out_path, entry)
+        note_rows(self.state.rows)
+        logger.info(
+            "Saved %s (%d rows in %d pages)", self.out_path, self.state.rows, self.state.pages
+        )
+        return SodaResult(self.out_path, self.state.rows, self.state.pages, digest, self.resumed)
+
+    def keep(self, prev: ManifestEntry) -> SodaResult:
+        """Drop the new export and keep the saved file, which the server reported unchanged."""
+        self.part.unlink(missing_ok=True)
+        self.state_path.unlink(missing_ok=True)
+        note_cache("not_modified")
+        logger.info("Up to date %s", self.out_path)
+        digest = prev.sha256 or sha256_file(self.out_path)
+        return SodaResult(self.out_path, 0, 0, digest, unchanged=True)
+
+
+def fetch_socrata(
+    client: Any,
+    url: str,
+    out_path: Path,
+    *,
+    page_size: int = DEFAULT_SODA_PAGE_SIZE,
+    order: str = DEFAULT_SODA_ORDER,
+    where: str | None = None,
+    manifest: Manifest | None = None,
+    sync: SyncPolicy | None = None,
+) -> SodaResult:
+    """Export a SODA dataset page by page into one CSV file.
+
+    Parameters
+    ----------
+    client : Any
+        HTTP client with .get(url, stream=True, etag=..., last_modified=...)
+        and .retries (e.g. HttpClient).
+    url : str
+        The dataset's resource URL, e.g. ``https://data.cdc.gov/resource/e2d5-ggg7.csv``.
+    out_path : Path
+        Where to save the CSV.
+    page_size : int
+        Rows requested per page.
+    order : str
+        ``$order`` clause keeping pages stable while paging.
+    where : str | None
+        Optional ``$where`` filter.
+    manifest : Manifest | None
+        Records the saved file and its validators; when it holds them for
+        this query and file, the first page is requested conditionally and a
+        304 keeps the saved file.
+    sync : SyncPolicy | None
+        Durability policy for the saved file.
+
+    Returns
+    -------
+    SodaResult
+        The saved file with its row count.
+
+    Raises
+    ------
+    requests.RequestException
+        If a page request fails (the client retries it first) or its body
+        keeps breaking off; progress up to the last completed page is kept
+        for the next attempt.
+    ValueError
+        If the column header changes between pages.
+    """
+    import requests
+
+    from .http_client import is_retryable
+
+    export = _SodaExport(url, out_path, page_size, order, where)
+    prev = export.previous(manifest)
+    attempts = max(1, int(getattr(client, "retries", 3)))
+    more = True
+    while more:
+        page_url = export.next_url()
+        check = prev if export.state.pages == 0 else None
+        for attempt in range(1, attempts + 1):
+            # Failed requests are retried by the client; only a body that breaks
+            # off mid-stream is rolled back and requested again here.
+            resp = client.get(
+                page_url,
+                stream=True,
+                etag=check.etag if check else None,
+                last_modified=check.last_modified if check else None,
+            )
+            try:
+                if check is not None and resp.status_code == 304:
+                    return export.keep(check)
+                export.note_validators(resp.headers)
+                more = export.append(resp.iter_content(chunk_size=DEFAULT_CHUNK_SIZE))
+                break
+            except requests.RequestException as exc:
+                export.rollback()
+                if attempt == attempts or not is_retryable(exc):
+                    raise
+                note_retry()
+                logger.warning("Page %s interrupted (attempt %d): %s", page_url, attempt, exc)
+            finally:
+                resp.close()
+    return export.finish(manifest, sync)
+
+
+async def fetch_socrata_async(
+    client: Any,
+    url: str,
+    out_path: Path,
+    *,
+    page_size: int = DEFAULT_SODA_PAGE_SIZE,
+    order: str = DEFAULT_SODA_ORDER,
+    where: str | None = None,
+    manifest: Manifest | None = None,
+    sync: SyncPolicy | None = None,
+) -> SodaResult:
+    """Asyncio counterpart of fetch_socrata for clients whose .get is awaitable.
+
+    Each page body is read by the client before it is written, so memory use
+    is bounded by one page rather than the dataset. Because the body is read
+    inside the client's retry loop, a transfer that breaks off is retried by
+    the client, and there is no separate page retry and rollback here. As
+    with fetch_socrata, progress up to the last completed page is kept, and
+    an unchanged dataset is detected with a conditional first page.
+    """
+    import asyncio
+
+    export = await asyncio.to_thread(_SodaExport, url, out_path, page_size, order, where)
+    prev = export.previous(manifest)
+    more = True
+    while more:
+        check = prev if export.state.pages == 0 else None
+        resp = await client.get(
+            export.next_url(),
+            etag=check.etag if check else None,
+            last_modified=check.last_modified if check else None,
+        )
+        if check is not None and resp.status_code == 304:
+            return await asyncio.to_thread(export.keep, check)
+        export.note_validators(resp.headers)
+        more = await asyncio.to_thread(export.append, [resp.content])
+    return await asyncio.to_thread(export.finish, manifest, sync)
@@ -0,0 +1,137 @@
+"""Content-addressed blob store for deduplicating downloaded files.
+
+This module provides:
+- BlobStore: Files keyed by SHA256 under ``<out>/.paperkit/blobs``
+- link_or_copy: Materialize a file as a hardlink, reflink, or copy
+
+Each saved asset under ``data/raw/<bibkey>/`` becomes a hardlink to its blob
+(a reflink or plain copy where hardlinks are not possible), so identical
+files referenced by several bibkeys are stored once. Downloads always
+replace the destination by rename, so a blob is never modified in place;
+editing a saved file by hand, however, edits every link to it.
+
+File: src/civic_interconnect/paperkit/store.py
+"""
+
+import os
+from pathlib import Path
+import shutil
+import sys
+import threading
+
+from .config import STATE_DIR_NAME
+from .log import logger
+
+BLOBS_DIRNAME: str = "blobs"
+
+# Linux FICLONE ioctl: share extents between two files (btrfs, xfs, ...).
+_FICLONE = 0x40049409
+
+
+def _reflink(src: Path, dest: Path) -> None:
+    if not sys.platform.startswith("linux"):
+        raise OSError("reflink not supported on this platform")
+    import fcntl
+
+    with src.open("rb") as s, dest.open("wb") as d:
+        fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+
+
+def link_or_copy(src: Path, dest: Path, *, allow_link: bool = True) -> str:
+    """Make `dest` have the same content as `src`, sharing storage when possible.
+
+    Tries a hardlink, then a reflink, then falls back to a copy. The new file
+    is created next to `dest` and renamed over it, so readers never see a
+    partial file.
+
+    Parameters
+    ----------
+    src : Path
+        Existing file to link to.
+    dest : Path
+        Destination path (replaced if it exists).
+    allow_link : bool
+        If False, skip the hardlink so `dest` gets its own inode
+        (a reflink or copy).
+
+    Returns
+    -------
+    str
+        The method used: "hardlink", "reflink" or "copy".
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    tmp.unlink(missing_ok=True)
+    method = "hardlink"
+    try:
+        if not allow_link:
+            raise OSError("hardlink not allowed")
+        os.link(src, tmp)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        method = "reflink"
+        try:
+            _reflink(src, tmp)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            method = "copy"
+            shutil.copyfile(src, tmp)
+    tmp.replace(dest)
+    return method
+
+
+class BlobStore:
+    """Content-addressed store keyed by SHA256 digest.
+
+    Parameters
+    ----------
+    root : Path
+        Directory holding the blobs (``<root>/<aa>/<digest>``).
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Create a store rooted at the given directory."""
+        self.root = root
+        # Serializes ingests so two identical new files cannot both become the blob.
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_output(cls, out_root: Path) -> "BlobStore":
+        """Return the store kept in the state directory of an output root."""
+        return cls(out_root / STATE_DIR_NAME / BLOBS_DIRNAME)
+
+    def blob_path(self, digest: str) -> Path:
+        """Return where the blob with this digest is (or would be) stored."""
+        digest = digest.lower()
+        return self.root / digest[:2] / digest
+
+    def ingest(self, path: Path, digest: str) -> str:
+        """Add a saved file to the store and point `path` at the shared blob.
+
+        If the blob is new, the file itself becomes the blob (via a link or
+        copy). If an identical blob already exists, `path` is replaced by a
+        link to it and the duplicate data is released.
+
+        Parameters
+        ----------
+        path : Path
+            A freshly saved file.
+        digest : str
+            Its SHA256 hexadecimal digest.
+
+        Returns
+        -------
+        str
+            How `path` now relates to the blob: "hardlink", "reflink", "copy",
+            or "new" when the file was added as a new blob.
+        """
+        blob = self.blob_path(digest)
+        with self._lock:
+            if blob.exists():
+                if path.exists() and path.samefile(blob):
+                    return "hardlink"
+                method = link_or_copy(blob, path)
+                logger.debug("Deduplicated %s (%s to %s)", path, method, blob)
+                return method
+            link_or_copy(path, blob)
+            return "new"
@@ -0,0 +1,345 @@
+"""Connection pooling and transport selection for HttpClient sessions.
+
+This module provides:
+- TransportConfig: Pool size, pool blocking, keep-alive, connect retries and
+  HTTP/2 settings for a session
+- TunedAdapter: A requests HTTPAdapter with those settings that counts the
+  connections it opens
+- HttpxSession: A requests.Session stand-in backed by httpx, which can speak
+  HTTP/2 and multiplex many requests to a host over one connection
+- new_session: Build the session for a TransportConfig
+
+Every new TCP connection is reported to the current fetch's metrics
+(note_connection), so run reports show how many requests reused a pooled
+connection. With keep-alive on, idle pooled sockets also get TCP keep-alive
+probes, so NATs and load balancers do not silently drop them between
+requests.
+
+HTTP/2 needs httpx with its ``h2`` extra: install ``civic-paperkit[http2]``.
+
+File: src/civic_interconnect/paperkit/transport.py
+"""
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+import socket
+from typing import TYPE_CHECKING, Any, cast
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from .log import logger
+from .metrics import note_connection
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_POOL_CONNECTIONS: int = 16
+DEFAULT_POOL_MAXSIZE: int = 16
+DEFAULT_CONNECT_RETRIES: int = 2
+KEEPALIVE_IDLE_SECONDS: int = 60
+
+
+@dataclass
+class TransportConfig:
+    """How a session pools and reuses connections.
+
+    Attributes
+    ----------
+    pool_connections : int
+        Hosts whose connection pools are kept.
+    pool_maxsize : int
+        Connections kept per host; should be at least the number of
+        concurrent requests to one host, or extra connections are opened
+        and thrown away.
+    pool_block : bool
+        Wait for a pooled connection when all are busy instead of opening
+        a throwaway one.
+    keepalive : bool
+        Keep connections open between requests (with TCP keep-alive probes);
+        False sends ``Connection: close``.
+    connect_retries : int
+        Times urllib3 retries establishing a connection before HttpClient's
+        own retries and backoff take over.
+    http2 : bool
+        Use httpx with HTTP/2 instead of requests (see HttpxSession).
+    """
+
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+    pool_block: bool = False
+    keepalive: bool = True
+    connect_retries: int = DEFAULT_CONNECT_RETRIES
+    http2: bool = False
+
+    @classmethod
+    def for_run(cls, jobs: int, per_host: int, **kwargs: Any) -> "TransportConfig":
+        """Return a config whose per-host pool fits the run's concurrency."""
+        kwargs.setdefault("pool_maxsize", max(DEFAULT_POOL_MAXSIZE, jobs, per_host))
+        return cls(**kwargs)
+
+
+def _keepalive_options() -> list[tuple[int, int, int]]:
+    """Return socket options enabling TCP keep-alive probes where supported."""
+    # urllib3 declares the defaults ClassVar[Final[...]], which pyright cannot iterate.
+    defaults = cast("list[tuple[int, int, int]]", HTTPConnection.default_socket_options)
+    opts = [*defaults, (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        opts.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE_SECONDS))
+    return opts
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        note_connection()
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        note_connection()
+        super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls: type[HTTPConnection] = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls: type[HTTPSConnection] = _CountingHTTPSConnection
+
+
+class TunedAdapter(HTTPAdapter):
+    """HTTPAdapter configured from a TransportConfig.
+
+    Parameters
+    ----------
+    config : TransportConfig
+        Pool and keep-alive settings.
+    """
+
+    def __init__(self, config: TransportConfig) -> None:
+        """Create the adapter and its pool manager."""
+        self.transport = config
+        retries = Retry(
+            total=None,
+            connect=config.connect_retries,
+            read=0,
+            status=0,
+            other=0,
+            redirect=None,
+            backoff_factor=0.1,
+            raise_on_status=False,
+        )
+        super().__init__(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            max_retries=retries,
+            pool_block=config.pool_block,
+        )
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        """Create the pool manager with keep-alive sockets and counting pools."""
+        transport = getattr(self, "transport", None)
+        if transport is not None and transport.keepalive:
+            pool_kwargs["socket_options"] = _keepalive_options()
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+class _HttpxResponse:
+    """The parts of requests.Response that HttpClient and its callers use."""
+
+    def __init__(self, resp: "httpx.Response", translate: Callable[[Exception], Exception]):
+        self._resp = resp
+        self._translate = translate
+        self.status_code = resp.status_code
+        self.headers = resp.headers
+        self.url = str(resp.url)
+        self.encoding = resp.encoding
+        self.reason = resp.reason_phrase
+
+    def _read(self) -> bytes:
+        try:
+            return self._resp.read()
+        except Exception as exc:
+            raise self._translate(exc) from exc
+
+    @property
+    def content(self) -> bytes:
+        return self._read()
+
+    @property
+    def text(self) -> str:
+        self._read()
+        return self._resp.text
+
+    def iter_content(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        try:
+            yield from self._resp.iter_bytes(chunk_size)
+        except Exception as exc:
+            raise self._translate(exc) from exc
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            kind = "Client" if self.status_code < 500 else "Server"
+            msg = f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}"
+            raise requests.HTTPError(msg, response=self)  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        self._resp.close()
+
+
+class HttpxSession:
+    """A requests.Session stand-in for HttpClient, backed by httpx.
+
+    With ``http2=True``, requests to one host share a single multiplexed
+    connection. httpx errors are raised as the matching requests
+    exceptions, so HttpClient's retry classification applies unchanged.
+
+    Parameters
+    ----------
+    config : TransportConfig | None
+        Pool size, keep-alive and HTTP/2 settings.
+    """
+
+    def __init__(self, config: TransportConfig | None = None) -> None:
+        """Create the httpx client."""
+        from .async_client import _import_httpx
+
+        self.config = config or TransportConfig(http2=True)
+        self._httpx = httpx = _import_httpx()
+        keepalive = self.config.pool_maxsize if self.config.keepalive else 0
+        try:
+            self._client = httpx.Client(
+                http2=self.config.http2,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.config.pool_connections * self.config.pool_maxsize,
+                    max_keepalive_connections=keepalive,
+                ),
+                transport=httpx.HTTPTransport(
+                    http2=self.config.http2, retries=self.config.connect_retries
+                ),
+            )
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise ImportError(
+                "HTTP/2 requires h2; install it with: pip install 'civic-paperkit[http2]'"
+            ) from exc
+
+    def _translate(self, exc: Exception) -> Exception:
+        httpx = self._httpx
+        if isinstance(exc, requests.RequestException):
+            return exc
+        if isinstance(exc, httpx.TimeoutException):
+            return requests.Timeout(str(exc))
+        if isinstance(exc, httpx.UnsupportedProtocol | httpx.InvalidURL):
+            return requests.exceptions.InvalidURL(str(exc))
+        if isinstance(exc, httpx.ReadError | httpx.RemoteProtocolError | httpx.DecodingError):
+            return requests.exceptions.ChunkedEncodingError(str(exc))
+        if isinstance(exc, httpx.TransportError):
+            return requests.ConnectionError(str(exc))
+        return exc
+
+    @staticmethod
+    def _trace(event: str, info: dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            note_connection()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        timeout: float | None,
+        headers: dict[str, str] | None,
+        stream: bool,
+    ) -> _HttpxResponse:
+        req = self._client.build_request(
+            method, url, headers=headers, timeout=timeout, extensions={"trace": self._trace}
+        )
+        try:
+            resp = self._client.send(req, stream=stream)
+        except (self._httpx.HTTPError, self._httpx.InvalidURL) as exc:
+            raise self._translate(exc) from exc
+        if resp.http_version != "HTTP/1.1":
+            logger.debug("%s %s", resp.http_version, url)
+        return _HttpxResponse(resp, self._translate)
+
+    def get(
+        self,
+        url: str,
+        *,
+        timeout: float | None = None,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+    ) -> _HttpxResponse:
+        """Send a GET and return a requests-like response.
+
+        Parameters
+        ----------
+        url : str
+            The URL to fetch.
+        timeout : float | None
+            Timeout in seconds.
+        headers : dict[str, str] | None
+            Request headers.
+        stream : bool
+            Leave the body unread so it can be consumed with iter_content.
+
+        Returns
+        -------
+        _HttpxResponse
+            A response with status_code, headers, content, text,
+            iter_content, raise_for_status and close.
+        """
+        return self._send("GET", url, timeout, headers, stream)
+
+    def head(
+        self,
+        url: str,
+        *,
+        timeout: float | None = None,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+        allow_redirects: bool = True,
+    ) -> _HttpxResponse:
+        """Send a HEAD and return a requests-like response (redirects are always followed)."""
+        return self._send("HEAD", url, timeout, headers, stream)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self._client.close()
+
+
+def new_session(config: TransportConfig | None = None) -> Any:
+    """Return a session for HttpClient built from a TransportConfig.
+
+    Parameters
+    ----------
+    config : TransportConfig | None
+        Transport settings (default: TransportConfig()).
+
+    Returns
+    -------
+    requests.Session | HttpxSession
+        A requests session with a TunedAdapter mounted for http and https,
+        or an HttpxSession when ``config.http2`` is set.
+    """
+    config = config or TransportConfig()
+    if config.http2:
+        return HttpxSession(config)
+    session = requests.Session()
+    adapter = TunedAdapter(config)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not config.keepalive:
+        session.headers["Connection"] = "close"
+    return session
@@ -0,0 +1,223 @@
+"""Offline verification of a downloaded output tree.
+
+This module provides:
+- hash_file: SHA256 of a file using mmap for large files and big reads otherwise
+- FileCheck: Outcome of checking one file against its expected digests
+- VerifyReport: All checks of one verify run, with counts and a failure flag
+- verify_tree: Hash every file under an output root in parallel and compare
+  the digests with the manifest and the ``checksum`` values in refs_meta
+
+No network access is needed. Files are hashed on a thread pool by default;
+hashlib releases the GIL while hashing large buffers, so threads use all
+cores. A process pool can be used instead where it helps.
+
+File: src/civic_interconnect/paperkit/verify.py
+"""
+
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+import hashlib
+import mmap
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Any, Literal
+
+from .config import STATE_DIR_NAME, load_meta
+from .download import PART_SUFFIX
+from .log import logger
+from .manifest import Manifest
+from .orchestrate import guess_filename_from_url
+
+VERIFY_CHUNK_SIZE: int = 8 * 1024 * 1024
+MMAP_THRESHOLD: int = 64 * 1024 * 1024
+
+CheckStatus = Literal["ok", "mismatch", "missing", "unrecorded", "error"]
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA256 hexadecimal digest of a file.
+
+    Files of at least MMAP_THRESHOLD bytes are memory-mapped and hashed in
+    one call; smaller files are read in VERIFY_CHUNK_SIZE blocks.
+
+    Parameters
+    ----------
+    path : Path
+        The file to hash.
+
+    Returns
+    -------
+    str
+        The SHA256 hexadecimal digest.
+    """
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                h.update(m)
+        else:
+            while chunk := f.read(VERIFY_CHUNK_SIZE):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class FileCheck:
+    """Result of verifying one file.
+
+    Attributes
+    ----------
+    path : str
+        Path of the file, relative to the output root.
+    status : CheckStatus
+        "ok" (matches every expected digest), "mismatch", "missing" (expected
+        but not on disk), "unrecorded" (on disk with nothing to compare) or
+        "error" (could not be read).
+    sha256 : str | None
+        Digest computed from the file on disk.
+    expected : dict[str, str]
+        Expected digest by source ("manifest", "meta").
+    error : str | None
+        The read error, for status "error".
+    """
+
+    path: str
+    status: CheckStatus
+    sha256: str | None = None
+    expected: dict[str, str] = field(default_factory=dict)
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+
+@dataclass
+class VerifyReport:
+    """All file checks of one verify run, sorted by path."""
+
+    checks: list[FileCheck] = field(default_factory=list)
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of files per status."""
+        out: dict[str, int] = {}
+        for c in self.checks:
+            out[c.status] = out.get(c.status, 0) + 1
+        return out
+
+    @property
+    def failed(self) -> bool:
+        """True if any file is mismatched, missing or unreadable."""
+        return any(c.status in ("mismatch", "missing", "error") for c in self.checks)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {"counts": self.counts(), "checks": [c.to_dict() for c in self.checks]}
+
+
+def _walk(out_root: Path) -> Iterator[Path]:
+    """Yield saved files under the output root, skipping state and partial files."""
+    for dirpath, dirnames, filenames in os.walk(out_root):
+        if Path(dirpath) == out_root and STATE_DIR_NAME in dirnames:
+            dirnames.remove(STATE_DIR_NAME)
+        for name in filenames:
+            if name.endswith((PART_SUFFIX, PART_SUFFIX + ".json", ".tmp")):
+                continue
+            yield Path(dirpath) / name
+
+
+def _meta_checksums(out_root: Path, meta_path: Path) -> dict[Path, str]:
+    """Map the saved path of each direct asset with a checksum to that checksum."""
+    out: dict[Path, str] = {}
+    for key, entry_meta in load_meta(meta_path).items():
+        entry = entry_meta or {}
+        out_dir = out_root / key / (entry.get("out_dir") or ".")
+        for a in entry.get("assets", []):
+            if "url" not in a:
+                continue
+            checksum = a.get("checksum")
+            if checksum:
+                fname = a.get("filename") or guess_filename_from_url(a["url"])
+                out[out_dir / fname] = checksum.lower()
+    return out
+
+
+def _relative(out_root: Path, path: Path) -> str:
+    try:
+        return path.relative_to(out_root).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _check(rel: str, digest: str | None, expected: dict[str, str]) -> FileCheck:
+    if digest is None:
+        return FileCheck(rel, "missing", expected=expected)
+    if not expected:
+        return FileCheck(rel, "unrecorded", sha256=digest)
+    ok = all(v == digest for v in expected.values())
+    return FileCheck(rel, "ok" if ok else "mismatch", sha256=digest, expected=expected)
+
+
+def verify_tree(
+    out_root: Path,
+    meta_path: Path | None = None,
+    *,
+    workers: int | None = None,
+    processes: bool = False,
+) -> VerifyReport:
+    """Hash every saved file under an output root and compare it with the records.
+
+    Expected digests come from the manifest under ``<out_root>/.paperkit/``
+    and, when `meta_path` is given, from the ``checksum`` of each direct
+    asset. Files that are expected but absent are reported as missing.
+
+    Parameters
+    ----------
+    out_root : Path
+        Output root of earlier runs.
+    meta_path : Path | None
+        refs_meta.yaml (or a directory of shards) to take checksums from.
+    workers : int | None
+        Number of files hashed at once (default: the CPU count).
+    processes : bool
+        Hash on a process pool instead of a thread pool.
+
+    Returns
+    -------
+    VerifyReport
+        One FileCheck per file, sorted by path.
+    """
+    expected: dict[Path, dict[str, str]] = {}
+    for path, entry in Manifest.load(out_root).items():
+        if entry.sha256:
+            expected.setdefault(path, {})["manifest"] = entry.sha256.lower()
+    if meta_path is not None:
+        for path, digest in _meta_checksums(out_root, meta_path).items():
+            expected.setdefault(path, {})["meta"] = digest
+
+    on_disk = set(_walk(out_root))
+    paths = sorted(on_disk | {p for p in expected if p.is_file()})
+    pool: Executor = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        if processes
+        else ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+    )
+    checks: dict[Path, FileCheck] = {}
+    with pool:
+        futures = {p: pool.submit(hash_file, p) for p in paths}
+        for p, fut in futures.items():
+            rel = _relative(out_root, p)
+            try:
+                checks[p] = _check(rel, fut.result(), expected.get(p, {}))
+            except OSError as exc:
+                checks[p] = FileCheck(rel, "error", expected=expected.get(p, {}), error=str(exc))
+    for p, exp in expected.items():
+        if p not in checks:
+            checks[p] = _check(_relative(out_root, p), None, exp)
+
+    report = VerifyReport([checks[p] for p in sorted(checks)])
+    logger.info("Verified %d files under %s: %s", len(paths), out_root, report.counts())
+    return report
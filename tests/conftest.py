@@ -0,0 +1,33 @@
+from collections.abc import Callable
+from pathlib import Path
+import re
+
+import pytest
+import requests
+
+from civic_interconnect.paperkit.http_client import HttpClient
+
+
+@pytest.fixture
+def write_inputs(tmp_path: Path) -> Callable[..., tuple[Path, Path]]:
+    """Return a writer of refs.bib and refs_meta.yaml under tmp_path.
+
+    Call it with the metadata YAML text; the bibliography gets one entry per
+    top-level metadata key unless `keys` lists them explicitly.
+    """
+
+    def write(meta_yaml: str, keys: list[str] | None = None) -> tuple[Path, Path]:
+        keys = re.findall(r"^(\w+):", meta_yaml, re.MULTILINE) if keys is None else keys
+        bib = tmp_path / "refs.bib"
+        bib.write_text("".join(f"@misc{{{k}, title={{{k}}}}}\n" for k in keys), encoding="utf-8")
+        meta = tmp_path / "refs_meta.yaml"
+        meta.write_text(meta_yaml, encoding="utf-8")
+        return bib, meta
+
+    return write
+
+
+@pytest.fixture
+def client() -> HttpClient:
+    """Return an HttpClient that tries each request once, without backoff."""
+    return HttpClient(session=requests.Session(), retries=1, backoff_seconds=0)
@@ -0,0 +1,85 @@
+import hashlib
+import io
+from pathlib import Path
+import zipfile
+
+import pytest
+import requests
+import responses
+
+from civic_interconnect.paperkit.archive import ExtractPolicy, extract_zip
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.orchestrate import DownloadRecord, run
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+MEMBERS = {"data/a.csv": b"a,b\n1,2\n", "data/b.csv": b"x" * 100_000, "README.txt": b"readme"}
+
+
+def test_extract_zip_filters_members_and_hashes_them(tmp_path: Path):
+    archive = tmp_path / "bundle.zip"
+    archive.write_bytes(_zip(MEMBERS))
+
+    out = extract_zip(archive, ExtractPolicy(include=["data/*"], exclude=["*/b.csv"]))
+
+    assert [(m.name, m.size) for m in out] == [("data/a.csv", 8)]
+    assert out[0].path == tmp_path / "bundle" / "data" / "a.csv"
+    assert out[0].sha256 == hashlib.sha256(MEMBERS["data/a.csv"]).hexdigest()
+    assert out[0].path.read_bytes() == MEMBERS["data/a.csv"]
+    assert not (tmp_path / "bundle" / "README.txt").exists()
+
+
+def test_extract_zip_enforces_size_limit_and_safe_names(tmp_path: Path):
+    archive = tmp_path / "bomb.zip"
+    archive.write_bytes(_zip({"zeros.bin": bytes(1_000_000)}))
+    with pytest.raises(ValueError, match="extraction limit"):
+        extract_zip(archive, ExtractPolicy(max_bytes=1000))
+    assert not (tmp_path / "bomb").exists()
+
+    evil = tmp_path / "evil.zip"
+    evil.write_bytes(_zip({"ok.txt": b"ok", "../escape.txt": b"x"}))
+    with pytest.raises(ValueError, match="unsafe archive member"):
+        extract_zip(evil)
+    assert not (tmp_path / "escape.txt").exists()
+    assert not (tmp_path / "evil" / "ok.txt").exists()
+
+
+@responses.activate
+def test_run_extracts_archives_and_records_members(tmp_path: Path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@misc{alpha, title={A}}\n", encoding="utf-8")
+    meta = tmp_path / "refs_meta.yaml"
+    meta.write_text(
+        "alpha:\n"
+        "  assets:\n"
+        "    - url: https://ex.org/bundle.zip\n"
+        "      extract: true\n"
+        "      extract_include: ['*.csv']\n",
+        encoding="utf-8",
+    )
+    body = _zip(MEMBERS)
+    responses.add(responses.GET, "https://ex.org/bundle.zip", body=body, headers={"ETag": '"z1"'})
+    responses.add(responses.GET, "https://ex.org/bundle.zip", status=304)
+    out = tmp_path / "out"
+    client = HttpClient(session=requests.Session(), retries=1)
+
+    first = run(bib, meta, out, client, extract_jobs=2)
+
+    (rec,) = first.processed
+    assert rec.errors == []
+    assert [m.name for m in rec.extracted] == ["data/a.csv", "data/b.csv"]
+    assert (out / "alpha" / "bundle" / "data" / "b.csv").stat().st_size == 100_000
+    assert DownloadRecord.from_dict(rec.to_dict()) == rec
+
+    second = run(bib, meta, out, client)
+
+    again = second.processed[0].extracted
+    assert [m.reused for m in again] == [True, True]
+    assert [m.sha256 for m in again] == [m.sha256 for m in rec.extracted]
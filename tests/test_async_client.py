@@ -0,0 +1,86 @@
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import threading
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from civic_interconnect.paperkit.async_client import AsyncHttpClient
+from civic_interconnect.paperkit.orchestrate import run_async
+
+FILES = {f"/f{i}.csv": f"id\n{i}\n".encode() for i in range(20)}
+FILES["/page"] = b'<a href="/f1.csv">one</a><a href="/x.txt">x</a>'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    flaky_hits = 0
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/flaky":
+            type(self).flaky_hits += 1
+            if type(self).flaky_hits == 1:
+                self.send_error(503)
+                return
+            body = b"ok"
+        elif self.path in FILES:
+            body = FILES[self.path]
+        else:
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[str]:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    t = threading.Thread(target=httpd.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.mark.asyncio
+async def test_async_get_retries_and_conditional(server: str):
+    async with AsyncHttpClient(retries=2, backoff_seconds=0) as client:
+        resp = await client.get(f"{server}/flaky")
+        assert resp.content == b"ok"
+        resp = await client.get(f"{server}/f0.csv", etag='"v1"')
+        assert resp.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_run_async_downloads_many_assets(tmp_path: Path, server: str):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@misc{alpha, title={A}}\n@misc{beta, title={B}}\n", encoding="utf-8")
+    lines = ["alpha:", "  assets:"]
+    lines += [f"    - url: {server}/f{i}.csv" for i in range(20)]
+    lines += ["    - url: {}/missing.csv".format(server)]
+    lines += ["beta:", "  assets:", f"    - page_url: {server}/page", "      allow_ext: ['.csv']"]
+    meta = tmp_path / "refs_meta.yaml"
+    meta.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    out = tmp_path / "out"
+    async with AsyncHttpClient(retries=1, backoff_seconds=0) as client:
+        summary = await run_async(bib, meta, out, client, concurrency=8, per_host=4)
+
+    alpha, beta = summary.processed
+    assert [p.name for p in alpha.paths] == [f"f{i}.csv" for i in range(20)]
+    assert len(alpha.errors) == 1
+    assert [p.name for p in beta.paths] == ["f1.csv"]
+    assert (out / "alpha" / "f7.csv").read_bytes() == FILES["/f7.csv"]
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from civic_interconnect.paperkit.bib import load_bib_keys
+from civic_interconnect.paperkit.bib import load_bib_keys, scan_bib_entries
 
 
 def test_load_bib_keys(tmp_path: Path):
@@ -8,3 +8,41 @@ def test_load_bib_keys(tmp_path: Path):
     bib.write_text("@article{key1, title={T}}\n@misc{key2, howpublished={x}}", encoding="utf-8")
     keys = load_bib_keys(bib)
     assert set(keys) == {"key1", "key2"}
+
+
+def test_load_bib_keys_scanner_handles_special_blocks(tmp_path: Path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text(
+        "Notes, mail me at someone@example.org\n"
+        "@comment{old @article{gone, title={x}} }\n"
+        '@string{cdc = "CDC {Atlanta}"}\n'
+        '@preamble{"\\newcommand{\\x}{y}"}\n'
+        "@Article{ key1 , title={A {nested {deep}} title}, note=\"q {b} r\"}\n"
+        "@misc(key2, title={paren (x)})\n"
+        "@dataset { key3,\n  title = {Rows}}\n",
+        encoding="utf-8",
+    )
+    assert list(scan_bib_entries(bib)) == [
+        ("article", "key1"),
+        ("misc", "key2"),
+        ("dataset", "key3"),
+    ]
+    assert load_bib_keys(bib) == ["key1", "key2", "key3"]
+
+
+def test_load_bib_keys_matches_full_parse(tmp_path: Path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text(
+        "".join(
+            f"@techreport{{k{i}, title={{T {{{i}}}}}, abstract={{{'x ' * 50}}}}}\n"
+            for i in range(50)
+        ),
+        encoding="utf-8",
+    )
+    assert load_bib_keys(bib) == load_bib_keys(bib, full_parse=True)
+
+
+def test_load_bib_keys_empty_file(tmp_path: Path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("", encoding="utf-8")
+    assert load_bib_keys(bib) == []
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+
+from civic_interconnect.paperkit import config
+from civic_interconnect.paperkit.config import DEFAULT_ALLOWED_EXTS, LazyMeta, load_meta
+
+
+def test_load_meta_parses_only_requested_entries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    meta_path = tmp_path / "refs_meta.yaml"
+    meta_path.write_text(
+        "# shared catalog\n"
+        "k1:\n"
+        "  assets:\n"
+        "    - page_url: https://example.org/?a=1&b=2\n"
+        "      href_regex: '.*\\.csv'\n"
+        '"k 2":\n'
+        "  notes: quoted key\n"
+        "k3: {assets: [{url: 'https://example.org/c.csv'}]}\n",
+        encoding="utf-8",
+    )
+    parsed: list[str] = []
+    real_parse = config._parse_yaml_mapping
+    monkeypatch.setattr(
+        config,
+        "_parse_yaml_mapping",
+        lambda text, source: parsed.append(text) or real_parse(text, source),
+    )
+
+    meta = load_meta(meta_path)
+    assert isinstance(meta, LazyMeta)
+    assert list(meta) == ["k1", "k 2", "k3"]
+    assert parsed == []
+
+    assert meta["k1"]["assets"][0]["allow_ext"] == DEFAULT_ALLOWED_EXTS
+    assert len(parsed) == 1
+    assert meta["k 2"] == {"notes": "quoted key"}
+    assert meta["k3"]["assets"] == [{"url": "https://example.org/c.csv"}]
+
+
+def test_load_meta_directory_of_shards(tmp_path: Path):
+    shards = tmp_path / "meta"
+    (shards / "cdc").mkdir(parents=True)
+    (shards / "a.yaml").write_text("k1:\n  notes: first\nk2:\n  notes: a\n", encoding="utf-8")
+    (shards / "cdc" / "b.yml").write_text("k1:\n  notes: override\n", encoding="utf-8")
+    (shards / "README.md").write_text("not yaml: [", encoding="utf-8")
+
+    meta = load_meta(shards)
+    assert dict(meta) == {"k1": {"notes": "override"}, "k2": {"notes": "a"}}
+
+
+def test_load_meta_with_anchors_is_parsed_eagerly(tmp_path: Path):
+    meta_path = tmp_path / "refs_meta.yaml"
+    meta_path.write_text(
+        "defaults: &d\n  out_dir: tables\nk1:\n  <<: *d\n  notes: x\n", encoding="utf-8"
+    )
+    meta = load_meta(meta_path)
+    assert meta["k1"] == {"out_dir": "tables", "notes": "x"}
+
+
+def test_load_meta_rejects_non_mapping(tmp_path: Path):
+    meta_path = tmp_path / "refs_meta.yaml"
+    meta_path.write_text("- k1\n- k2\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="mapping of bibkeys"):
+        load_meta(meta_path)
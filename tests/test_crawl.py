@@ -0,0 +1,145 @@
+from pathlib import Path
+
+import pytest
+import requests
+import responses
+
+from civic_interconnect.paperkit.crawl import CrawlPolicy, RobotsRules, crawl
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.orchestrate import run
+from civic_interconnect.paperkit.scrape import extract_links
+
+SITE = {
+    "https://ex.org/data": (
+        '<a href="/a.csv">a</a><a href="/tables/">tables</a><a href="/private/x.html">p</a>'
+        '<a href="https://other.org/page">offsite</a><a href="/report.pdf">pdf</a>'
+    ),
+    "https://ex.org/tables/": '<a href="b.csv">b</a><a href="/tables/more.html">more</a>',
+    "https://ex.org/tables/more.html": '<a href="/c.csv">c</a><a href="/data">back</a>',
+    "https://ex.org/private/x.html": '<a href="/secret.csv">s</a>',
+    "https://other.org/page": '<a href="/o.csv">o</a>',
+}
+ROBOTS = "User-agent: *\nDisallow: /private/\nDisallow: /c.csv\n"
+
+
+def _visit(calls: list[str]):
+    def visit(url: str) -> tuple[list[str], list[str]]:
+        calls.append(url)
+        html = SITE[url]
+        return extract_links(html, url, [".csv"], None), extract_links(html, url, [], None)
+
+    return visit
+
+
+def _robots(text: str | None = "User-agent: *\nDisallow: /private/\n", status: int = 200):
+    fetched: list[str] = []
+
+    def fetch(url: str) -> tuple[str | None, int | None]:
+        fetched.append(url)
+        return text, status
+
+    return fetch, fetched
+
+
+def test_depth_limits_and_same_host():
+    calls: list[str] = []
+    fetch, fetched = _robots()
+    found = crawl(
+        "https://ex.org/data",
+        _visit(calls),
+        CrawlPolicy(max_depth=1),
+        robots=RobotsRules(),
+        fetch_robots=fetch,
+    )
+    assert found == ["https://ex.org/a.csv", "https://ex.org/tables/b.csv"]
+    assert calls == ["https://ex.org/data", "https://ex.org/tables/"]
+    assert fetched == ["https://ex.org/robots.txt"]
+
+
+def test_deeper_crawl_visits_each_page_once():
+    calls: list[str] = []
+    found = crawl("https://ex.org/data", _visit(calls), CrawlPolicy(max_depth=5, same_host=False))
+    assert found == [
+        "https://ex.org/a.csv",
+        "https://ex.org/tables/b.csv",
+        "https://ex.org/secret.csv",
+        "https://other.org/o.csv",
+        "https://ex.org/c.csv",
+    ]
+    assert len(calls) == len(set(calls)) == 5
+
+
+def test_follow_regex_and_max_pages():
+    calls: list[str] = []
+    crawl("https://ex.org/data", _visit(calls), CrawlPolicy(max_depth=3, follow_regex=r"/tables/"))
+    assert "https://ex.org/private/x.html" not in calls
+    assert "https://ex.org/tables/more.html" in calls
+
+    calls.clear()
+    crawl("https://ex.org/data", _visit(calls), CrawlPolicy(max_depth=3, max_pages=2))
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(("status", "allowed"), [(403, False), (404, True)])
+def test_robots_failures(status: int, allowed: bool):
+    rules = RobotsRules("paperkit")
+    rules.add("https://ex.org/robots.txt", None, status)
+    assert rules.allowed("https://ex.org/any") is allowed
+    assert rules.allowed("https://unknown.org/any")
+
+
+@responses.activate
+def test_run_crawls_page_assets(tmp_path: Path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@misc{alpha, title={A}}\n", encoding="utf-8")
+    meta = tmp_path / "refs_meta.yaml"
+    meta.write_text(
+        "alpha:\n"
+        "  assets:\n"
+        "    - page_url: https://ex.org/data\n"
+        "      allow_ext: ['.csv']\n"
+        "      max_depth: 2\n",
+        encoding="utf-8",
+    )
+    for url, html in SITE.items():
+        responses.add(responses.GET, url, body=html)
+    responses.add(responses.GET, "https://ex.org/robots.txt", body=ROBOTS)
+    for name in ("a", "b", "c"):
+        responses.add(responses.GET, f"https://ex.org/{name}.csv", body=name)
+    responses.add(responses.GET, "https://ex.org/tables/b.csv", body="b")
+    client = HttpClient(session=requests.Session(), retries=1)
+
+    summary = run(bib, meta, tmp_path / "out", client)
+
+    (rec,) = summary.processed
+    assert rec.errors == []
+    assert [p.name for p in rec.paths] == ["a.csv", "b.csv"]
+    fetched = {c.request.url for c in responses.calls}
+    assert "https://ex.org/private/x.html" not in fetched
+    assert "https://other.org/page" not in fetched
+    assert "https://ex.org/c.csv" not in fetched
+
+
+@responses.activate
+def test_missing_robots_txt_allows_all_without_error_logs(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@misc{alpha, title={A}}\n", encoding="utf-8")
+    meta = tmp_path / "refs_meta.yaml"
+    meta.write_text(
+        "alpha:\n  assets:\n    - page_url: https://ex.org/tables/\n      max_depth: 1\n",
+        encoding="utf-8",
+    )
+    responses.add(responses.GET, "https://ex.org/tables/", body=SITE["https://ex.org/tables/"])
+    responses.add(responses.GET, "https://ex.org/tables/more.html", body="")
+    responses.add(responses.GET, "https://ex.org/robots.txt", status=404)
+    responses.add(responses.GET, "https://ex.org/tables/b.csv", body="b")
+    client = HttpClient(session=requests.Session(), retries=1)
+
+    with caplog.at_level("DEBUG"):
+        summary = run(bib, meta, tmp_path / "out", client)
+
+    assert summary.processed[0].errors == []
+    assert [p.name for p in summary.processed[0].paths] == ["b.csv"]
+    assert not [r for r in caplog.records if r.levelname == "ERROR"]
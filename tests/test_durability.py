@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+import requests
+import responses
+
+from civic_interconnect.paperkit import durability
+from civic_interconnect.paperkit.download import write_bytes, write_chunks
+from civic_interconnect.paperkit.durability import SyncPolicy
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.orchestrate import run
+
+
+@pytest.fixture
+def synced(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, Path]]:
+    calls: list[tuple[str, Path]] = []
+    monkeypatch.setattr(durability, "fsync_path", lambda p: calls.append(("file", Path(p))))
+    monkeypatch.setattr(durability, "fsync_dir", lambda p: calls.append(("dir", Path(p))))
+    return calls
+
+
+def test_write_is_atomic_and_cleans_up_on_error(tmp_path: Path):
+    target = tmp_path / "d" / "a.csv"
+    write_bytes(target, b"old")
+
+    def chunks():
+        yield b"new"
+        raise OSError("connection lost")
+
+    with pytest.raises(OSError, match="connection lost"):
+        write_chunks(target, chunks())
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in target.parent.iterdir()] == ["a.csv"]
+
+
+def test_file_mode_syncs_before_rename(tmp_path: Path, synced: list[tuple[str, Path]]):
+    target = tmp_path / "a.csv"
+    write_bytes(target, b"x", SyncPolicy("file"))
+    (kind, tmp), (dir_kind, d) = synced
+    assert kind == "file"
+    assert tmp.name.startswith("a.csv.")
+    assert tmp.suffix == ".tmp"
+    assert (dir_kind, d) == ("dir", tmp_path)
+
+
+def test_batch_mode_syncs_once_per_directory(tmp_path: Path, synced: list[tuple[str, Path]]):
+    policy = SyncPolicy("batch")
+    for name in ("a", "b", "c"):
+        write_bytes(tmp_path / name, b"x", policy)
+    assert synced == []
+    policy.flush()
+    assert synced == [("file", tmp_path / n) for n in "abc"] + [("dir", tmp_path)]
+    policy.flush()
+    assert len(synced) == 4
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError, match="durability"):
+        SyncPolicy("always")  # type: ignore[arg-type]
+
+
+@responses.activate
+def test_run_batch_flushes_saved_files_and_manifest(tmp_path: Path, synced: list[tuple[str, Path]]):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@misc{alpha, title={A}}\n", encoding="utf-8")
+    meta = tmp_path / "refs_meta.yaml"
+    meta.write_text("alpha:\n  assets:\n    - url: https://ex.org/a.csv\n", encoding="utf-8")
+    responses.add(responses.GET, "https://ex.org/a.csv", body="id\n1\n")
+    client = HttpClient(session=requests.Session(), retries=1, backoff_seconds=0)
+    out = tmp_path / "out"
+
+    run(bib, meta, out, client, durability="batch")
+
+    files = [p for kind, p in synced if kind == "file"]
+    assert out / "alpha" / "a.csv" in files
+    assert out / ".paperkit" / "manifest.json" in files
+    assert ("dir", out / "alpha") in synced
@@ -1,9 +1,11 @@
+import hashlib
 from pathlib import Path
 
+import pytest
 import requests
 import responses
 
-from civic_interconnect.paperkit.download import download_file
+from civic_interconnect.paperkit.download import download_file, write_chunks
 from civic_interconnect.paperkit.http_client import HttpClient
 
 
@@ -17,3 +19,25 @@ def test_download_file(tmp_path: Path):
     p = download_file(client, url, out)
     assert p.exists()
     assert p.read_text() == "x,y\n1,2\n"
+
+
+@responses.activate
+def test_download_file_streams_and_verifies_checksum(tmp_path: Path):
+    url = "https://example.org/big.bin"
+    body = bytes(range(256)) * 20_000  # several chunks
+    responses.add(responses.GET, url, body=body, status=200)
+
+    client = HttpClient(session=requests.Session(), retries=1)
+    good = hashlib.sha256(body).hexdigest()
+    p = download_file(client, url, tmp_path / "big.bin", checksum=good.upper())
+    assert p.read_bytes() == body
+
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        download_file(client, url, tmp_path / "bad.bin", checksum="0" * 64)
+
+
+def test_write_chunks_returns_digest(tmp_path: Path):
+    chunks = [b"ab", b"", b"cd"]
+    digest = write_chunks(tmp_path / "sub" / "x.bin", chunks)
+    assert (tmp_path / "sub" / "x.bin").read_bytes() == b"abcd"
+    assert digest == hashlib.sha256(b"abcd").hexdigest()
@@ -0,0 +1,76 @@
+from collections.abc import Callable
+import os
+from pathlib import Path
+
+import pytest
+
+from civic_interconnect.paperkit import input_cache
+from civic_interconnect.paperkit.input_cache import InputCache
+
+META = "k1:\n  assets:\n    - page_url: https://example.org/\n"
+KEYS = ["k1", "k2"]
+
+
+def test_input_cache_reuses_unchanged_files(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], monkeypatch: pytest.MonkeyPatch
+):
+    bib, meta = write_inputs(META, KEYS)
+    cache_dir = tmp_path / "cache"
+    first = InputCache(cache_dir)
+    assert first.load_bib_keys(bib) == ["k1", "k2"]
+    meta_value = first.load_meta(meta)
+    assert meta_value["k1"]["assets"][0]["allow_ext"]  # normalized before caching
+    assert (first.hits, first.misses) == (0, 2)
+
+    def fail(path: Path) -> None:
+        raise AssertionError(f"parsed {path} again")
+
+    monkeypatch.setattr(input_cache, "load_bib_keys", fail)
+    monkeypatch.setattr(input_cache, "load_meta", fail)
+    second = InputCache(cache_dir)
+    assert second.load_bib_keys(bib) == ["k1", "k2"]
+    assert second.load_meta(meta) == meta_value
+    assert second.hits == 2
+
+    # A new mtime with identical content (e.g. a fresh checkout) is still a hit.
+    st = bib.stat()
+    os.utime(bib, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert InputCache(cache_dir).load_bib_keys(bib) == ["k1", "k2"]
+
+
+def test_input_cache_hit_parses_no_yaml(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], monkeypatch: pytest.MonkeyPatch
+):
+    _, meta = write_inputs(META, KEYS)
+    InputCache(tmp_path / "cache").load_meta(meta)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("YAML parsed on a cache hit")
+
+    yaml = pytest.importorskip("yaml")
+    monkeypatch.setattr(yaml, "load", fail)
+    monkeypatch.setattr(yaml, "safe_load", fail)
+    cached = InputCache(tmp_path / "cache").load_meta(meta)
+    assert cached["k1"]["assets"][0]["page_url"] == "https://example.org/"
+
+
+def test_input_cache_reparses_changed_file(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]]
+):
+    bib, _ = write_inputs(META, KEYS)
+    cache = InputCache(tmp_path / "cache")
+    assert cache.load_bib_keys(bib) == ["k1", "k2"]
+    bib.write_text("@misc{k3, title={C}}\n", encoding="utf-8")
+    assert cache.load_bib_keys(bib) == ["k3"]
+    assert cache.misses == 2
+
+
+def test_input_cache_ignores_corrupt_entry(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]]
+):
+    bib, _ = write_inputs(META, KEYS)
+    cache = InputCache(tmp_path / "cache")
+    cache.load_bib_keys(bib)
+    for entry in (tmp_path / "cache").iterdir():
+        entry.write_bytes(b"not a pickle")
+    assert InputCache(tmp_path / "cache").load_bib_keys(bib) == ["k1", "k2"]
@@ -0,0 +1,92 @@
+from collections.abc import Iterator
+from pathlib import Path
+import time
+
+import pytest
+import requests
+import responses
+
+from civic_interconnect.paperkit import instrument
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.instrument import ProfilerSink, Span, add_sink, remove_sink, span
+from civic_interconnect.paperkit.orchestrate import run
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.ended: list[Span] = []
+
+    def span_started(self, span: Span) -> None:
+        pass
+
+    def span_ended(self, span: Span) -> None:
+        self.ended.append(span)
+
+
+@pytest.fixture
+def recorder() -> Iterator[_Recorder]:
+    rec = _Recorder()
+    add_sink(rec)
+    yield rec
+    remove_sink(rec)
+
+
+def test_span_is_shared_noop_without_sinks():
+    assert span("a", url="x") is span("b")
+    with span("a") as sp:
+        sp.set("bytes", 1)
+    assert instrument._sinks == ()
+
+
+def test_nested_spans_split_self_and_child_time(recorder: _Recorder):
+    with span("outer", url="u") as outer:
+        with span("inner"):
+            time.sleep(0.02)
+        outer.set("bytes", 3)
+    inner_span, outer_span = recorder.ended
+    assert inner_span.parent is outer_span
+    assert outer_span.child_time == inner_span.duration
+    assert outer_span.self_time < outer_span.duration
+    assert outer_span.attributes == {"url": "u", "bytes": 3}
+
+
+def test_span_records_error(recorder: _Recorder):
+    with pytest.raises(KeyError), span("boom"):
+        raise KeyError("x")
+    assert recorder.ended[0].attributes["error"] == "KeyError"
+
+
+@responses.activate
+def test_profiler_aggregates_run_stages(tmp_path: Path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@misc{alpha, title={A}}\n", encoding="utf-8")
+    meta = tmp_path / "refs_meta.yaml"
+    meta.write_text(
+        "alpha:\n"
+        "  assets:\n"
+        "    - url: https://ex.org/a.csv\n"
+        "    - page_url: https://ex.org/page\n"
+        "      allow_ext: ['.txt']\n",
+        encoding="utf-8",
+    )
+    responses.add(responses.GET, "https://ex.org/a.csv", body="id\n1\n")
+    responses.add(responses.GET, "https://ex.org/page", body='<a href="/b.txt">b</a>')
+    responses.add(responses.GET, "https://ex.org/b.txt", body="bb")
+    client = HttpClient(session=requests.Session(), retries=1, backoff_seconds=0)
+    profiler = ProfilerSink()
+
+    add_sink(profiler)
+    try:
+        run(bib, meta, tmp_path / "out", client, jobs=1)
+    finally:
+        remove_sink(profiler)
+
+    stages = profiler.stages
+    assert stages["asset"].count == 3
+    assert stages["http.get"].count == 3
+    assert stages["download.file"].count == 2
+    assert stages["download.file"].bytes == 7
+    assert stages["scrape.extract_links"].count == 1
+    report = profiler.report()
+    assert report.splitlines()[0].startswith("stage")
+    assert "http.get" in report
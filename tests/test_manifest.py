@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import requests
+import responses
+from responses import matchers
+
+from civic_interconnect.paperkit.download import download_file
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.manifest import Manifest, ManifestEntry
+
+
+def test_manifest_round_trip(tmp_path: Path):
+    m = Manifest(tmp_path)
+    m.record(tmp_path / "k" / "a.csv", ManifestEntry(url="u", etag='"1"', size=3, sha256="ab"))
+    m.save()
+
+    loaded = Manifest.load(tmp_path)
+    assert len(loaded) == 1
+    assert loaded.get(tmp_path / "k" / "a.csv") == ManifestEntry(
+        url="u", etag='"1"', size=3, sha256="ab"
+    )
+
+
+def test_manifest_load_ignores_corrupt_file(tmp_path: Path):
+    m = Manifest(tmp_path)
+    m.path.parent.mkdir(parents=True)
+    m.path.write_text("{not json", encoding="utf-8")
+    assert len(Manifest.load(tmp_path)) == 0
+
+
+@responses.activate
+def test_download_file_conditional_get_skips_unchanged(tmp_path: Path):
+    url = "https://example.org/a.csv"
+    out = tmp_path / "a.csv"
+    client = HttpClient(session=requests.Session(), retries=1)
+    manifest = Manifest(tmp_path)
+
+    responses.add(
+        responses.GET,
+        url,
+        body="x\n",
+        headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+    )
+    download_file(client, url, out, manifest=manifest)
+    entry = manifest.get(out)
+    assert entry is not None
+    assert entry.etag == '"v1"'
+    assert entry.size == 2
+
+    responses.replace(
+        responses.GET,
+        url,
+        status=304,
+        match=[
+            matchers.header_matcher(
+                {
+                    "If-None-Match": '"v1"',
+                    "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+                }
+            )
+        ],
+    )
+    download_file(client, url, out, manifest=manifest)
+    assert out.read_text() == "x\n"
+    assert manifest.get(out) == entry
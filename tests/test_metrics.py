@@ -0,0 +1,88 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import requests
+import responses
+
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.metrics import AssetMetrics, totals
+from civic_interconnect.paperkit.orchestrate import DownloadRecord, run
+
+META = (
+    "alpha:\n"
+    "  assets:\n"
+    "    - url: https://ex.org/a.csv\n"
+    "beta:\n"
+    "  assets:\n"
+    "    - page_url: https://ex.org/page\n"
+    "      allow_ext: ['.csv']\n"
+)
+
+
+@responses.activate
+def test_run_records_per_asset_metrics(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]]
+):
+    bib, meta = write_inputs(META)
+    responses.add(responses.GET, "https://ex.org/a.csv", status=503)
+    responses.add(responses.GET, "https://ex.org/a.csv", body="id\n1\n", headers={"ETag": '"a"'})
+    page = '<a href="/a.csv">same</a><a href="/b.csv">b</a>'
+    responses.add(responses.GET, "https://ex.org/page", body=page)
+    responses.add(responses.GET, "https://ex.org/b.csv", body="b\n")
+    streamed: list[tuple[str, str]] = []
+    client = HttpClient(session=requests.Session(), retries=2, backoff_seconds=0)
+
+    summary = run(
+        bib, meta, tmp_path / "out", client, on_asset=lambda k, m: streamed.append((k, m.url))
+    )
+
+    alpha, beta = summary.processed
+    (a,) = alpha.metrics
+    assert (a.status, a.bytes, a.requests, a.retries, a.cache) == (200, 5, 2, 1, "miss")
+    assert a.ttfb_seconds is not None
+    assert a.duration_seconds >= a.ttfb_seconds
+    assert a.path == str(tmp_path / "out" / "alpha" / "a.csv")
+    assert [m.url for m in beta.metrics] == [
+        "https://ex.org/page",
+        "https://ex.org/a.csv",
+        "https://ex.org/b.csv",
+    ]
+    assert beta.metrics[0].path is None
+    assert beta.metrics[0].bytes == len(page)
+    assert sorted(streamed) == sorted(
+        [("alpha", "https://ex.org/a.csv")] + [("beta", m.url) for m in beta.metrics]
+    )
+    assert DownloadRecord.from_dict(alpha.to_dict()) == alpha
+
+    agg = totals(m for rec in summary.processed for m in rec.metrics)
+    assert agg["fetches"] == 4
+    assert agg["errors"] == 0
+    assert agg["hosts"]["ex.org"]["bytes"] == agg["bytes"]
+
+
+@responses.activate
+def test_metrics_record_not_modified_and_errors(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(
+        "alpha:\n  assets:\n    - url: https://ex.org/a.csv\n"
+        "beta:\n  assets:\n    - url: https://ex.org/gone.csv\n"
+    )
+    responses.add(responses.GET, "https://ex.org/a.csv", body="id\n1\n", headers={"ETag": '"a"'})
+    responses.add(responses.GET, "https://ex.org/gone.csv", status=404)
+    run(bib, meta, tmp_path / "out", client)
+
+    responses.replace(responses.GET, "https://ex.org/a.csv", status=304)
+    summary = run(bib, meta, tmp_path / "out", client)
+
+    (a,) = summary.processed[0].metrics
+    assert (a.status, a.cache, a.bytes) == (304, "not_modified", 0)
+    (gone,) = summary.processed[1].metrics
+    assert gone.status == 404
+    assert gone.error is not None
+    assert totals([a, gone])["cache"] == {"not_modified": 1, "miss": 1}
+
+
+def test_asset_metrics_from_dict_ignores_unknown_keys():
+    m = AssetMetrics.from_dict({"url": "u", "bytes": 3, "future_field": 1})
+    assert m == AssetMetrics(url="u", bytes=3)
@@ -38,3 +38,41 @@ def test_run_downloads_direct_and_scraped(tmp_path: Path):
     saved = [str(p) for rec in summary.processed for p in rec.paths]
     assert any(p.replace("\\", "/").endswith("alpha/a.csv") for p in saved)
     assert any(p.replace("\\", "/").endswith("beta/data.csv") for p in saved)
+
+
+@responses.activate
+def test_run_concurrent_matches_sequential_order(tmp_path: Path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@misc{alpha, title={A}}\n@misc{beta, title={B}}\n", encoding="utf-8")
+    meta = tmp_path / "refs_meta.yaml"
+    meta.write_text(
+        "alpha:\n"
+        "  assets:\n"
+        "    - url: https://ex.org/a1.csv\n"
+        "    - url: https://ex.org/missing.csv\n"
+        "    - url: https://other.org/a2.csv\n"
+        "beta:\n"
+        "  assets:\n"
+        "    - url: https://ex.org/b1.csv\n",
+        encoding="utf-8",
+    )
+    for name in ("a1", "b1"):
+        responses.add(responses.GET, f"https://ex.org/{name}.csv", body="x\n", status=200)
+    responses.add(responses.GET, "https://other.org/a2.csv", body="y\n", status=200)
+    responses.add(responses.GET, "https://ex.org/missing.csv", status=404)
+
+    client = HttpClient(session=requests.Session(), retries=1)
+    seq = run(bib, meta, tmp_path / "seq", client)
+    par = run(bib, meta, tmp_path / "par", client, jobs=4, per_host=2)
+
+    def shape(summary, root: Path):
+        return [
+            (r.bibkey, [p.relative_to(root).as_posix() for p in r.paths], len(r.errors))
+            for r in summary.processed
+        ]
+
+    assert shape(seq, tmp_path / "seq") == shape(par, tmp_path / "par")
+    assert shape(par, tmp_path / "par") == [
+        ("alpha", ["alpha/a1.csv", "alpha/a2.csv"], 1),
+        ("beta", ["beta/b1.csv"], 0),
+    ]
@@ -0,0 +1,80 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import responses
+
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.orchestrate import run
+from civic_interconnect.paperkit.page_cache import PageCache
+
+PAGE = '<a href="/a.csv">a</a><a href="/b.pdf">b</a>'
+
+
+META = "alpha:\n  assets:\n    - page_url: https://ex.org/page\n      allow_ext: ['.csv']\n"
+
+
+@responses.activate
+def test_fresh_page_skips_fetch_and_parse(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(META)
+    page = responses.add(responses.GET, "https://ex.org/page", body=PAGE, headers={"ETag": '"p1"'})
+    responses.add(responses.GET, "https://ex.org/a.csv", body="a\n")
+    out = tmp_path / "out"
+
+    run(bib, meta, out, client, page_cache=PageCache(tmp_path / "pages"))
+    cache = PageCache(tmp_path / "pages")
+    summary = run(bib, meta, out, client, page_cache=cache)
+
+    assert page.call_count == 1
+    assert (cache.hits, cache.misses, cache.link_hits) == (1, 0, 1)
+    assert summary.processed[0].paths == [out / "alpha" / "a.csv"]
+    assert summary.processed[0].metrics[0].cache == "hit"
+
+
+@responses.activate
+def test_stale_page_is_revalidated(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(META)
+    responses.add(responses.GET, "https://ex.org/page", body=PAGE, headers={"ETag": '"p1"'})
+    revalidate = responses.add(
+        responses.GET,
+        "https://ex.org/page",
+        status=304,
+        match=[responses.matchers.header_matcher({"If-None-Match": '"p1"'})],
+    )
+    responses.add(responses.GET, "https://ex.org/a.csv", body="a\n")
+    out = tmp_path / "out"
+
+    run(bib, meta, out, client, page_cache=PageCache(tmp_path / "pages", ttl_seconds=0))
+    cache = PageCache(tmp_path / "pages", ttl_seconds=0)
+    summary = run(bib, meta, out, client, page_cache=cache)
+
+    assert revalidate.call_count == 1
+    assert (cache.revalidated, cache.misses, cache.link_hits) == (1, 0, 1)
+    assert summary.processed[0].metrics[0].cache == "not_modified"
+
+
+def test_links_memo_is_keyed_by_content_and_filters(tmp_path: Path):
+    cache = PageCache(tmp_path)
+
+    class Resp:
+        def __init__(self, text: str) -> None:
+            self.text = text
+            self.content = text.encode("utf-8")
+            self.headers: dict[str, str] = {}
+
+    page = cache.store("https://ex.org/p", Resp(PAGE))
+    assert cache.links(page, "https://ex.org/p", [".csv"], None) == ["https://ex.org/a.csv"]
+    assert cache.links(page, "https://ex.org/p", [".pdf"], None) == ["https://ex.org/b.pdf"]
+    assert cache.links(page, "https://mirror.org/", [".CSV"], None) == ["https://mirror.org/a.csv"]
+    assert cache.link_hits == 0
+
+    reloaded, fresh = PageCache(tmp_path).lookup("https://EX.org/p")
+    assert fresh and reloaded is not None
+    assert cache.links(reloaded, "https://ex.org/p", [".csv"], None) == ["https://ex.org/a.csv"]
+    assert cache.link_hits == 1
+
+    changed = cache.store("https://ex.org/p", Resp('<a href="/c.csv">c</a>'))
+    assert cache.links(changed, "https://ex.org/p", [".csv"], None) == ["https://ex.org/c.csv"]
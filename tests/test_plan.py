@@ -0,0 +1,140 @@
+from collections.abc import Callable
+import json
+from pathlib import Path
+
+import pytest
+import responses
+
+from civic_interconnect.paperkit.cli import main
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.manifest import Manifest, ManifestEntry
+from civic_interconnect.paperkit.orchestrate import plan
+
+PAGE = """<html><body>
+<a href="/files/2020/data.csv">2020</a>
+<a href="/files/2021/DATA.csv">2021</a>
+<a href="/about.html">about</a>
+</body></html>"""
+
+
+META = (
+    "alpha:\n"
+    "  assets:\n"
+    "    - url: https://ex.org/a.csv\n"
+    "    - soda_url: https://data.ex.gov/resource/abcd-1234.json\n"
+    "beta:\n"
+    "  assets:\n"
+    "    - page_url: https://ex.org/beta/\n"
+)
+
+
+def _site() -> None:
+    responses.add(
+        responses.HEAD, "https://ex.org/a.csv", headers={"Content-Length": "2048", "ETag": '"a1"'}
+    )
+    responses.add(responses.GET, "https://ex.org/beta/", body=PAGE)
+    responses.add(
+        responses.HEAD, "https://ex.org/files/2020/data.csv", headers={"Content-Length": "10"}
+    )
+    responses.add(responses.HEAD, "https://ex.org/files/2021/DATA.csv", status=405)
+    responses.add(
+        responses.GET,
+        "https://ex.org/files/2021/DATA.csv",
+        body="x" * 30,
+        headers={"Content-Length": "30"},
+    )
+
+
+@responses.activate
+def test_plan_resolves_urls_paths_and_sizes_without_writing(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(META)
+    _site()
+    out = tmp_path / "out"
+
+    result = plan(bib, meta, out, client, jobs=4)
+
+    assert [(a.bibkey, a.kind) for a in result.assets] == [
+        ("alpha", "direct"),
+        ("alpha", "socrata"),
+        ("beta", "page"),
+    ]
+    direct, soda, page = result.assets
+    assert direct.files[0].path == out / "alpha" / "a.csv"
+    assert (direct.files[0].head.size, direct.files[0].head.etag) == (2048, '"a1"')
+    assert soda.files[0].url == "https://data.ex.gov/resource/abcd-1234.csv"
+    assert soda.files[0].head is None
+    assert [f.head.size for f in page.files] == [10, 30]
+    (collision,) = result.collisions
+    assert collision.path == out / "beta" / "data.csv"
+    assert len(collision.urls) == 2
+    totals = result.totals()
+    assert (totals["files"], totals["bytes"], totals["unknown_sizes"]) == (4, 2088, 1)
+    assert result.failed
+    assert not out.exists()
+
+
+@responses.activate
+def test_plan_marks_files_matching_the_manifest_unchanged(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(META)
+    _site()
+    out = tmp_path / "out"
+    saved = out / "alpha" / "a.csv"
+    saved.parent.mkdir(parents=True)
+    saved.write_text("old", encoding="utf-8")
+    manifest = Manifest.load(out)
+    manifest.record(saved, ManifestEntry(url="https://ex.org/a.csv", etag='"a1"', size=2048))
+    manifest.save()
+
+    result = plan(bib, meta, out, client)
+
+    assert result.assets[0].files[0].unchanged
+    assert result.totals()["bytes_to_fetch"] == 40
+
+
+@responses.activate
+def test_cli_plan_emits_json_and_fails_on_collisions(
+    tmp_path: Path,
+    write_inputs: Callable[..., tuple[Path, Path]],
+    capsys: pytest.CaptureFixture[str],
+):
+    bib, meta = write_inputs(META)
+    _site()
+    out = tmp_path / "out"
+
+    code = main(["plan", "--bib", str(bib), "--meta", str(meta), "--out", str(out), "--json", "-"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert code == 1
+    assert [e["bibkey"] for e in report["entries"]] == ["alpha", "beta"]
+    assert report["collisions"][0]["path"] == str(out / "beta" / "data.csv")
+    assert report["totals"]["collisions"] == 1
+    assert not out.exists()
+
+
+@responses.activate
+def test_cli_plan_accepts_the_fetch_selection_options(
+    tmp_path: Path,
+    write_inputs: Callable[..., tuple[Path, Path]],
+    capsys: pytest.CaptureFixture[str],
+):
+    bib, meta = write_inputs(META)
+    _site()
+    out = tmp_path / "out"
+    cache_dir = tmp_path / "cache"
+
+    code = main(
+        ["plan", "--bib", str(bib), "--meta", str(meta), "--out", str(out)]
+        + ["--asset-type", "direct", "--asset-type", "socrata", "--host", "*ex.*"]
+        + ["--exclude-host", "data.ex.gov", "--cache-dir", str(cache_dir), "--json", "-"]
+    )
+
+    report = json.loads(capsys.readouterr().out)
+    assert code == 0
+    assert [e["bibkey"] for e in report["entries"]] == ["alpha"]
+    assert [a["kind"] for a in report["entries"][0]["assets"]] == ["direct"]
+    assert [c.request.url for c in responses.calls] == ["https://ex.org/a.csv"]
+    assert any(cache_dir.iterdir())
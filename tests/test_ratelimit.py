@@ -0,0 +1,83 @@
+import pytest
+import requests
+import responses
+
+from civic_interconnect.paperkit import http_client as http_client_mod
+from civic_interconnect.paperkit.cli import main
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.ratelimit import (
+    HostRateLimiter,
+    TokenBucket,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(rate=10.0, capacity=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[0] == 0.0
+    assert waits[1] == 0.0
+    assert waits[2] == pytest.approx(0.1, abs=0.02)
+    assert waits[3] == pytest.approx(0.2, abs=0.02)
+
+
+def test_token_bucket_resumes_at_rate_after_pause():
+    bucket = TokenBucket(rate=10.0, capacity=5)
+    bucket.pause(1.0)
+    waits = [bucket.reserve() for _ in range(4)]
+    for i, wait in enumerate(waits):
+        assert wait == pytest.approx(1.0 + 0.1 * i, abs=0.02)
+
+
+@pytest.mark.parametrize("rate", ["0", "-1", "nan", "fast"])
+def test_cli_rejects_non_positive_rate(rate: str, capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit) as exc:
+        main(["--rate", rate])
+    assert exc.value.code == 2
+    assert "--rate" in capsys.readouterr().err
+
+
+def test_host_rate_limiter_validates_rate_up_front():
+    with pytest.raises(ValueError, match="rate must be positive"):
+        HostRateLimiter(0)
+
+
+def test_parse_retry_after_seconds_and_date():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_delay_grows_and_respects_retry_after():
+    assert 1.0 <= backoff_delay(1, 2.0) <= 2.0
+    assert 4.0 <= backoff_delay(3, 2.0) <= 8.0
+    assert backoff_delay(10, 2.0, cap=5.0) <= 5.0
+    assert backoff_delay(1, 0.0, cap=60.0, retry_after=12.0) == 12.0
+
+
+@responses.activate
+def test_http_client_does_not_retry_404(monkeypatch: pytest.MonkeyPatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(http_client_mod.time, "sleep", sleeps.append)
+    responses.add(responses.GET, "https://ex.org/gone", status=404)
+
+    client = HttpClient(session=requests.Session(), retries=3)
+    with pytest.raises(requests.HTTPError):
+        client.get("https://ex.org/gone")
+    assert len(responses.calls) == 1
+    assert sleeps == []
+
+
+@responses.activate
+def test_http_client_honors_retry_after(monkeypatch: pytest.MonkeyPatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(http_client_mod.time, "sleep", sleeps.append)
+    url = "https://ex.org/busy"
+    responses.add(responses.GET, url, status=429, headers={"Retry-After": "9"})
+    responses.add(responses.GET, url, body="ok")
+
+    client = HttpClient(session=requests.Session(), retries=3, backoff_seconds=1)
+    assert client.get(url).text == "ok"
+    assert sleeps == [9.0]
@@ -0,0 +1,105 @@
+from pathlib import Path
+import threading
+import time
+
+import requests
+import responses
+
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.request_cache import RequestCache, normalize_url
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Ex.ORG:443/a?b=1#frag") == "https://ex.org/a?b=1"
+    assert normalize_url("http://ex.org") == "http://ex.org/"
+    assert normalize_url("http://ex.org:8080/x") == "http://ex.org:8080/x"
+    assert normalize_url("https://u:p1@ex.org/x") != normalize_url("https://u:p2@ex.org/x")
+
+
+@responses.activate
+def test_client_cache_fetches_each_url_once(tmp_path: Path):
+    responses.add(responses.GET, "https://ex.org/page", body="<a href='x.csv'>x</a>")
+    cache = RequestCache()
+    client = HttpClient(session=requests.Session(), retries=1, cache=cache)
+
+    first = client.get("https://ex.org/page")
+    second = client.get("https://EX.org/page#top")
+    streamed = client.get("https://ex.org/page", stream=True)
+
+    assert first.text == second.text == "<a href='x.csv'>x</a>"
+    assert b"".join(streamed.iter_content(4)) == first.content
+    assert len(responses.calls) == 2  # streamed downloads bypass the cache
+    assert cache.hits == 1
+
+
+def test_concurrent_callers_share_in_flight_request():
+    calls = 0
+    started = threading.Event()
+
+    def load(validators: dict[str, str]) -> requests.Response:
+        nonlocal calls
+        calls += 1
+        started.set()
+        time.sleep(0.05)
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = b"body"
+        resp.url = "https://ex.org/slow"
+        return resp
+
+    cache = RequestCache()
+    results: list[bytes] = []
+
+    def worker() -> None:
+        results.append(cache.fetch("https://ex.org/slow", load).content)
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == 1
+    assert results == [b"body"] * 5
+
+
+@responses.activate
+def test_cache_persists_to_disk(tmp_path: Path):
+    responses.add(responses.GET, "https://ex.org/data.csv", body="a,b\n")
+    client = HttpClient(session=requests.Session(), retries=1, cache=RequestCache(tmp_path))
+    client.get("https://ex.org/data.csv")
+
+    cache = RequestCache(tmp_path, max_age=3600)
+    fresh = HttpClient(session=requests.Session(), retries=1, cache=cache)
+    assert fresh.get("https://ex.org/data.csv").text == "a,b\n"
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_stale_disk_entries_are_revalidated(tmp_path: Path):
+    url = "https://ex.org/page"
+    responses.add(responses.GET, url, body="v1", headers={"ETag": '"1"'})
+    responses.add(responses.GET, url, status=304)
+    responses.add(responses.GET, "https://ex.org/plain", body="p1")
+    responses.add(responses.GET, "https://ex.org/plain", body="p2")
+    first = HttpClient(session=requests.Session(), retries=1, cache=RequestCache(tmp_path))
+    first.get(url)
+    first.get("https://ex.org/plain")
+
+    cache = RequestCache(tmp_path)
+    later = HttpClient(session=requests.Session(), retries=1, cache=cache)
+
+    assert later.get(url).text == "v1"
+    assert responses.calls[2].request.headers["If-None-Match"] == '"1"'
+    assert later.get("https://ex.org/plain").text == "p2"  # no validators: fetched again
+    assert cache.revalidated == 1
+    assert later.get(url).text == "v1"
+    assert len(responses.calls) == 4
+
+
+@responses.activate
+def test_conditional_requests_bypass_cache():
+    responses.add(responses.GET, "https://ex.org/a", body="x")
+    client = HttpClient(session=requests.Session(), retries=1, cache=RequestCache())
+    client.get("https://ex.org/a")
+    client.get("https://ex.org/a", etag='"1"')
+    assert len(responses.calls) == 2
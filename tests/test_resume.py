@@ -0,0 +1,102 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+import requests
+import responses
+from responses import matchers
+
+from civic_interconnect.paperkit.download import download_file
+from civic_interconnect.paperkit.http_client import HttpClient
+
+BODY = bytes(range(256)) * 64
+
+
+class _FlakyResponse:
+    def __init__(self, status: int, headers: dict[str, str], body: bytes, fail_after: int | None):
+        self.status_code = status
+        self.headers = headers
+        self._body = body
+        self._fail_after = fail_after
+
+    def iter_content(self, chunk_size: int = 1):
+        sent = 0
+        while sent < len(self._body):
+            if self._fail_after is not None and sent >= self._fail_after:
+                raise requests.ConnectionError("connection reset")
+            step = min(1000, len(self._body) - sent)
+            yield self._body[sent : sent + step]
+            sent += step
+
+    def close(self) -> None:
+        pass
+
+
+class _FlakyClient:
+    """Serves BODY, dropping the connection after 3000 bytes on the first request."""
+
+    retries = 3
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, object]] = []
+
+    def get(self, url: str, **kw: object) -> _FlakyResponse:
+        self.calls.append(kw)
+        base = {"Accept-Ranges": "bytes", "ETag": '"abc"'}
+        start = kw.get("range_start")
+        if start is None:
+            headers = {**base, "Content-Length": str(len(BODY))}
+            return _FlakyResponse(200, headers, BODY, fail_after=3000)
+        assert isinstance(start, int)
+        headers = {**base, "Content-Range": f"bytes {start}-{len(BODY) - 1}/{len(BODY)}"}
+        return _FlakyResponse(206, headers, BODY[start:], fail_after=None)
+
+
+def test_interrupted_download_resumes_with_range(tmp_path: Path):
+    client = _FlakyClient()
+    out = tmp_path / "big.bin"
+    download_file(client, "https://ex.org/big.bin", out, hashlib.sha256(BODY).hexdigest())
+
+    assert out.read_bytes() == BODY
+    assert [c.get("range_start") for c in client.calls] == [None, 3000]
+    assert client.calls[1]["if_range"] == '"abc"'
+    assert not (tmp_path / "big.bin.part").exists()
+
+
+@responses.activate
+def test_leftover_part_file_is_resumed(tmp_path: Path):
+    url = "https://ex.org/big.bin"
+    out = tmp_path / "big.bin"
+    out.write_bytes(b"old contents")
+    part = tmp_path / "big.bin.part"
+    part.write_bytes(BODY[:5000])
+    (tmp_path / "big.bin.part.json").write_text(
+        json.dumps({"url": url, "validator": '"abc"'}), encoding="utf-8"
+    )
+    responses.add(
+        responses.GET,
+        url,
+        status=206,
+        body=BODY[5000:],
+        headers={"Content-Range": f"bytes 5000-{len(BODY) - 1}/{len(BODY)}"},
+        match=[matchers.header_matcher({"Range": "bytes=5000-", "If-Range": '"abc"'})],
+    )
+
+    client = HttpClient(session=requests.Session(), retries=1)
+    download_file(client, url, out)
+    assert out.read_bytes() == BODY
+    assert not part.exists()
+
+
+@responses.activate
+def test_short_body_keeps_existing_file(tmp_path: Path):
+    url = "https://ex.org/short.bin"
+    out = tmp_path / "short.bin"
+    out.write_bytes(b"previous")
+    responses.add(responses.GET, url, body=b"abc", headers={"Content-Length": "10"})
+
+    client = HttpClient(session=requests.Session(), retries=1)
+    with pytest.raises((ValueError, requests.RequestException)):
+        download_file(client, url, out)
+    assert out.read_bytes() == b"previous"
@@ -0,0 +1,33 @@
+import threading
+import time
+
+from civic_interconnect.paperkit.scheduler import HostLimiter, map_ordered
+
+
+def test_map_ordered_preserves_input_order():
+    def slow_square(x: int) -> int:
+        time.sleep(0.01 * (5 - x))
+        return x * x
+
+    assert map_ordered(slow_square, range(5), jobs=4) == [0, 1, 4, 9, 16]
+
+
+def test_host_limiter_caps_concurrency_per_host():
+    limiter = HostLimiter(per_host=2)
+    lock = threading.Lock()
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    def fetch(url: str) -> None:
+        host = url.split("/")[2]
+        with limiter.slot(url):
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+
+    urls = [f"https://a.org/{i}" for i in range(6)] + [f"https://b.org/{i}" for i in range(6)]
+    map_ordered(fetch, urls, jobs=8)
+    assert peak == {"a.org": 2, "b.org": 2}
@@ -1,4 +1,6 @@
-from civic_interconnect.paperkit.scrape import extract_links
+import pytest
+
+from civic_interconnect.paperkit.scrape import extract_links, iter_hrefs
 
 HTML = """
 <html>
@@ -17,3 +19,35 @@ def test_extract_links_filters_by_ext():
         "https://example.org/files/data1.csv",
         "https://example.org/files/report.pdf",
     ]
+
+
+EDGE_HTML = """
+<a href>bare</a>
+<a href="">empty</a>
+<A HREF="/Files/UPPER.CSV">upper</A>
+<a href="first.csv" href="second.pdf">duplicate</a>
+<a href="  spaced.csv  ">spaced</a>
+<script>document.write('<a href="/inline.csv">x</a>')</script>
+<a href="data.csv?x=1#frag">query</a>
+<a href="folder.csv/">trailing slash</a>
+<a href="?page=2">query only</a>
+<a href="../up/report.pdf">parent</a>
+<a href="https://other.org/t.csv">absolute</a>
+<a href="data.csv?x=1">dupe</a>
+<a href="&amp;amp.csv">entity</a>
+"""
+
+
+@pytest.mark.parametrize("base", ["https://example.org/dir/page.html", "https://example.org/x.csv"])
+@pytest.mark.parametrize("allow", [[".csv", ".pdf"], [], [".CSV"]])
+@pytest.mark.parametrize("rx", [None, "data|up", r"\.csv$"])
+def test_stream_parser_matches_bs4(base, allow, rx):
+    fast = extract_links(EDGE_HTML, base, allow, rx)
+    assert fast == extract_links(EDGE_HTML, base, allow, rx, parser="bs4")
+
+
+def test_iter_hrefs_handles_large_documents():
+    html = "".join(f'<p><a href="/f{i}.csv">{i}</a></p>' for i in range(20_000))
+    hrefs = list(iter_hrefs(html))
+    assert len(hrefs) == 20_000
+    assert hrefs[-1] == "/f19999.csv"
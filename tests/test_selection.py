@@ -0,0 +1,89 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import responses
+
+from civic_interconnect.paperkit.config import AssetTD
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.orchestrate import load_last_summary, run
+from civic_interconnect.paperkit.selection import Selection
+
+DIRECT: AssetTD = {"url": "https://data.cdc.gov/a.csv"}
+PAGE: AssetTD = {"page_url": "https://www.example.org/tables"}
+
+
+def test_selection_bibkey_patterns():
+    sel = Selection(only=["cdc_*", "smith2024"], exclude=["cdc_old*"])
+    assert sel.keeps_key("cdc_pmdr")
+    assert sel.keeps_key("smith2024")
+    assert not sel.keeps_key("cdc_old_rates")
+    assert not sel.keeps_key("jones2020")
+    assert Selection().is_empty()
+    assert Selection().keeps_key("anything")
+
+
+def test_selection_asset_type_and_host():
+    assert Selection(asset_types=["page"]).keeps_asset(PAGE)
+    assert not Selection(asset_types=["page"]).keeps_asset(DIRECT)
+    assert Selection(hosts=["*.CDC.gov"]).keeps_asset(DIRECT)
+    assert not Selection(hosts=["*.cdc.gov"]).keeps_asset(PAGE)
+    assert not Selection(exclude_hosts=["data.cdc.gov"]).keeps_asset(DIRECT)
+
+
+META = (
+    "alpha:\n"
+    "  assets:\n"
+    "    - url: https://ex.org/a.csv\n"
+    "beta:\n"
+    "  assets:\n"
+    "    - url: https://ex.org/b.csv\n"
+    "    - page_url: https://ex.org/page\n"
+)
+
+
+@responses.activate
+def test_run_with_selection_skips_entries_and_assets(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(META)
+    responses.add(responses.GET, "https://ex.org/b.csv", body="b\n")
+
+    summary = run(
+        bib, meta, tmp_path / "out", client, select=Selection(only=["b*"], asset_types=["direct"])
+    )
+
+    assert [r.bibkey for r in summary.processed] == ["beta"]
+    assert summary.skipped == ["alpha"]
+    assert summary.processed[0].paths == [tmp_path / "out" / "beta" / "b.csv"]
+    assert [c.request.url for c in responses.calls] == ["https://ex.org/b.csv"]
+
+
+@responses.activate
+def test_run_failed_only_retries_previous_failures(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(META)
+    out = tmp_path / "out"
+    responses.add(responses.GET, "https://ex.org/a.csv", body="a\n")
+    responses.add(responses.GET, "https://ex.org/b.csv", status=404)
+    responses.add(responses.GET, "https://ex.org/page", body="<a href='/c.csv'>c</a>")
+
+    first = run(bib, meta, out, client)
+    assert [bool(r.errors) for r in first.processed] == [False, True]
+    saved = load_last_summary(out)
+    assert saved is not None
+    assert saved.to_dict() == first.to_dict()
+
+    responses.replace(responses.GET, "https://ex.org/b.csv", body="b\n")
+    responses.add(responses.GET, "https://ex.org/c.csv", body="c\n")
+    responses.calls.reset()
+    retry = run(bib, meta, out, client, select=Selection(failed_only=True))
+
+    assert [r.bibkey for r in retry.processed] == ["beta"]
+    assert retry.processed[0].errors == []
+    assert "https://ex.org/a.csv" not in [c.request.url for c in responses.calls]
+    # The merged summary has no failures left, so another failed-only run does nothing.
+    merged = load_last_summary(out)
+    assert merged is not None
+    assert [r.bibkey for r in merged.processed] == ["alpha", "beta"]
+    assert run(bib, meta, out, client, select=Selection(failed_only=True)).processed == []
@@ -0,0 +1,184 @@
+from collections.abc import Callable
+import gzip
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+import responses
+
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.orchestrate import run
+from civic_interconnect.paperkit.socrata import fetch_socrata, soda_page_url
+
+RESOURCE = "https://data.example.gov/resource/abcd-1234.csv"
+HEADER = '"year","state","note"\n'
+ROWS = [f'"{2000 + i}","S{i}","{"two\nlines" if i == 3 else "ok"}"\n' for i in range(7)]
+
+
+class StandIn:
+    """Serves the dataset in $limit/$offset pages, gzip encoded, like a SODA endpoint."""
+
+    def __init__(self, fail_offsets: tuple[int, ...] = (), etag: str = '"v1"') -> None:
+        self.offsets: list[int] = []
+        self.fail_offsets = set(fail_offsets)
+        self.etag = etag
+
+    def __call__(self, request):
+        q = parse_qs(urlparse(request.url).query)
+        assert q["$order"] == [":id"]
+        limit, offset = int(q["$limit"][0]), int(q["$offset"][0])
+        self.offsets.append(offset)
+        if offset in self.fail_offsets:
+            self.fail_offsets.discard(offset)
+            return 503, {}, "busy"
+        if request.headers.get("If-None-Match") == self.etag:
+            return 304, {}, ""
+        body = HEADER + "".join(ROWS[offset : offset + limit])
+        headers = {"Content-Encoding": "gzip", "ETag": self.etag}
+        return 200, headers, gzip.compress(body.encode("utf-8"))
+
+
+def test_soda_page_url_keeps_query_and_sets_paging():
+    url = soda_page_url("https://d.gov/resource/x.json?$select=a", 10, 20, where="year > 2019")
+    parts = urlparse(url)
+    assert parts.path == "/resource/x.csv"
+    assert parse_qs(parts.query) == {
+        "$select": ["a"],
+        "$order": [":id"],
+        "$where": ["year > 2019"],
+        "$limit": ["10"],
+        "$offset": ["20"],
+    }
+
+
+@responses.activate
+def test_pages_stream_into_one_csv_with_row_count(tmp_path: Path, client: HttpClient):
+    server = StandIn()
+    responses.add_callback(responses.GET, RESOURCE, callback=server)
+    out = tmp_path / "rates.csv"
+
+    result = fetch_socrata(client, RESOURCE, out, page_size=3)
+
+    assert out.read_text(encoding="utf-8") == HEADER + "".join(ROWS)
+    assert (result.rows, result.pages, result.resumed) == (7, 3, False)
+    assert server.offsets == [0, 3, 6]
+    assert "gzip" in responses.calls[0].request.headers["Accept-Encoding"]
+    assert not (tmp_path / "rates.csv.part").exists()
+    assert not (tmp_path / "rates.csv.soda.json").exists()
+
+
+@responses.activate
+def test_failed_export_resumes_from_last_completed_page(tmp_path: Path, client: HttpClient):
+    server = StandIn(fail_offsets=(3,))
+    responses.add_callback(responses.GET, RESOURCE, callback=server)
+    out = tmp_path / "rates.csv"
+
+    with pytest.raises(requests.HTTPError):
+        fetch_socrata(client, RESOURCE, out, page_size=3)
+    assert (tmp_path / "rates.csv.soda.json").exists()
+
+    result = fetch_socrata(client, RESOURCE, out, page_size=3)
+
+    assert server.offsets == [0, 3, 3, 6]
+    assert result.resumed and result.rows == 7
+    assert out.read_text(encoding="utf-8") == HEADER + "".join(ROWS)
+
+
+@responses.activate
+def test_run_reports_rows_for_socrata_assets(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(f"cdc:\n  assets:\n    - soda_url: {RESOURCE}\n      page_size: 5\n")
+    responses.add_callback(responses.GET, RESOURCE, callback=StandIn())
+
+    summary = run(bib, meta, tmp_path / "out", client)
+
+    (rec,) = summary.processed
+    assert rec.errors == []
+    assert rec.paths == [tmp_path / "out" / "cdc" / "abcd-1234.csv"]
+    assert rec.metrics[0].rows == 7
+
+
+@responses.activate
+def test_unchanged_dataset_is_revalidated_instead_of_exported_again(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(f"cdc:\n  assets:\n    - soda_url: {RESOURCE}\n      page_size: 3\n")
+    server = StandIn()
+    responses.add_callback(responses.GET, RESOURCE, callback=server)
+    out = tmp_path / "out"
+    run(bib, meta, out, client, incremental=True)
+    saved = out / "cdc" / "abcd-1234.csv"
+    mtime = saved.stat().st_mtime_ns
+
+    summary = run(bib, meta, out, client, incremental=True)
+
+    assert server.offsets == [0, 3, 6, 0]
+    assert responses.calls[-1].request.headers["If-None-Match"] == '"v1"'
+    assert summary.processed[0].metrics[0].cache == "not_modified"
+    assert saved.stat().st_mtime_ns == mtime
+    assert not (out / "cdc" / "abcd-1234.csv.part").exists()
+
+    server.etag = '"v2"'
+    run(bib, meta, out, client, incremental=True)
+
+    assert server.offsets[4:] == [0, 3, 6]
+    assert saved.read_text(encoding="utf-8") == HEADER + "".join(ROWS)
+
+
+@responses.activate
+def test_fatal_page_errors_are_not_retried_by_the_export(tmp_path: Path):
+    responses.add(responses.GET, RESOURCE, status=404)
+    client = HttpClient(session=requests.Session(), retries=3, backoff_seconds=0)
+
+    with pytest.raises(requests.HTTPError):
+        fetch_socrata(client, RESOURCE, tmp_path / "rates.csv", page_size=3)
+
+    assert len(responses.calls) == 1
+
+
+class _BreakingResponse:
+    status_code = 200
+
+    def __init__(self, body: bytes, fail: bool) -> None:
+        self.body, self.fail = body, fail
+        self.headers: dict[str, str] = {}
+
+    def iter_content(self, chunk_size: int):
+        yield self.body[: len(self.body) // 2]
+        if self.fail:
+            raise requests.exceptions.ChunkedEncodingError("connection broken")
+        yield self.body[len(self.body) // 2 :]
+
+    def close(self) -> None:
+        pass
+
+
+class _BreakingClient:
+    """Serves pages whose body breaks off once at the given offset."""
+
+    retries = 3
+
+    def __init__(self, break_at: int) -> None:
+        self.break_at = break_at
+        self.offsets: list[int] = []
+
+    def get(self, url: str, **kwargs: object) -> _BreakingResponse:
+        q = parse_qs(urlparse(url).query)
+        limit, offset = int(q["$limit"][0]), int(q["$offset"][0])
+        fail = offset == self.break_at and offset not in self.offsets
+        self.offsets.append(offset)
+        body = HEADER + "".join(ROWS[offset : offset + limit])
+        return _BreakingResponse(body.encode("utf-8"), fail)
+
+
+def test_body_broken_mid_page_is_rolled_back_and_requested_again(tmp_path: Path):
+    client = _BreakingClient(break_at=3)
+    out = tmp_path / "rates.csv"
+
+    result = fetch_socrata(client, RESOURCE, out, page_size=3)
+
+    assert client.offsets == [0, 3, 3, 6]
+    assert result.rows == 7
+    assert out.read_text(encoding="utf-8") == HEADER + "".join(ROWS)
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("requests", "yaml", "bs4", "bibtexparser", "httpx")
+
+
+def _imported(code: str) -> dict[str, int]:
+    """Run code in a fresh interpreter; return imported modules and cumulative microseconds."""
+    proc = subprocess.run(  # noqa: S603 - runs this interpreter on fixed code
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    modules: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import civic_interconnect.paperkit.cli",
+        (
+            "from civic_interconnect.paperkit.cli import main\n"
+            "try:\n    main(['--help'])\nexcept SystemExit:\n    pass"
+        ),
+        (
+            "from civic_interconnect.paperkit.cli import main\n"
+            "try:\n    main(['verify', '--help'])\nexcept SystemExit:\n    pass"
+        ),
+        (
+            "from civic_interconnect.paperkit.cli import main\n"
+            "try:\n    main(['plan', '--help'])\nexcept SystemExit:\n    pass"
+        ),
+    ],
+)
+def test_cli_startup_skips_heavy_imports(code: str):
+    modules = _imported(code)
+    cli_us = modules.get("civic_interconnect.paperkit.cli")
+    assert cli_us is not None
+    assert [m for m in HEAVY if m in modules] == [], f"cli import took {cli_us} us"
+
+
+def test_orchestrate_defers_scraping_stack():
+    modules = _imported("import civic_interconnect.paperkit.orchestrate")
+    assert "civic_interconnect.paperkit.scrape" not in modules
+    assert "bs4" not in modules
+
+
+def test_sync_fetch_path_defers_asyncio():
+    modules = _imported(
+        "import civic_interconnect.paperkit.orchestrate\n"
+        "import civic_interconnect.paperkit.http_client"
+    )
+    assert "civic_interconnect.paperkit.orchestrate" in modules
+    assert "asyncio" not in modules
@@ -0,0 +1,83 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import responses
+
+from civic_interconnect.paperkit.download import sha256_file
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.orchestrate import run
+from civic_interconnect.paperkit.store import BlobStore, link_or_copy
+
+
+def test_blob_store_ingest_shares_identical_files(tmp_path: Path):
+    store = BlobStore(tmp_path / "blobs")
+    a = tmp_path / "k1" / "a.pdf"
+    b = tmp_path / "k2" / "b.pdf"
+    for p in (a, b):
+        p.parent.mkdir(parents=True)
+        p.write_bytes(b"same bytes")
+    digest = sha256_file(a)
+
+    assert store.ingest(a, digest) == "new"
+    assert store.ingest(b, digest) == "hardlink"
+    assert a.samefile(b)
+    assert store.blob_path(digest).samefile(a)
+
+
+def test_link_or_copy_without_links_gets_own_inode(tmp_path: Path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"abc")
+    dest = tmp_path / "out" / "dest.bin"
+    assert link_or_copy(src, dest, allow_link=False) in {"reflink", "copy"}
+    assert dest.read_bytes() == b"abc"
+    assert not dest.samefile(src)
+
+
+@responses.activate
+def test_run_fetches_shared_url_once_and_links(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(
+        "alpha:\n"
+        "  assets:\n"
+        "    - url: https://ex.org/nvsr.pdf\n"
+        "beta:\n"
+        "  assets:\n"
+        "    - url: https://ex.org/nvsr.pdf\n"
+        "    - url: https://mirror.org/copy.pdf\n"
+    )
+    responses.add(responses.GET, "https://ex.org/nvsr.pdf", body=b"%PDF-1.7 report")
+    responses.add(responses.GET, "https://mirror.org/copy.pdf", body=b"%PDF-1.7 report")
+
+    out = tmp_path / "out"
+    summary = run(bib, meta, out, client, jobs=3, dedupe=True)
+
+    assert [len(r.errors) for r in summary.processed] == [0, 0]
+    urls = [c.request.url for c in responses.calls]
+    assert urls.count("https://ex.org/nvsr.pdf") == 1
+    alpha_pdf = out / "alpha" / "nvsr.pdf"
+    assert alpha_pdf.samefile(out / "beta" / "nvsr.pdf")
+    assert alpha_pdf.samefile(out / "beta" / "copy.pdf")
+
+
+@responses.activate
+def test_run_fetches_each_normalized_url_once(
+    tmp_path: Path, write_inputs: Callable[..., tuple[Path, Path]], client: HttpClient
+):
+    bib, meta = write_inputs(
+        "alpha:\n"
+        "  assets:\n"
+        "    - url: https://ex.org/x.csv\n"
+        "beta:\n"
+        "  assets:\n"
+        "    - url: https://EX.org/x.csv#data\n"
+    )
+    responses.add(responses.GET, "https://ex.org/x.csv", body=b"a,b\n1,2\n")
+
+    out = tmp_path / "out"
+    summary = run(bib, meta, out, client, jobs=2)
+
+    assert len(responses.calls) == 1
+    states = sorted(r.metrics[0].cache for r in summary.processed)
+    assert states == ["miss", "reused"]
+    assert (out / "beta" / "x.csv").read_bytes() == b"a,b\n1,2\n"
@@ -0,0 +1,88 @@
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import socket
+import threading
+
+import pytest
+import requests
+
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.metrics import measure, totals
+from civic_interconnect.paperkit.transport import (
+    HttpxSession,
+    TransportConfig,
+    TunedAdapter,
+    new_session,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections open between requests
+
+    def do_GET(self) -> None:
+        body = b"missing" if self.path == "/404" else f"row {self.path}\n".encode()
+        self.send_response(404 if self.path == "/404" else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[str]:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_new_session_mounts_tuned_adapter():
+    session = new_session(TransportConfig(pool_maxsize=32, pool_block=True, connect_retries=4))
+    adapter = session.get_adapter("https://data.cdc.gov/")
+    assert isinstance(adapter, TunedAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+    assert adapter.poolmanager.connection_pool_kw["block"] is True
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in adapter.poolmanager.connection_pool_kw[
+        "socket_options"
+    ]
+    assert adapter.max_retries.connect == 4
+    assert adapter.max_retries.read == 0
+
+    closing = new_session(TransportConfig(keepalive=False))
+    assert closing.headers["Connection"] == "close"
+
+
+def test_for_run_sizes_pool_to_concurrency():
+    assert TransportConfig.for_run(jobs=4, per_host=2).pool_maxsize == 16
+    assert TransportConfig.for_run(jobs=40, per_host=8).pool_maxsize == 40
+    assert TransportConfig.for_run(jobs=40, per_host=8, pool_maxsize=5).pool_maxsize == 5
+
+
+@pytest.mark.parametrize("keepalive", [True, False])
+def test_connection_reuse_is_measured(server: str, keepalive: bool):
+    client = HttpClient(transport=TransportConfig(keepalive=keepalive), retries=1)
+    with measure(server) as m:
+        for i in range(5):
+            assert client.get(f"{server}/{i}").text == f"row /{i}\n"
+    agg = totals([m])
+    assert agg["requests"] == 5
+    assert agg["connections"] == (1 if keepalive else 5)
+    assert agg["connection_reuse"] == (0.8 if keepalive else 0.0)
+
+
+def test_httpx_session_behaves_like_requests(server: str):
+    client = HttpClient(session=HttpxSession(TransportConfig(http2=False)), retries=1)
+    with measure(server) as m:
+        resp = client.get(f"{server}/a.csv", stream=True)
+        assert b"".join(resp.iter_content(chunk_size=4)) == b"row /a.csv\n"
+        resp.close()
+        assert client.get(f"{server}/b.csv").content == b"row /b.csv\n"
+        with pytest.raises(requests.HTTPError) as err:
+            client.get(f"{server}/404")
+    assert err.value.response.status_code == 404
+    assert (m.requests, m.connections) == (3, 1)
+    client.session.close()
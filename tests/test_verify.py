@@ -0,0 +1,91 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+import requests
+import responses
+
+from civic_interconnect.paperkit import verify
+from civic_interconnect.paperkit.cli import main
+from civic_interconnect.paperkit.http_client import HttpClient
+from civic_interconnect.paperkit.orchestrate import run
+from civic_interconnect.paperkit.verify import hash_file, verify_tree
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> tuple[Path, Path]:
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@misc{alpha, title={A}}\n@misc{beta, title={B}}\n", encoding="utf-8")
+    meta = tmp_path / "refs_meta.yaml"
+    meta.write_text(
+        "alpha:\n"
+        "  assets:\n"
+        "    - url: https://ex.org/a.csv\n"
+        f"      checksum: {_sha(b'a')}\n"
+        "    - url: https://ex.org/b.csv\n"
+        "beta:\n"
+        "  out_dir: raw\n"
+        "  assets:\n"
+        "    - url: https://ex.org/c.csv\n"
+        f"      checksum: {_sha(b'c').upper()}\n",
+        encoding="utf-8",
+    )
+    out = tmp_path / "out"
+    with responses.RequestsMock() as rsps:
+        for name in "abc":
+            rsps.add(responses.GET, f"https://ex.org/{name}.csv", body=name)
+        run(bib, meta, out, HttpClient(session=requests.Session(), retries=1))
+    return out, meta
+
+
+def test_hash_file_matches_hashlib_for_mmap_and_reads(tmp_path: Path, monkeypatch):
+    p = tmp_path / "f"
+    p.write_bytes(b"x" * 5000)
+    assert hash_file(p) == _sha(b"x" * 5000)
+    monkeypatch.setattr(verify, "MMAP_THRESHOLD", 1)
+    assert hash_file(p) == _sha(b"x" * 5000)
+
+
+def test_verify_clean_tree(tree: tuple[Path, Path]):
+    out, meta = tree
+    report = verify_tree(out, meta, workers=2)
+    assert not report.failed
+    assert report.counts() == {"ok": 3}
+    by_path = {c.path: c for c in report.checks}
+    assert set(by_path["alpha/a.csv"].expected) == {"manifest", "meta"}
+    assert set(by_path["alpha/b.csv"].expected) == {"manifest"}
+    assert by_path["beta/raw/c.csv"].expected["meta"] == _sha(b"c")
+
+
+def test_verify_reports_mismatch_missing_and_unrecorded(tree: tuple[Path, Path]):
+    out, meta = tree
+    (out / "alpha" / "a.csv").write_bytes(b"tampered")
+    (out / "beta" / "raw" / "c.csv").unlink()
+    (out / "beta" / "extra.txt").write_bytes(b"x")
+    (out / "alpha" / "big.bin.part").write_bytes(b"partial")
+
+    report = verify_tree(out, meta)
+
+    statuses = {c.path: c.status for c in report.checks}
+    assert statuses == {
+        "alpha/a.csv": "mismatch",
+        "alpha/b.csv": "ok",
+        "beta/extra.txt": "unrecorded",
+        "beta/raw/c.csv": "missing",
+    }
+    assert report.failed
+
+
+def test_verify_command_exit_code_and_json(tree: tuple[Path, Path], tmp_path: Path):
+    out, meta = tree
+    report_path = tmp_path / "verify.json"
+    args = ["verify", "--out", str(out), "--meta", str(meta), "--json", str(report_path)]
+    assert main(args) == 0
+    assert json.loads(report_path.read_text(encoding="utf-8"))["counts"] == {"ok": 3}
+    (out / "alpha" / "b.csv").write_bytes(b"changed")
+    assert main([*args, "--processes", "--workers", "2"]) == 1